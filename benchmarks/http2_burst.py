@@ -0,0 +1,223 @@
+"""
+HTTP/2 burst latency benchmark.
+
+Starts two local TLS stand-ins of the REST API answering after the same simulated
+service time, one speaking HTTP/2 and one HTTP/1.1, then fires bursts of concurrent
+requests at them: through `requests` the way the client sends them without HTTP/2 (a
+connection per request), through the pooled transport (kept-alive connections) and
+through the HTTP/2 transport (one shared connection). Reports the latency
+percentiles of every request of the bursts.
+
+Requires the `http2` extra: pip install coinbaseadvanced[http2]
+
+Usage: python benchmarks/http2_burst.py [--bursts 10] [--burst-size 64] [--service-ms 20]
+"""
+
+import argparse
+import asyncio
+import datetime
+import os
+import ssl
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from coinbaseadvanced.http2 import HTTP2Transport  # noqa: E402 pylint: disable=wrong-import-position
+from coinbaseadvanced.transports import PooledTransport  # noqa: E402 pylint: disable=wrong-import-position
+
+BODY = b'{"accounts": [], "has_next": false, "cursor": "", "size": 0}'
+
+
+def make_certificate(directory: str):
+    """
+    Writes a self-signed certificate for `localhost`, returns the certificate and key paths.
+    """
+
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, 'localhost')])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    certificate = (x509.CertificateBuilder()
+                   .subject_name(name).issuer_name(name)
+                   .public_key(key.public_key())
+                   .serial_number(x509.random_serial_number())
+                   .not_valid_before(now - datetime.timedelta(minutes=5))
+                   .not_valid_after(now + datetime.timedelta(days=1))
+                   .add_extension(x509.SubjectAlternativeName([x509.DNSName('localhost')]), critical=False)
+                   .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+                   .sign(key, hashes.SHA256()))
+
+    certificate_path = os.path.join(directory, 'localhost.pem')
+    key_path = os.path.join(directory, 'localhost.key')
+    with open(certificate_path, 'wb') as file:
+        file.write(certificate.public_bytes(serialization.Encoding.PEM))
+    with open(key_path, 'wb') as file:
+        file.write(key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                                     serialization.NoEncryption()))
+    return certificate_path, key_path
+
+
+def server_context(certificate_path: str, key_path: str, protocol: str) -> ssl.SSLContext:
+    """
+    TLS context of a stand-in, advertising only `protocol` through ALPN.
+    """
+
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(certificate_path, key_path)
+    context.set_alpn_protocols([protocol])
+    return context
+
+
+class _HTTP2Protocol(asyncio.Protocol):
+    # Minimal HTTP/2 server: answers every stream with BODY after the service time.
+
+    def __init__(self, service_time: float) -> None:
+        import h2.config
+        import h2.connection
+
+        self._service_time = service_time
+        self._connection = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False))
+        self._transport = None
+
+    def connection_made(self, transport) -> None:
+        self._transport = transport
+        self._connection.initiate_connection()
+        transport.write(self._connection.data_to_send())
+
+    def data_received(self, data: bytes) -> None:
+        import h2.events
+
+        for event in self._connection.receive_data(data):
+            if isinstance(event, h2.events.RequestReceived):
+                asyncio.get_running_loop().call_later(self._service_time, self._respond, event.stream_id)
+        self._transport.write(self._connection.data_to_send())
+
+    def _respond(self, stream_id: int) -> None:
+        if self._transport.is_closing():
+            return
+        self._connection.send_headers(stream_id, [(':status', '200'), ('content-type', 'application/json'),
+                                                  ('content-length', str(len(BODY)))])
+        self._connection.send_data(stream_id, BODY, end_stream=True)
+        self._transport.write(self._connection.data_to_send())
+
+
+def start_http2_server(context: ssl.SSLContext, service_time: float) -> int:
+    """
+    Serves HTTP/2 on a background event loop, returns the port.
+    """
+
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(
+        loop.create_server(lambda: _HTTP2Protocol(service_time), 'localhost', 0, ssl=context))
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return server.sockets[0].getsockname()[1]
+
+
+def start_http1_server(context: ssl.SSLContext, service_time: float) -> int:
+    """
+    Serves HTTP/1.1 with a thread per connection, returns the port.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):  # pylint: disable=invalid-name
+            time.sleep(service_time)
+            self.send_response(200)
+            self.send_header('content-type', 'application/json')
+            self.send_header('content-length', str(len(BODY)))
+            self.end_headers()
+            self.wfile.write(BODY)
+
+        def log_message(self, *args):  # pylint: disable=arguments-differ
+            pass
+
+    server = ThreadingHTTPServer(('localhost', 0), Handler)
+    server.daemon_threads = True
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.server_address[1]
+
+
+def run_bursts(send, bursts: int, burst_size: int):
+    """
+    Sends `bursts` bursts of `burst_size` concurrent requests, returns every request latency.
+    """
+
+    latencies = []
+
+    def timed(_):
+        started = time.perf_counter()
+        response = send()
+        assert response.status_code == 200, response.status_code
+        return time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=burst_size) as executor:
+        for _ in range(bursts):
+            latencies.extend(executor.map(timed, range(burst_size)))
+            time.sleep(0.05)
+    return latencies
+
+
+def report(name: str, latencies) -> None:
+    """
+    Prints the latency percentiles of a scenario.
+    """
+
+    latencies = sorted(latencies)
+
+    def percentile(fraction):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))] * 1000
+
+    print(f"{name:32} {statistics.median(latencies) * 1000:8.1f} {percentile(.9):8.1f} "
+          f"{percentile(.99):8.1f} {latencies[-1] * 1000:8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--bursts', type=int, default=10)
+    parser.add_argument('--burst-size', type=int, default=64)
+    parser.add_argument('--service-ms', type=float, default=20)
+    args = parser.parse_args()
+
+    import requests
+
+    service_time = args.service_ms / 1000
+    with tempfile.TemporaryDirectory() as directory:
+        certificate_path, key_path = make_certificate(directory)
+        http2_port = start_http2_server(server_context(certificate_path, key_path, 'h2'), service_time)
+        http1_port = start_http1_server(server_context(certificate_path, key_path, 'http/1.1'), service_time)
+
+        client_context = ssl.create_default_context(cafile=certificate_path)
+        transport = HTTP2Transport(timeout=30, verify=client_context)
+        http2_url = f'https://localhost:{http2_port}/api/v3/brokerage/accounts'
+        http1_url = f'https://localhost:{http1_port}/api/v3/brokerage/accounts'
+
+        assert transport.send('GET', http2_url).http_version == 'HTTP/2'
+
+        print(f"{args.bursts} bursts of {args.burst_size} requests, {args.service_ms} ms service time")
+        print(f"{'transport':32} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+        report('requests, HTTP/1.1', run_bursts(
+            lambda: requests.get(http1_url, timeout=30, verify=certificate_path), args.bursts, args.burst_size))
+        pooled = PooledTransport(pool_size=args.burst_size, verify=certificate_path)
+        report('PooledTransport, HTTP/1.1', run_bursts(
+            lambda: pooled.send('GET', http1_url, timeout=30), args.bursts, args.burst_size))
+        report('HTTP2Transport, HTTP/2', run_bursts(
+            lambda: transport.send('GET', http2_url), args.bursts, args.burst_size))
+        pooled.close()
+        transport.close()
+
+
+if __name__ == '__main__':
+    main()
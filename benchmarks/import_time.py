@@ -0,0 +1,73 @@
+"""
+Import time benchmark.
+
+Measures, in fresh interpreters, how long importing the client modules takes and
+which heavy dependencies end up loaded, next to the cost of importing those
+dependencies eagerly.
+
+Usage: python benchmarks/import_time.py [--runs 15]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ('requests', 'cryptography', 'jwt', 'websocket')
+
+SCENARIOS = {
+    'import client': 'import coinbaseadvanced.client',
+    'import client_websocket': 'import coinbaseadvanced.client_websocket',
+    'legacy auth client + endpoint table': (
+        'import coinbaseadvanced.client as c\n'
+        'c.CoinbaseAdvancedTradeAPIClient.from_legacy_api_keys("key", "secret")\n'
+        'c.ENDPOINTS["list_accounts"].build_query({"limit": 49})'),
+    'eager dependencies (reference)': (
+        'import requests, jwt, websocket\n'
+        'from cryptography.hazmat.primitives import serialization'),
+}
+
+PROBE = '''
+import sys, time
+started = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - started
+loaded = [m for m in {heavy!r} if m in sys.modules]
+print(elapsed, ",".join(loaded))
+'''
+
+
+def run_scenario(code: str, runs: int):
+    """
+    Runs `code` in `runs` fresh interpreters, returning the timings and loaded heavy modules.
+    """
+
+    timings = []
+    loaded = ''
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', PROBE.format(code=code, heavy=HEAVY_MODULES)],
+                                cwd=ROOT, check=True, capture_output=True, text=True).stdout
+        elapsed, loaded = output.strip().split(' ', 1) if ' ' in output.strip() else (output.strip(), '')
+        timings.append(float(elapsed))
+    return timings, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=15)
+    args = parser.parse_args()
+
+    print(f"{'scenario':40} {'median ms':>10} {'p90 ms':>10}  heavy modules loaded")
+    for name, code in SCENARIOS.items():
+        timings, loaded = run_scenario(code, args.runs)
+        timings.sort()
+        median = statistics.median(timings) * 1000
+        p90 = timings[int(len(timings) * .9) - 1] * 1000
+        print(f"{name:40} {median:10.2f} {p90:10.2f}  {loaded or '-'}")
+
+
+if __name__ == '__main__':
+    main()
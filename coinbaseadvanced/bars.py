@@ -0,0 +1,195 @@
+"""
+Real-time OHLCV bars built from the websocket `market_trades` channel.
+"""
+
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Tuple
+
+from coinbaseadvanced.utils import parse_timestamp
+
+if TYPE_CHECKING:
+    from coinbaseadvanced.models.market_data import MarketTradesEvent
+
+
+class Bar:
+    """
+    OHLCV bar of one product over one interval.
+
+    Attributes:
+        product_id (str): Product traded.
+        interval (float): Bar length in seconds.
+        start (float): Bar start, unix seconds, a multiple of `interval`.
+        open (float): Price of the earliest trade.
+        high (float): Highest price.
+        low (float): Lowest price.
+        close (float): Price of the latest trade.
+        volume (float): Base size traded.
+        quote_volume (float): Quote size traded, `price * size` summed.
+        trades (int): Number of trades.
+    """
+
+    __slots__ = ('product_id', 'interval', 'start', 'open', 'high', 'low', 'close', 'volume',
+                 'quote_volume', 'trades', '_open_time', '_close_time')
+
+    def __init__(self, product_id: str, interval: float, start: float, price: float, size: float,
+                 timestamp: float) -> None:
+        self.product_id = product_id
+        self.interval = interval
+        self.start = start
+        self.open = self.high = self.low = self.close = price
+        self.volume = size
+        self.quote_volume = price * size
+        self.trades = 1
+        self._open_time = self._close_time = timestamp
+
+    @property
+    def end(self) -> float:
+        """
+        Bar end, unix seconds, exclusive.
+        """
+
+        return self.start + self.interval
+
+    @property
+    def vwap(self) -> float:
+        """
+        Volume weighted average price.
+        """
+
+        return self.quote_volume / self.volume if self.volume else self.close
+
+    def update(self, price: float, size: float, timestamp: float) -> None:
+        """
+        Adds a trade falling within the bar.
+        """
+
+        # Trades of a bar may arrive out of order, open and close follow trade times.
+        if price > self.high:
+            self.high = price
+        if price < self.low:
+            self.low = price
+        if timestamp < self._open_time:
+            self.open, self._open_time = price, timestamp
+        if timestamp >= self._close_time:
+            self.close, self._close_time = price, timestamp
+        self.volume += size
+        self.quote_volume += price * size
+        self.trades += 1
+
+    def __repr__(self):
+        return (f"Bar(product_id={self.product_id}, interval={self.interval}, start={self.start}, "
+                f"open={self.open}, high={self.high}, low={self.low}, close={self.close}, "
+                f"volume={self.volume}, trades={self.trades})")
+
+
+class BarBuilder:
+    """
+    Keeps the bar in progress of every product and interval, emits them once closed.
+
+    A bar closes when a trade of a later interval arrives, or when `flush` is called
+    after its end (e.g. from a timer or on heartbeats) for products trading rarely.
+    Intervals without trades produce no bar, like the REST candles. Every trade costs
+    a constant amount of work per configured interval.
+
+    Usage:
+        builder = BarBuilder(intervals=(1, 10), callback=print)
+        websocket_client.subscribe(["BTC-USD"], "market_trades", callback=builder.on_market_trades)
+
+    Args:
+    - intervals: Bar lengths in seconds.
+    - callback: Called with every closed `Bar`, more can be added with `add_callback`.
+    - include_snapshot: Whether the trades of the snapshot sent on subscription are used.
+    """
+
+    def __init__(self,
+                 intervals: Iterable[float] = (1, 10),
+                 callback: Optional[Callable[[Bar], None]] = None,
+                 include_snapshot: bool = False) -> None:
+        self.intervals = tuple(intervals)
+        if not self.intervals or min(self.intervals) <= 0:
+            raise ValueError(f"Invalid intervals: {self.intervals}.")
+
+        self._include_snapshot = include_snapshot
+        self._callbacks: List[Callable[[Bar], None]] = [callback] if callback is not None else []
+        self._bars: Dict[Tuple[str, float], Bar] = {}
+        # End of the last bar emitted, trades before it can no longer be added.
+        self._closed_until: Dict[Tuple[str, float], float] = {}
+        self._lock = threading.Lock()
+
+        self.late_trades = 0
+
+    def add_callback(self, callback: Callable[[Bar], None]) -> None:
+        """
+        Registers `callback(bar)` to be called with every closed bar.
+        """
+
+        self._callbacks.append(callback)
+
+    def current(self, product_id: str, interval: float) -> Optional[Bar]:
+        """
+        Bar in progress of `product_id` for `interval`, if any.
+        """
+
+        return self._bars.get((product_id, interval))
+
+    def on_market_trades(self, event: 'MarketTradesEvent') -> None:
+        """
+        Websocket callback for the `market_trades` channel.
+        """
+
+        if event.is_snapshot and not self._include_snapshot:
+            return
+
+        trades = [(parse_timestamp(trade.time), trade) for trade in event.trades]
+        # Messages group several trades, not necessarily oldest first.
+        trades.sort(key=lambda item: item[0])
+
+        for timestamp, trade in trades:
+            self.add_trade(trade.product_id, float(trade.price), float(trade.size), timestamp)
+
+    def add_trade(self, product_id: str, price: float, size: float, timestamp: float) -> None:
+        """
+        Adds one trade to the bars of `product_id`, emitting the ones it closes.
+        """
+
+        closed = []
+        with self._lock:
+            for interval in self.intervals:
+                key = (product_id, interval)
+                bar = self._bars.get(key)
+                if bar is not None and bar.start <= timestamp < bar.end:
+                    bar.update(price, size, timestamp)
+                    continue
+                if timestamp < (bar.start if bar is not None else self._closed_until.get(key, timestamp)):
+                    self.late_trades += 1
+                    continue
+                if bar is not None:
+                    closed.append(bar)
+                    self._closed_until[key] = bar.end
+
+                start = timestamp - timestamp % interval
+                self._bars[key] = Bar(product_id, interval, start, price, size, timestamp)
+
+        self._emit(closed)
+
+    def flush(self, now: Optional[float] = None) -> List[Bar]:
+        """
+        Closes and emits the bars ended before `now`, unix seconds, defaults to the current time.
+        """
+
+        now = time.time() if now is None else now
+
+        with self._lock:
+            closed = [bar for bar in self._bars.values() if bar.end <= now]
+            for bar in closed:
+                del self._bars[(bar.product_id, bar.interval)]
+                self._closed_until[(bar.product_id, bar.interval)] = bar.end
+
+        self._emit(closed)
+        return closed
+
+    def _emit(self, bars: List[Bar]) -> None:
+        for bar in bars:
+            for callback in self._callbacks:
+                callback(bar)
@@ -0,0 +1,198 @@
+"""
+Order book microstructure metrics maintained from the websocket `l2_data` channel.
+"""
+
+import threading
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from coinbaseadvanced.models.market_data import L2Event, Level2Event
+
+
+class BookMetrics:
+    """
+    Metrics of one product book after an `l2_data` message.
+
+    Attributes:
+        product_id (str): Product.
+        sequence_num (int): Sequence number of the message the metrics follow.
+        event_time (Optional[str]): Time of the last update applied.
+        best_bid, best_bid_size, best_ask, best_ask_size (Optional[float]): Top of the book.
+        spread (Optional[float]): `best_ask - best_bid`.
+        mid (Optional[float]): `(best_bid + best_ask) / 2`.
+        microprice (Optional[float]): Mid weighted by the opposite top sizes,
+            `(best_bid * best_ask_size + best_ask * best_bid_size) / (best_bid_size + best_ask_size)`.
+        imbalance (Optional[float]): `(bid_depth - ask_depth) / (bid_depth + ask_depth)` over the top levels.
+        depth_weighted_price (Optional[float]): Microprice over the top levels, with the size-weighted
+            average price and the total size of each side in place of the best level.
+        bid_depth, ask_depth (float): Size resting in the top levels of each side.
+    """
+
+    __slots__ = ('product_id', 'sequence_num', 'event_time', 'best_bid', 'best_bid_size', 'best_ask',
+                 'best_ask_size', 'spread', 'mid', 'microprice', 'imbalance', 'depth_weighted_price',
+                 'bid_depth', 'ask_depth')
+
+    def __init__(self, product_id: str, sequence_num: int, event_time: Optional[str],
+                 bid: '_BookSide', ask: '_BookSide') -> None:
+        self.product_id = product_id
+        self.sequence_num = sequence_num
+        self.event_time = event_time
+
+        self.best_bid, self.best_bid_size = bid.best()
+        self.best_ask, self.best_ask_size = ask.best()
+        self.bid_depth, bid_notional = bid.top_totals()
+        self.ask_depth, ask_notional = ask.top_totals()
+
+        self.spread = self.mid = self.microprice = None
+        if self.best_bid is not None and self.best_ask is not None:
+            self.spread = self.best_ask - self.best_bid
+            self.mid = (self.best_bid + self.best_ask) / 2
+            self.microprice = ((self.best_bid * self.best_ask_size + self.best_ask * self.best_bid_size)
+                               / (self.best_bid_size + self.best_ask_size))
+
+        depth = self.bid_depth + self.ask_depth
+        self.imbalance = (self.bid_depth - self.ask_depth) / depth if depth else None
+        self.depth_weighted_price = None
+        if self.bid_depth and self.ask_depth:
+            # Average price of each side weighted by the depth of the opposite side.
+            self.depth_weighted_price = (bid_notional / self.bid_depth * self.ask_depth
+                                         + ask_notional / self.ask_depth * self.bid_depth) / depth
+
+    def __repr__(self):
+        return (f"BookMetrics(product_id={self.product_id}, sequence_num={self.sequence_num}, "
+                f"best_bid={self.best_bid}, best_ask={self.best_ask}, spread={self.spread}, mid={self.mid}, "
+                f"microprice={self.microprice}, imbalance={self.imbalance}, "
+                f"depth_weighted_price={self.depth_weighted_price})")
+
+
+class _BookSide:
+    # Price levels of one side kept sorted best first. Aggregates over the top `depth`
+    # levels are only recomputed when an update lands within them.
+
+    __slots__ = ('_sign', '_depth', '_keys', '_sizes', '_top', '_dirty')
+
+    def __init__(self, is_bid: bool, depth: int) -> None:
+        # Keys are negated bid prices so both sides sort best first ascending.
+        self._sign = -1.0 if is_bid else 1.0
+        self._depth = depth
+        self._keys: List[float] = []
+        self._sizes: Dict[float, float] = {}
+        self._top = (0.0, 0.0)
+        self._dirty = False
+
+    def clear(self) -> None:
+        self._keys.clear()
+        self._sizes.clear()
+        self._top = (0.0, 0.0)
+        self._dirty = False
+
+    def apply(self, price: float, size: float) -> None:
+        key = price * self._sign
+        index = bisect_left(self._keys, key)
+        exists = index < len(self._keys) and self._keys[index] == key
+
+        if size > 0.0:
+            if not exists:
+                self._keys.insert(index, key)
+            self._sizes[key] = size
+        elif exists:
+            del self._keys[index]
+            del self._sizes[key]
+        else:
+            return
+
+        if index < self._depth:
+            self._dirty = True
+
+    def best(self):
+        if not self._keys:
+            return None, None
+        key = self._keys[0]
+        return key * self._sign, self._sizes[key]
+
+    def top_totals(self):
+        # (total size, total notional) of the top levels.
+        if self._dirty:
+            sizes = self._sizes
+            top = self._keys[:self._depth]
+            self._top = (sum(sizes[key] for key in top),
+                         sum(key * sizes[key] for key in top) * self._sign)
+            self._dirty = False
+        return self._top
+
+
+class BookMetricsTracker:
+    """
+    Keeps the book of every product from the `l2_data` channel and publishes its metrics.
+
+    Updates cost a binary search in the side they touch; the aggregates over the top
+    `depth` levels are only recomputed when an update changes one of those levels.
+    Snapshots, sent on (re)subscription, replace the book so metrics after a resync are
+    the same as for a fresh subscription.
+
+    Usage:
+        tracker = BookMetricsTracker(depth=10, callback=print)
+        websocket_client.subscribe(["BTC-USD"], "l2_data", callback=tracker.on_level2)
+
+    Args:
+    - depth: Number of levels per side used by `imbalance` and `depth_weighted_price`.
+    - callback: Called with `BookMetrics` after every message updating a product.
+    """
+
+    def __init__(self, depth: int = 10, callback: Optional[Callable[[BookMetrics], None]] = None) -> None:
+        if depth <= 0:
+            raise ValueError(f"Invalid depth: {depth}.")
+        self.depth = depth
+        self._callbacks: List[Callable[[BookMetrics], None]] = [callback] if callback is not None else []
+        self._books: Dict[str, tuple] = {}
+        self._metrics: Dict[str, BookMetrics] = {}
+        self._lock = threading.Lock()
+
+    def add_callback(self, callback: Callable[[BookMetrics], None]) -> None:
+        """
+        Registers `callback(metrics)` to be called after every message updating a product.
+        """
+
+        self._callbacks.append(callback)
+
+    def metrics(self, product_id: str) -> Optional[BookMetrics]:
+        """
+        Latest metrics of `product_id`.
+        """
+
+        return self._metrics.get(product_id)
+
+    def on_level2(self, event: 'Level2Event') -> None:
+        """
+        Websocket callback for the `l2_data` channel.
+        """
+
+        published = []
+        with self._lock:
+            for l2_event in event.events:
+                published.append(self._apply(l2_event, event.sequence_num))
+
+        for metrics in published:
+            for callback in self._callbacks:
+                callback(metrics)
+
+    def _apply(self, event: 'L2Event', sequence_num: int) -> BookMetrics:
+        book = self._books.get(event.product_id)
+        if book is None:
+            book = self._books[event.product_id] = (_BookSide(True, self.depth), _BookSide(False, self.depth))
+        bid, ask = book
+
+        if event.type == 'snapshot':
+            bid.clear()
+            ask.clear()
+
+        event_time = None
+        for update in event.updates:
+            side = bid if update.side == 'bid' else ask
+            side.apply(float(update.price_level), float(update.new_quantity))
+            event_time = update.event_time
+
+        metrics = BookMetrics(event.product_id, sequence_num, event_time, bid, ask)
+        self._metrics[event.product_id] = metrics
+        return metrics
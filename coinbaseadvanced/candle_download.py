@@ -0,0 +1,117 @@
+"""
+Candle download windows and the SQLite checkpoint making multi-product downloads resumable.
+"""
+
+import json
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Tuple
+
+from coinbaseadvanced.models.products import GRANULARITY_MAP_IN_MINUTES, Candle, Granularity
+
+# Coinbase rejects requests of 300 candles or more:
+# "start and end argument is invalid - number of candles requested should be less than 300."
+MAX_CANDLES_PER_REQUEST = 299
+
+_CANDLE_FIELDS = ('start', 'low', 'high', 'open', 'close', 'volume')
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS candle_windows (
+    product_id TEXT NOT NULL,
+    granularity TEXT NOT NULL,
+    start INTEGER NOT NULL,
+    end INTEGER NOT NULL,
+    candles TEXT NOT NULL,
+    PRIMARY KEY (product_id, granularity, start, end)
+);
+'''
+
+
+def candle_windows(start_date: datetime, end_date: datetime,
+                   granularity: Granularity) -> List[Tuple[datetime, datetime]]:
+    """
+    Splits `[start_date, end_date]` into `(begin, end)` request windows of at most
+    `MAX_CANDLES_PER_REQUEST` candles, most recent first.
+    """
+
+    step = timedelta(minutes=GRANULARITY_MAP_IN_MINUTES[granularity.value])
+    window = step * MAX_CANDLES_PER_REQUEST
+
+    windows = []
+    end = end_date
+    while end > start_date:
+        begin = max(end - window, start_date)
+        windows.append((begin, end))
+        # Offset end by one granularity to avoid duplicates.
+        end = begin - step
+    return windows
+
+
+class CandleDownloadCheckpoint:
+    """
+    Candles of the request windows already downloaded, kept in a SQLite database.
+
+    `CoinbaseAdvancedTradeAPIClient.get_candles_for_products` saves every window as soon
+    as it is received and skips the saved ones, so an interrupted download continues
+    where it stopped when run again with the same checkpoint.
+
+    Args:
+    - database_path: SQLite database file, created if missing.
+    """
+
+    def __init__(self, database_path: str) -> None:
+        self._connection = sqlite3.connect(database_path)
+        self._connection.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """
+        Closes the database connection.
+        """
+
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def load(self, product_id: str, granularity: Granularity,
+             windows: Iterable[Tuple[datetime, datetime]]) -> Dict[int, List[Candle]]:
+        """
+        Saved candles of `windows`, by window index.
+        """
+
+        saved = {}
+        for row in self._connection.execute(
+                "SELECT start, end, candles FROM candle_windows WHERE product_id = ? AND granularity = ?",
+                (product_id, granularity.value)):
+            saved[(row[0], row[1])] = row[2]
+
+        candles = {}
+        for index, (begin, end) in enumerate(windows):
+            content = saved.get((int(begin.timestamp()), int(end.timestamp())))
+            if content is not None:
+                candles[index] = [Candle(**candle) for candle in json.loads(content)]
+        return candles
+
+    def save(self, product_id: str, granularity: Granularity, window: Tuple[datetime, datetime],
+             candles: Iterable[Candle]) -> None:
+        """
+        Saves the candles of a downloaded window.
+        """
+
+        content = json.dumps([{field: getattr(candle, field) for field in _CANDLE_FIELDS} for candle in candles])
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO candle_windows (product_id, granularity, start, end, candles) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (product_id, granularity.value, int(window[0].timestamp()), int(window[1].timestamp()), content))
+
+    def clear(self) -> None:
+        """
+        Forgets every saved window.
+        """
+
+        with self._connection:
+            self._connection.execute("DELETE FROM candle_windows")
@@ -0,0 +1,190 @@
+"""
+Memory-mapped historical candle store, one fixed-width binary file per product and granularity.
+
+Requires numpy, installed with the `numpy` extra: `pip install coinbaseadvanced[numpy]`.
+"""
+
+import os
+import struct
+import threading
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Tuple, Union
+
+import numpy as np
+
+from coinbaseadvanced.candles import CandleArrays
+from coinbaseadvanced.models.products import Candle, CandlesPage, Granularity
+
+if TYPE_CHECKING:
+    from coinbaseadvanced.models.market_data import CandlesEvent
+
+# Records sorted by `start`, unix seconds.
+CANDLE_DTYPE = np.dtype([('start', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'),
+                         ('close', '<f8'), ('volume', '<f8')])
+
+_MAGIC = b'CBCANDL1'
+# Magic, record size, padding up to the first record.
+_HEADER = struct.Struct('<8sI52x')
+
+
+class CandleStore:
+    """
+    Stores candles in `<directory>/<product_id>/<granularity>.candles` files of fixed size records.
+
+    Queries map the file and binary search the start times, the result columns are
+    views on the mapping: nothing is read from disk but the pages of the range
+    requested. New candles are appended at the end of the file, an update of the last
+    candle (the one in progress) is written in place; only candles older than the
+    last one stored cause the file to be rewritten.
+
+    Usage:
+        store = CandleStore("/data/candles")
+        store.write("BTC-USD", Granularity.ONE_MINUTE, client.get_product_candles_all(...))
+        candles = store.range("BTC-USD", Granularity.ONE_MINUTE, start, end)
+        websocket_client.subscribe(["BTC-USD"], "candles", callback=store.on_candles)
+
+    Args:
+    - directory: Root directory of the store, created if missing.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self._maps: Dict[str, Tuple[int, np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    def path(self, product_id: str, granularity: Union[Granularity, str]) -> str:
+        """
+        File storing the candles of `product_id` at `granularity`.
+        """
+
+        name = granularity.value if isinstance(granularity, Granularity) else granularity
+        return os.path.join(self.directory, product_id, f'{name}.candles')
+
+    def records(self, product_id: str, granularity: Union[Granularity, str]) -> np.ndarray:
+        """
+        All the records of a file, a read-only structured array mapped on it.
+        """
+
+        path = self.path(product_id, granularity)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        if size <= _HEADER.size:
+            return np.empty(0, dtype=CANDLE_DTYPE)
+
+        with self._lock:
+            cached = self._maps.get(path)
+            if cached is not None and cached[0] == size:
+                return cached[1]
+
+            with open(path, 'rb') as file:
+                magic, record_size = _HEADER.unpack(file.read(_HEADER.size))
+            if magic != _MAGIC or record_size != CANDLE_DTYPE.itemsize:
+                raise ValueError(f"{path} is not a candle store file.")
+
+            count = (size - _HEADER.size) // CANDLE_DTYPE.itemsize
+            records = np.memmap(path, dtype=CANDLE_DTYPE, mode='r', offset=_HEADER.size, shape=(count,))
+            self._maps[path] = (size, records)
+            return records
+
+    def range(self, product_id: str, granularity: Union[Granularity, str],
+              start: Optional[int] = None, end: Optional[int] = None) -> CandleArrays:
+        """
+        Candles starting within `[start, end)`, unix seconds, as zero-copy views on the file.
+        """
+
+        records = self.records(product_id, granularity)
+        starts = records['start']
+        first = int(np.searchsorted(starts, start, side='left')) if start is not None else 0
+        last = int(np.searchsorted(starts, end, side='left')) if end is not None else len(records)
+
+        selected = records[first:last]
+        return CandleArrays(selected['start'], selected['open'], selected['high'], selected['low'],
+                            selected['close'], selected['volume'])
+
+    def last_start(self, product_id: str, granularity: Union[Granularity, str]) -> Optional[int]:
+        """
+        Start of the most recent candle stored, e.g. to resume downloads from it.
+        """
+
+        records = self.records(product_id, granularity)
+        return int(records['start'][-1]) if len(records) else None
+
+    def write(self, product_id: str, granularity: Union[Granularity, str],
+              candles: Union[CandlesPage, CandleArrays, Iterable[Candle]]) -> int:
+        """
+        Merges candles into the store, candles already stored are replaced.
+
+        :return: The number of candles added.
+        """
+
+        arrays = candles if isinstance(candles, CandleArrays) else CandleArrays.from_candles(candles)
+        new = np.empty(len(arrays), dtype=CANDLE_DTYPE)
+        for field in CANDLE_DTYPE.names:
+            new[field] = getattr(arrays, field)
+        if not len(new):
+            return 0
+
+        # Keep the last occurrence of duplicated starts.
+        _, last_indexes = np.unique(new['start'][::-1], return_index=True)
+        new = new[len(new) - 1 - last_indexes]
+
+        path = self.path(product_id, granularity)
+        existing = self.records(product_id, granularity)
+        if not len(existing):
+            self._rewrite(path, new)
+            return len(new)
+
+        last = existing['start'][-1]
+        if new['start'][0] >= last:
+            # Common case, only the candle in progress and newer ones.
+            self._write_tail(path, len(existing), new, replaces_last=new['start'][0] == last)
+            return len(new) - int(new['start'][0] == last)
+
+        merged = np.concatenate((existing, new))
+        merged = merged[::-1]
+        _, indexes = np.unique(merged['start'], return_index=True)
+        merged = merged[indexes]
+        added = len(merged) - len(existing)
+        self._rewrite(path, merged)
+        return added
+
+    def append(self, product_id: str, granularity: Union[Granularity, str], start: int, open: float,
+               high: float, low: float, close: float, volume: float) -> None:
+        """
+        Appends a live candle, or updates it in place when it is the last one stored.
+        """
+
+        record = np.array([(start, open, high, low, close, volume)], dtype=CANDLE_DTYPE)
+        path = self.path(product_id, granularity)
+        existing = self.records(product_id, granularity)
+
+        if not len(existing):
+            self._rewrite(path, record)
+        elif start >= existing['start'][-1]:
+            self._write_tail(path, len(existing), record, replaces_last=start == existing['start'][-1])
+        else:
+            self.write(product_id, granularity, CandleArrays(
+                record['start'], record['open'], record['high'], record['low'], record['close'], record['volume']))
+
+    def on_candles(self, event: 'CandlesEvent') -> None:
+        """
+        Websocket callback for the `candles` channel, which sends five minute candles.
+        """
+
+        for candle in event.candles:
+            self.append(candle.product_id, Granularity.FIVE_MINUTE, int(candle.start), float(candle.open),
+                        float(candle.high), float(candle.low), float(candle.close), float(candle.volume))
+
+    def _write_tail(self, path: str, count: int, records: np.ndarray, replaces_last: bool) -> None:
+        with open(path, 'r+b') as file:
+            file.seek(_HEADER.size + (count - 1 if replaces_last else count) * CANDLE_DTYPE.itemsize)
+            file.write(records.tobytes())
+
+    def _rewrite(self, path: str, records: np.ndarray) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = path + '.tmp'
+        with open(temporary, 'wb') as file:
+            file.write(_HEADER.pack(_MAGIC, CANDLE_DTYPE.itemsize))
+            file.write(records.tobytes())
+        os.replace(temporary, path)
+
+        with self._lock:
+            self._maps.pop(path, None)
@@ -0,0 +1,162 @@
+"""
+Array-backed candles and local resampling into coarser granularities.
+
+Requires numpy, installed with the `numpy` extra: `pip install coinbaseadvanced[numpy]`.
+"""
+
+from typing import Dict, Iterable, Optional, Union
+
+import numpy as np
+
+from coinbaseadvanced.models.products import GRANULARITY_MAP_IN_MINUTES, Candle, CandlesPage, Granularity
+
+# Bucket sizes, in seconds, not offered by the API.
+FOUR_HOUR = 4 * 60 * 60
+ONE_WEEK = 7 * 24 * 60 * 60
+
+# The unix epoch is a Thursday, weekly buckets start on Mondays 00:00 UTC instead.
+WEEK_ORIGIN = 4 * 24 * 60 * 60
+
+
+def granularity_seconds(granularity: Union[Granularity, int]) -> int:
+    """
+    Bucket size in seconds of a `Granularity`, integers are returned as is.
+    """
+
+    if isinstance(granularity, Granularity):
+        if granularity.value not in GRANULARITY_MAP_IN_MINUTES:
+            raise ValueError(f"Granularity {granularity.value} has no bucket size.")
+        return GRANULARITY_MAP_IN_MINUTES[granularity.value] * 60
+    return int(granularity)
+
+
+class CandleArrays:
+    """
+    Candles stored column-wise as numpy arrays sorted by ascending start time.
+
+    Attributes:
+        start (np.ndarray): Bucket start, unix seconds (int64).
+        open (np.ndarray): Opening prices (float64).
+        high (np.ndarray): Highest prices (float64).
+        low (np.ndarray): Lowest prices (float64).
+        close (np.ndarray): Closing prices (float64).
+        volume (np.ndarray): Traded volume (float64).
+    """
+
+    __slots__ = ('start', 'open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self,
+                 start: np.ndarray,
+                 open: np.ndarray,
+                 high: np.ndarray,
+                 low: np.ndarray,
+                 close: np.ndarray,
+                 volume: np.ndarray) -> None:
+        self.start = start
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+    @classmethod
+    def from_candles(cls, candles: Iterable[Candle]) -> 'CandleArrays':
+        """
+        Factory method from `Candle` objects in any order, e.g. a `CandlesPage`.
+        """
+
+        rows = [(c.start, c.open, c.high, c.low, c.close, c.volume) for c in candles]
+        if not rows:
+            return cls.empty()
+
+        table = np.array(rows, dtype=np.float64)
+        order = np.argsort(table[:, 0], kind='stable')
+        table = table[order]
+
+        return cls(table[:, 0].astype(np.int64), table[:, 1], table[:, 2],
+                   table[:, 3], table[:, 4], table[:, 5])
+
+    @classmethod
+    def empty(cls) -> 'CandleArrays':
+        """
+        Factory method of a series without candles.
+        """
+
+        prices = np.empty(0, dtype=np.float64)
+        return cls(np.empty(0, dtype=np.int64), prices, prices, prices, prices, prices)
+
+    def to_page(self) -> CandlesPage:
+        """
+        Converts back into a `CandlesPage`, newest candle first like the API returns them.
+        """
+
+        page = CandlesPage([])
+        page.candles = [
+            Candle(str(start), repr(low), repr(high), repr(open_), repr(close), repr(volume))
+            for start, open_, high, low, close, volume in zip(
+                self.start[::-1].tolist(), self.open[::-1].tolist(), self.high[::-1].tolist(),
+                self.low[::-1].tolist(), self.close[::-1].tolist(), self.volume[::-1].tolist())]
+        return page
+
+    def __len__(self):
+        return len(self.start)
+
+    def __repr__(self):
+        return f"CandleArrays(len={len(self)}, first={self.start[:1]}, last={self.start[-1:]})"
+
+
+def resample(candles: Union[CandlesPage, CandleArrays],
+             granularity: Union[Granularity, int],
+             source: Optional[Union[Granularity, int]] = None,
+             origin: Optional[int] = None) -> CandleArrays:
+    """
+    Aggregates candles into coarser buckets.
+
+    Buckets start at `origin + k * size` and take the open of their first candle, the
+    close of their last one, the extreme high and low, and the summed volume. Buckets
+    without any candle are omitted, like the API does, and the last bucket may be
+    partial when the source series ends in the middle of it.
+
+    Args:
+    - candles: Source candles, of a granularity dividing the target one.
+    - granularity: Target `Granularity`, or bucket size in seconds, e.g. `FOUR_HOUR` or `ONE_WEEK`.
+    - source: Granularity of `candles`, validated to divide the target one when given.
+    - origin: Alignment of the buckets, unix seconds. Defaults to Mondays 00:00 UTC
+              for whole weeks and to the unix epoch otherwise, which is how the API aligns.
+    """
+
+    arrays = candles if isinstance(candles, CandleArrays) else CandleArrays.from_candles(candles)
+    size = granularity_seconds(granularity)
+    if size <= 0:
+        raise ValueError(f"Invalid bucket size: {size}.")
+    if origin is None:
+        origin = WEEK_ORIGIN if size % ONE_WEEK == 0 else 0
+
+    if source is not None and size % granularity_seconds(source):
+        raise ValueError(f"Bucket size {size}s is not a multiple of the source one "
+                         f"({granularity_seconds(source)}s).")
+
+    if len(arrays) == 0:
+        return CandleArrays.empty()
+
+    buckets = (arrays.start - origin) // size
+    firsts = np.concatenate(([0], np.flatnonzero(np.diff(buckets)) + 1))
+    lasts = np.concatenate((firsts[1:] - 1, [len(buckets) - 1]))
+
+    return CandleArrays(buckets[firsts] * size + origin,
+                        arrays.open[firsts],
+                        np.maximum.reduceat(arrays.high, firsts),
+                        np.minimum.reduceat(arrays.low, firsts),
+                        arrays.close[lasts],
+                        np.add.reduceat(arrays.volume, firsts))
+
+
+def resample_many(candles: Union[CandlesPage, CandleArrays],
+                  granularities: Iterable[Union[Granularity, int]],
+                  source: Optional[Union[Granularity, int]] = None) -> Dict[Union[Granularity, int], CandleArrays]:
+    """
+    Builds several coarser series out of a single fetch of the finest one.
+    """
+
+    arrays = candles if isinstance(candles, CandleArrays) else CandleArrays.from_candles(candles)
+    return {granularity: resample(arrays, granularity, source) for granularity in granularities}
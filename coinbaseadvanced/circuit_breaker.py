@@ -0,0 +1,206 @@
+"""
+Circuit breakers failing requests fast while an endpoint family is degraded.
+
+Every endpoint family (accounts, orders, products, ...) has its own circuit. A closed
+circuit lets requests through and watches their outcomes; once too many of the recent
+ones failed or were slow it opens, and requests fail right away with
+`CircuitOpenError` instead of waiting for `timeout`. After `open_seconds` the circuit
+is half open: a few probe requests go through and either close it again or reopen it.
+"""
+
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Deque, Dict, List, Optional, Tuple
+
+from coinbaseadvanced.endpoints import ENDPOINTS
+from coinbaseadvanced.instrumentation import CIRCUIT_EVENT, REQUEST_EVENT, CircuitEvent, Hooks, RequestEvent
+from coinbaseadvanced.models.error import CircuitOpenError
+
+
+class CircuitState(Enum):
+    """
+    Enum representing the states of a circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class _Circuit:
+    # State of one endpoint family, guarded by the breaker lock.
+
+    __slots__ = ('state', 'outcomes', 'opened_at', 'probes', 'probed_at', 'successes')
+
+    def __init__(self, window: int) -> None:
+        self.state = CircuitState.CLOSED
+        self.outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=window)
+        self.opened_at = 0.0
+        self.probes = 0
+        self.probed_at = 0.0
+        self.successes = 0
+
+
+class CircuitBreaker:
+    """
+    Circuit breakers of the endpoint families of a client.
+
+    Failures are transport errors (connection errors, timeouts) and 5xx responses; slow
+    calls are the ones taking longer than `slow_call_duration`. Outcomes are observed
+    through the client `REQUEST_EVENT` hook and every state change is emitted as a
+    `CIRCUIT_EVENT` with a `CircuitEvent`.
+
+    Usage:
+        client = CoinbaseAdvancedTradeAPIClient(..., circuit_breaker=CircuitBreaker())
+        client.hooks.add(CIRCUIT_EVENT, print)
+
+    Args:
+    - failure_rate: Share of failed requests among the recent ones opening the circuit.
+    - slow_call_duration: Seconds after which a request counts as slow, `None` to ignore latency.
+    - slow_call_rate: Share of slow requests among the recent ones opening the circuit.
+    - window: Recent requests of a family the rates are computed over.
+    - min_calls: Requests observed before the rates are checked.
+    - open_seconds: Seconds an open circuit fails requests before letting probes through.
+    - half_open_probes: Successful probes closing a half open circuit, also the probes
+                        allowed in flight at once.
+    """
+
+    def __init__(self,
+                 failure_rate: float = 0.5,
+                 slow_call_duration: Optional[float] = None,
+                 slow_call_rate: float = 0.5,
+                 window: int = 20,
+                 min_calls: int = 10,
+                 open_seconds: float = 30.0,
+                 half_open_probes: int = 1) -> None:
+        if not 0 < failure_rate <= 1 or not 0 < slow_call_rate <= 1:
+            raise ValueError("failure_rate and slow_call_rate must be between 0 and 1")
+
+        self.failure_rate = failure_rate
+        self.slow_call_duration = slow_call_duration
+        self.slow_call_rate = slow_call_rate
+        self.window = window
+        self.min_calls = max(1, min(min_calls, window))
+        self.open_seconds = open_seconds
+        self.half_open_probes = max(1, half_open_probes)
+
+        self._circuits: Dict[str, _Circuit] = {}
+        self._hooks: Optional[Hooks] = None
+        self._lock = threading.Lock()
+
+    def bind(self, hooks: Hooks) -> None:
+        """
+        Observes the requests reported to `hooks` and emits the state changes on them.
+        Called by the client the breaker is given to.
+        """
+
+        self._hooks = hooks
+        hooks.add(REQUEST_EVENT, self.observe)
+
+    def state(self, family: str) -> CircuitState:
+        """
+        Current state of the circuit of `family`.
+        """
+
+        with self._lock:
+            circuit = self._circuits.get(family)
+            if circuit is None:
+                return CircuitState.CLOSED
+            if circuit.state is CircuitState.OPEN and time.monotonic() - circuit.opened_at >= self.open_seconds:
+                return CircuitState.HALF_OPEN
+            return circuit.state
+
+    def allow(self, family: str) -> None:
+        """
+        Raises `CircuitOpenError` if the circuit of `family` does not let a request through now.
+        """
+
+        transitions = []
+        try:
+            with self._lock:
+                circuit = self._circuits.get(family)
+                if circuit is None or circuit.state is CircuitState.CLOSED:
+                    return
+
+                now = time.monotonic()
+                if circuit.state is CircuitState.OPEN:
+                    remaining = self.open_seconds - (now - circuit.opened_at)
+                    if remaining > 0:
+                        raise CircuitOpenError(family, remaining)
+                    self._transition(family, circuit, CircuitState.HALF_OPEN, "open_seconds elapsed", transitions)
+
+                # Probes that never reported, e.g. failed before sending, stop blocking after `open_seconds`.
+                if circuit.probes >= self.half_open_probes and now - circuit.probed_at < self.open_seconds:
+                    raise CircuitOpenError(family, self.open_seconds - (now - circuit.probed_at))
+                if circuit.probes >= self.half_open_probes:
+                    circuit.probes = 0
+                circuit.probes += 1
+                circuit.probed_at = now
+        finally:
+            self._emit(transitions)
+
+    def observe(self, event: RequestEvent) -> None:
+        """
+        Records the outcome of a request, `REQUEST_EVENT` callback.
+        """
+
+        endpoint = ENDPOINTS.get(event.endpoint)
+        if endpoint is None:
+            return
+
+        family = endpoint.family
+        failed = event.error is not None or (event.status_code is not None and event.status_code >= 500)
+        slow = self.slow_call_duration is not None and event.elapsed > self.slow_call_duration
+
+        transitions = []
+        with self._lock:
+            circuit = self._circuits.get(family)
+            if circuit is None:
+                circuit = self._circuits[family] = _Circuit(self.window)
+
+            if circuit.state is CircuitState.CLOSED:
+                circuit.outcomes.append((failed, slow))
+                if len(circuit.outcomes) >= self.min_calls:
+                    failures = sum(1 for outcome in circuit.outcomes if outcome[0])
+                    slow_calls = sum(1 for outcome in circuit.outcomes if outcome[1])
+                    if failures >= self.failure_rate * len(circuit.outcomes):
+                        self._open(family, circuit, f"{failures} of {len(circuit.outcomes)} requests failed",
+                                   transitions)
+                    elif self.slow_call_duration is not None and \
+                            slow_calls >= self.slow_call_rate * len(circuit.outcomes):
+                        self._open(family, circuit, f"{slow_calls} of {len(circuit.outcomes)} requests slower "
+                                   f"than {self.slow_call_duration}s", transitions)
+
+            elif circuit.state is CircuitState.HALF_OPEN:
+                circuit.probes = max(0, circuit.probes - 1)
+                if failed or slow:
+                    self._open(family, circuit, "probe failed" if failed else "probe slow", transitions)
+                else:
+                    circuit.successes += 1
+                    if circuit.successes >= self.half_open_probes:
+                        circuit.outcomes.clear()
+                        self._transition(family, circuit, CircuitState.CLOSED, "probes succeeded", transitions)
+
+            # Requests sent before the circuit opened are ignored while it is open.
+
+        self._emit(transitions)
+
+    def _open(self, family: str, circuit: _Circuit, reason: str, transitions: List[CircuitEvent]) -> None:
+        circuit.opened_at = time.monotonic()
+        self._transition(family, circuit, CircuitState.OPEN, reason, transitions)
+
+    @staticmethod
+    def _transition(family: str, circuit: _Circuit, state: CircuitState, reason: str,
+                    transitions: List[CircuitEvent]) -> None:
+        transitions.append(CircuitEvent(family, circuit.state.value, state.value, reason))
+        circuit.state = state
+        circuit.probes = 0
+        circuit.successes = 0
+
+    def _emit(self, transitions: List[CircuitEvent]) -> None:
+        # Outside the lock, callbacks may query the breaker.
+        if self._hooks is not None:
+            for transition in transitions:
+                self._hooks.emit(CIRCUIT_EVENT, transition)
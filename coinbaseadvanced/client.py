@@ -2,27 +2,81 @@
 API Client for Coinbase Advanced Trade endpoints.
 """
 
+from __future__ import annotations
+
 import hmac
 import hashlib
+import importlib
 import time
 import json
+import threading
 
-from typing import Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple, Union
 from enum import Enum
-from datetime import datetime, timedelta
-from cryptography.hazmat.primitives import serialization
-import requests
-import jwt
-
-from coinbaseadvanced.models.common import EmptyResponse, UnixTime
-from coinbaseadvanced.models.fees import TransactionsSummary
-from coinbaseadvanced.models.portfolios import Portfolio, PortfolioBreakdown, \
-    PortfolioFundsTransfer, PortfolioType, PortfoliosPage
-from coinbaseadvanced.models.products import BidAsksPage, ProductBook, ProductsPage, Product, \
-    CandlesPage, TradesPage, ProductType, Granularity, GRANULARITY_MAP_IN_MINUTES
-from coinbaseadvanced.models.accounts import AccountsPage, Account
-from coinbaseadvanced.models.orders import OrderEditPreview, OrderPlacementSource, OrdersPage, Order, OrderEdit, \
-    OrderBatchCancellation, FillsPage, Side, StopDirection, OrderType
+from datetime import datetime
+
+from coinbaseadvanced.endpoints import ENDPOINTS
+from coinbaseadvanced.instrumentation import REQUEST_EVENT, Hooks, RequestEvent
+from coinbaseadvanced.rate_limiter import Priority, PriorityRateLimiter, WaitStats
+
+# Heavy dependencies (`requests`, `cryptography`, `jwt`) and the model modules are
+# imported on first use so that short lived processes only pay for what they call,
+# e.g. legacy auth users never load `cryptography`.
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+
+    from coinbaseadvanced.circuit_breaker import CircuitBreaker
+    from coinbaseadvanced.hedging import HedgeStats, Hedging
+    from coinbaseadvanced.transports import Transport
+    from coinbaseadvanced.models.common import EmptyResponse, StreamedPage, UnixTime
+    from coinbaseadvanced.models.fees import TransactionsSummary
+    from coinbaseadvanced.models.portfolios import Portfolio, PortfolioBreakdown, PortfolioBreakdowns, \
+        PortfolioFundsTransfer, PortfolioType, PortfoliosPage
+    from coinbaseadvanced.models.products import BidAsksPage, BookSnapshots, ProductBook, ProductsPage, Product, \
+        CandlesPage, TradesPage, ProductType, Granularity
+    from coinbaseadvanced.models.accounts import AccountsPage, Account
+    from coinbaseadvanced.models.orders import OrderEditPreview, OrderPlacementSource, OrdersPage, Order, \
+        OrderEdit, OrderBatchCancellation, FillsPage, Side, StopDirection, OrderType, OrderSpec, \
+        OrdersBulkPlacement, CancelAllReport
+    from coinbaseadvanced.order_state import OrderStateStore
+
+# Names this module has always exposed, resolved lazily by `__getattr__`.
+_LAZY_ATTRIBUTES = {
+    'requests': ('requests', None),
+    'Side': ('coinbaseadvanced.models.orders', 'Side'),
+    'StopDirection': ('coinbaseadvanced.models.orders', 'StopDirection'),
+    'OrderType': ('coinbaseadvanced.models.orders', 'OrderType'),
+    'OrderPlacementSource': ('coinbaseadvanced.models.orders', 'OrderPlacementSource'),
+    'OrderSpec': ('coinbaseadvanced.models.orders', 'OrderSpec'),
+    'ProductType': ('coinbaseadvanced.models.products', 'ProductType'),
+    'Granularity': ('coinbaseadvanced.models.products', 'Granularity'),
+    'GRANULARITY_MAP_IN_MINUTES': ('coinbaseadvanced.models.products', 'GRANULARITY_MAP_IN_MINUTES'),
+    'PortfolioType': ('coinbaseadvanced.models.portfolios', 'PortfolioType'),
+}
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module_name, attribute = _LAZY_ATTRIBUTES[name]
+    module = importlib.import_module(module_name)
+    return module if attribute is None else getattr(module, attribute)
+
+
+# Maximum amount of order ids accepted by a single `batch_cancel` call.
+BATCH_CANCEL_MAX_ORDER_IDS = 100
+
+# Failure reason of the orders of a bulk cancel chunk whose request got no answer,
+# the exchange never reports it: their state is unknown.
+CANCEL_REQUEST_FAILED = 'REQUEST_FAILED'
+
+# Pre-computed request signatures older than this are rebuilt before sending.
+# Coinbase rejects legacy signatures older than 30 seconds and cloud tokens expire after 60.
+SIGNATURE_MAX_AGE_SECONDS = 20
+
+# Status codes of idempotent requests worth retrying.
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
 
 
 class AuthSchema(Enum):
@@ -45,7 +99,15 @@ class CoinbaseAdvancedTradeAPIClient(object):
                  secret_key: str,
                  base_url: str = 'https://api.coinbase.com',
                  timeout: int = 10,
-                 auth_schema: AuthSchema = AuthSchema.LEGACY_API_KEYS
+                 auth_schema: AuthSchema = AuthSchema.LEGACY_API_KEYS,
+                 rate_limit: float = 30,
+                 max_workers: int = 8,
+                 max_retries: int = 0,
+                 retry_backoff: float = 0.5,
+                 http2: bool = False,
+                 transport: Optional[Transport] = None,
+                 hedging: Optional[Hedging] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None
                  ) -> None:
         self._base_url = base_url
         self._host = base_url[8:]
@@ -54,6 +116,35 @@ class CoinbaseAdvancedTradeAPIClient(object):
         self.timeout = timeout
         self._auth_schema = auth_schema
 
+        # Shared by every request so that sequential, bulk and concurrent calls
+        # together stay within Coinbase rate limits (30 requests/second for private endpoints).
+        # Waiting requests are served by endpoint priority, cancels first and history crawls last.
+        self._rate_limiter = PriorityRateLimiter(rate_limit)
+        self._max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._private_key = None
+
+        self._max_retries = max_retries
+        self._retry_backoff = retry_backoff
+
+        # HTTP layer, see `coinbaseadvanced.transports`. When not given it is created on
+        # first use: HTTP/2 if requested and httpx and h2 are installed, `requests` otherwise.
+        self._http2 = http2 and transport is None
+        self._transport = transport
+        self._transport_lock = threading.Lock()
+
+        # Instrumentation callbacks, see `coinbaseadvanced.instrumentation`.
+        self.hooks = Hooks()
+
+        # Opt-in duplicates of late idempotent requests, see `coinbaseadvanced.hedging`.
+        self.hedging = hedging
+
+        # Opt-in fail fast of degraded endpoint families, see `coinbaseadvanced.circuit_breaker`.
+        self.circuit_breaker = circuit_breaker
+        if circuit_breaker is not None:
+            circuit_breaker.bind(self.hooks)
+
     @staticmethod
     def from_legacy_api_keys(api_key: str,
                              secret_key: str):
@@ -77,7 +168,8 @@ class CoinbaseAdvancedTradeAPIClient(object):
 
     # Accounts #
 
-    def list_accounts(self, limit: int = 49, cursor: Optional[str] = None) -> AccountsPage:
+    def list_accounts(self, limit: int = 49, cursor: Optional[str] = None,
+                      stream: bool = False) -> Union[AccountsPage, StreamedPage]:
         """
         https://docs.cdp.coinbase.com/advanced-trade/reference/retailbrokerageapi_getaccounts/
 
@@ -92,24 +184,16 @@ class CoinbaseAdvancedTradeAPIClient(object):
         - cursor: Cursor used for pagination. When provided, the response returns
                   responses after this cursor.
 
-        """
+        - stream: Returns a `StreamedPage` yielding the accounts while the response is received.
 
-        request_path = '/api/v3/brokerage/accounts'
-        method = "GET"
-        query_params = '?limit='+str(limit)
-
-        headers = self._build_request_headers(method, request_path) if self._is_legacy_auth(
-        ) else self._build_request_headers_for_cloud(method, self._host, request_path)
-
-        if cursor is not None:
-            query_params = query_params + '&cursor='+cursor
+        """
 
-        response = requests.get(self._base_url+request_path+query_params,
-                                headers=headers,
-                                timeout=self.timeout)
+        query = {'limit': limit, 'cursor': cursor}
+        if stream:
+            from coinbaseadvanced.models.accounts import Account
+            return self._request_streamed('list_accounts', query, 'accounts', Account)
 
-        page = AccountsPage.from_response(response)
-        return page
+        return self._request('list_accounts', query=query)
 
     def list_accounts_all(self, limit: int = 250, cursor: Optional[str] = None) -> AccountsPage:
         """
@@ -119,6 +203,8 @@ class CoinbaseAdvancedTradeAPIClient(object):
         increased to the maximum coinbase allows.
         """
 
+        from coinbaseadvanced.models.accounts import AccountsPage
+
         full_page = AccountsPage([], has_next=True, cursor=cursor, size=0)
 
         # if there are more accounts to request, do so
@@ -144,17 +230,7 @@ class CoinbaseAdvancedTradeAPIClient(object):
 
         """
 
-        request_path = f"/api/v3/brokerage/accounts/{account_id}"
-        method = "GET"
-
-        headers = self._build_request_headers(method, request_path) if self._is_legacy_auth(
-        ) else self._build_request_headers_for_cloud(method, self._host, request_path)
-
-        response = requests.get(
-            self._base_url+request_path, headers=headers, timeout=self.timeout)
-
-        account = Account.from_response(response)
-        return account
+        return self._request('get_account', path_params={'account_id': account_id})
 
     # Orders #
 
@@ -180,6 +256,8 @@ class CoinbaseAdvancedTradeAPIClient(object):
             }
         }
 
+        from coinbaseadvanced.models.orders import Side
+
         return self.create_order(client_order_id, product_id, Side.BUY, order_configuration, retail_portfolio_id)
 
     def create_sell_market_order(self,
@@ -204,6 +282,8 @@ class CoinbaseAdvancedTradeAPIClient(object):
             }
         }
 
+        from coinbaseadvanced.models.orders import Side
+
         return self.create_order(client_order_id, product_id, Side.SELL, order_configuration, retail_portfolio_id)
 
     def create_limit_order(
@@ -231,24 +311,13 @@ class CoinbaseAdvancedTradeAPIClient(object):
         - post_only: Post only limit order
         """
 
-        order_configuration = {}
+        from coinbaseadvanced.models.orders import OrderSpec
 
-        limit_order_configuration: Dict[str, Union[str, bool]] = {
-            "limit_price": str(limit_price),
-            "base_size": str(base_size),
-        }
+        spec = OrderSpec.limit(client_order_id, product_id, side, limit_price,
+                               base_size, cancel_time, post_only, retail_portfolio_id)
 
-        if post_only is not None:
-            limit_order_configuration['post_only'] = post_only
-
-        if cancel_time is not None:
-            limit_order_configuration['end_time'] = cancel_time.strftime(
-                "%Y-%m-%dT%H:%M:%SZ")
-            order_configuration['limit_limit_gtd'] = limit_order_configuration
-        else:
-            order_configuration['limit_limit_gtc'] = limit_order_configuration
-
-        return self.create_order(client_order_id, product_id, side, order_configuration, retail_portfolio_id)
+        return self.create_order(spec.client_order_id, spec.product_id, spec.side,
+                                 spec.order_configuration, spec.retail_portfolio_id)
 
     def create_stop_limit_order(
             self,
@@ -316,27 +385,59 @@ class CoinbaseAdvancedTradeAPIClient(object):
         for that product enter a failed state immediately.
         """
 
-        request_path = "/api/v3/brokerage/orders"
-        method = "POST"
+        from coinbaseadvanced.models.orders import OrderSpec
 
-        payload = {
-            'client_order_id': client_order_id,
-            'product_id': product_id,
-            'side': side.value,
-            'order_configuration': order_configuration,
-        }
-        if retail_portfolio_id is not None:
-            payload['retail_portfolio_id'] = retail_portfolio_id
+        payload = OrderSpec(client_order_id, product_id, side,
+                            order_configuration, retail_portfolio_id).to_payload()
 
-        headers = self._build_request_headers(method, request_path, json.dumps(payload)) \
-            if self._is_legacy_auth() \
-            else self._build_request_headers_for_cloud(method, self._host, request_path)
-        response = requests.post(self._base_url+request_path,
-                                 json=payload, headers=headers,
-                                 timeout=self.timeout)
+        return self._request('create_order', payload=payload)
 
-        order = Order.from_create_order_response(response)
-        return order
+    def create_orders_bulk(self, orders: List[OrderSpec]) -> OrdersBulkPlacement:
+        """
+        Create many orders concurrently within the client rate limit.
+
+        Payloads are serialized and signed before the first order is sent so that the
+        worker threads only do network I/O. Failures do not abort the other orders,
+        they are captured in the placement of the failing order.
+
+        Args:
+        - orders: Orders to create, see `OrderSpec.limit` to build limit orders.
+
+        Returns placements in the same order as `orders`, with per-order latency.
+        """
+
+        from coinbaseadvanced.models.orders import OrderPlacement, OrdersBulkPlacement
+
+        endpoint = ENDPOINTS['create_order']
+        started = time.perf_counter()
+
+        bodies = [json.dumps(spec.to_payload()) for spec in orders]
+        signed_at = time.time()
+        signed_headers = self._build_bulk_request_headers(endpoint.method, endpoint.path, bodies)
+
+        def place(index: int) -> OrderPlacement:
+            self._rate_limiter.acquire(priority=endpoint.priority)
+
+            headers = signed_headers[index]
+            if time.time() - signed_at > SIGNATURE_MAX_AGE_SECONDS:
+                headers = self._build_bulk_request_headers(
+                    endpoint.method, endpoint.path, [bodies[index]])[0]
+
+            sent = time.perf_counter()
+            try:
+                order = self._request('create_order', body=bodies[index], headers=headers,
+                                      rate_limited=False)
+                error = None
+            except Exception as e:  # pylint: disable=broad-except
+                order, error = None, e
+
+            return OrderPlacement(order, error, time.perf_counter() - sent)
+
+        executor = self._get_executor()
+        futures = [executor.submit(place, index) for index in range(len(orders))]
+        placements = [future.result() for future in futures]
+
+        return OrdersBulkPlacement(placements, time.perf_counter() - started)
 
     def edit_order(self, order_id: str, limit_price: float, base_size: float) -> OrderEdit:
         """
@@ -350,24 +451,13 @@ class CoinbaseAdvancedTradeAPIClient(object):
         - base_size: New size for order
         """
 
-        request_path = "/api/v3/brokerage/orders/edit"
-        method = "POST"
-
         payload = {
             'order_id': order_id,
             'price': str(limit_price),
             'size': str(base_size)
         }
 
-        headers = self._build_request_headers(method, request_path, json.dumps(payload)) \
-            if self._is_legacy_auth() \
-            else self._build_request_headers_for_cloud(method, self._host, request_path)
-        response = requests.post(self._base_url+request_path,
-                                 json=payload, headers=headers,
-                                 timeout=self.timeout)
-
-        edit_result = OrderEdit.from_response(response)
-        return edit_result
+        return self._request('edit_order', payload=payload)
 
     def edit_order_preview(self, order_id: str, limit_price: float, base_size: float) -> OrderEditPreview:
         """
@@ -382,24 +472,13 @@ class CoinbaseAdvancedTradeAPIClient(object):
         - base_size: New size for order
         """
 
-        request_path = "/api/v3/brokerage/orders/edit_preview"
-        method = "POST"
-
         payload = {
             'order_id': order_id,
             'price': str(limit_price),
             'size': str(base_size)
         }
 
-        headers = self._build_request_headers(method, request_path, json.dumps(payload)) \
-            if self._is_legacy_auth() \
-            else self._build_request_headers_for_cloud(method, self._host, request_path)
-        response = requests.post(self._base_url+request_path,
-                                 json=payload, headers=headers,
-                                 timeout=self.timeout)
-
-        edit_result = OrderEditPreview.from_response(response)
-        return edit_result
+        return self._request('edit_order_preview', payload=payload)
 
     def cancel_orders(self, order_ids: list) -> OrderBatchCancellation:
         """
@@ -411,23 +490,149 @@ class CoinbaseAdvancedTradeAPIClient(object):
         - order_ids: The IDs of orders cancel requests should be initiated for.
         """
 
-        request_path = "/api/v3/brokerage/orders/batch_cancel/"
-        method = "POST"
+        return self._request('cancel_orders', payload={'order_ids': order_ids})
 
-        payload = {
-            'order_ids': order_ids,
-        }
+    def cancel_orders_bulk(self, order_ids: list,
+                           chunk_size: int = BATCH_CANCEL_MAX_ORDER_IDS) -> OrderBatchCancellation:
+        """
+        Cancel any amount of orders splitting them into `batch_cancel` sized chunks
+        that are sent concurrently within the client rate limit.
+
+        A chunk whose request fails does not abort the others, its orders are reported
+        as not cancelled with the `REQUEST_FAILED` failure reason, which the exchange never
+        sends, and the request error in `error`, also kept in the chunk timing.
 
-        headers = self._build_request_headers(method, request_path, json.dumps(payload)) \
-            if self._is_legacy_auth(
-        ) else self._build_request_headers_for_cloud(method, self._host, request_path)
-        response = requests.post(self._base_url+request_path,
-                                 json=payload,
-                                 headers=headers,
-                                 timeout=self.timeout)
+        Args:
+        - order_ids: The IDs of orders cancel requests should be initiated for.
+        - chunk_size: Amount of order ids per `batch_cancel` call, 100 at most.
+        """
+
+        if not 0 < chunk_size <= BATCH_CANCEL_MAX_ORDER_IDS:
+            raise ValueError(
+                f"chunk_size must be between 1 and {BATCH_CANCEL_MAX_ORDER_IDS}")
+
+        return self._cancel_chunks(order_ids, chunk_size, self._get_executor(), ENDPOINTS['cancel_orders'].priority)
+
+    def cancel_all(self, product_ids: Optional[List[str]] = None,
+                   order_store: Optional[OrderStateStore] = None,
+                   verify: bool = True,
+                   max_rounds: int = 3) -> CancelAllReport:
+        """
+        Kill switch, cancels every open order as fast as possible.
 
-        cancellation_result = OrderBatchCancellation.from_response(response)
-        return cancellation_result
+        Open orders are taken from `order_store` when given, saving the `list_orders` round
+        trip, and cancelled in concurrent `batch_cancel` chunks. Its requests get rate
+        limiter tokens before any other request and run on their own threads, so they never
+        queue behind work already submitted to the client, and are sent even while the
+        circuit breaker is open. The open orders are then listed again and the ones still
+        open cancelled in a new round, up to `max_rounds` rounds. Orders are only reported
+        flat once a `list_orders` check found none open, never on the local store alone.
+
+        Args:
+        - product_ids: Only cancel the orders of these products. Defaults to all products.
+        - order_store: Locally tracked orders, see `coinbaseadvanced.order_state.OrderStateStore`.
+        - verify: List the open orders again after every round, waiting `retry_backoff`
+                  seconds (doubling each round) for the cancels to settle, to check nothing is left.
+        - max_rounds: Cancel rounds at most, while verification finds orders still open.
+        """
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        from coinbaseadvanced.models.orders import CancelAllReport, OrderBatchCancellation
+
+        started = time.perf_counter()
+        products = frozenset(product_ids) if product_ids is not None else None
+
+        # Whether the open orders were last taken from REST rather than from the local store.
+        verified = False
+        if order_store is not None:
+            source = 'local'
+            open_ids = [order.order_id for order in order_store.open_orders()
+                        if products is None or order.product_id in products]
+        else:
+            source = 'rest'
+            open_ids = []
+        if not open_ids:
+            # No local open orders may only mean the store is out of sync.
+            open_ids = self._list_open_order_ids(products)
+            verified = True
+
+        cancellations = []
+        timings = []
+        rounds = 0
+        with ThreadPoolExecutor(max_workers=self._max_workers,
+                                thread_name_prefix='coinbaseadvanced-kill-switch') as executor:
+            while open_ids and rounds < max_rounds:
+                rounds += 1
+                cancellation = self._cancel_chunks(open_ids, BATCH_CANCEL_MAX_ORDER_IDS, executor,
+                                                   Priority.KILL_SWITCH)
+                cancellations.append(cancellation)
+                timings.extend(cancellation.chunk_timings)
+
+                if not verify:
+                    open_ids = [result['order_id'] for result in cancellation.results if not result['success']]
+                    verified = False
+                    break
+
+                # Cancels just accepted may still be listed as open, give them time to settle.
+                time.sleep(self._retry_backoff * 2 ** (rounds - 1))
+                open_ids = self._list_open_order_ids(products)
+                verified = True
+
+        elapsed = time.perf_counter() - started
+        return CancelAllReport(
+            cancellation=OrderBatchCancellation.merge(cancellations, timings),
+            open_order_ids=open_ids,
+            source=source,
+            rounds=rounds,
+            verified=verified,
+            time_to_flat=elapsed if verified and not open_ids else None,
+            elapsed=elapsed)
+
+    def _list_open_order_ids(self, products: Optional[frozenset]) -> List[str]:
+        # `list_orders_all` with kill switch priority, history pages would yield to everything else.
+        order_ids = []
+        query = {'order_status': ['OPEN'], 'limit': 999, 'cursor': None}
+        while True:
+            page = self._request('list_orders', query=query, priority=Priority.KILL_SWITCH)
+            order_ids.extend(order.order_id for order in page.orders
+                             if products is None or order.product_id in products)
+            if not page.has_next:
+                return order_ids
+            query['cursor'] = page.cursor
+
+    def _cancel_chunks(self, order_ids: list, chunk_size: int, executor: ThreadPoolExecutor,
+                       priority: Priority) -> OrderBatchCancellation:
+        from coinbaseadvanced.models.common import ChunkTiming
+        from coinbaseadvanced.models.orders import OrderBatchCancellation
+
+        chunks = [order_ids[i:i+chunk_size]
+                  for i in range(0, len(order_ids), chunk_size)]
+
+        def cancel_chunk(index: int, chunk: list):
+            self._rate_limiter.acquire(priority=priority)
+            started = time.perf_counter()
+            try:
+                cancellation = self._request('cancel_orders', payload={'order_ids': chunk},
+                                             rate_limited=False, priority=priority)
+                error = None
+            except Exception as e:  # pylint: disable=broad-except
+                error = str(e)
+                cancellation = OrderBatchCancellation(results=[{
+                    'success': False,
+                    'failure_reason': CANCEL_REQUEST_FAILED,
+                    'order_id': order_id,
+                    'error': error,
+                } for order_id in chunk])
+            elapsed = time.perf_counter() - started
+            return cancellation, ChunkTiming(index, len(chunk), elapsed, error)
+
+        futures = [executor.submit(cancel_chunk, index, chunk)
+                   for index, chunk in enumerate(chunks)]
+        outcomes = [future.result() for future in futures]
+
+        return OrderBatchCancellation.merge([cancellation for cancellation, _ in outcomes],
+                                            [timing for _, timing in outcomes])
 
     def list_orders(
             self,
@@ -442,7 +647,8 @@ class CoinbaseAdvancedTradeAPIClient(object):
             cursor: Optional[str] = None,
             product_type: Optional[ProductType] = None,
             order_placement_source: Optional[OrderPlacementSource] = None,
-    ) -> OrdersPage:
+            stream: bool = False,
+    ) -> Union[OrdersPage, StreamedPage]:
         """
         https://docs.cdp.coinbase.com/advanced-trade/reference/retailbrokerageapi_gethistoricalorders
 
@@ -475,64 +681,29 @@ class CoinbaseAdvancedTradeAPIClient(object):
                         Default is to return all product types.
         - order_placement_source: String. Only orders matching this placement source are returned.
                                   Default is to return RETAIL_ADVANCED placement source.
+        - stream: Returns a `StreamedPage` yielding the orders while the response is received,
+                  instead of decoding the whole page first.
         """
 
-        request_path = '/api/v3/brokerage/orders/historical/batch'
-        method = "GET"
-
-        query_params = ''
-
-        if product_id is not None:
-            query_params = self._next_param(
-                query_params) + 'product_id='+product_id
-
-        if order_status is not None:
-            query_params = self._next_param(
-                query_params) + 'order_status='+','.join(order_status)
-
-        if limit is not None:
-            query_params = self._next_param(query_params) + 'limit='+str(limit)
-
-        if start_date is not None:
-            query_params = self._next_param(query_params) \
-                + 'start_date=' + start_date.strftime("%Y-%m-%dT%H:%M:%SZ")
-
-        if end_date is not None:
-            query_params = self._next_param(query_params) \
-                + 'end_date=' + end_date.strftime("%Y-%m-%dT%H:%M:%SZ")
-
-        if user_native_currency is not None:
-            query_params = self._next_param(query_params) \
-                + 'user_native_currency=' + user_native_currency
-
-        if order_type is not None:
-            query_params = self._next_param(
-                query_params) + 'order_type=' + order_type.value
-
-        if order_side is not None:
-            query_params = self._next_param(
-                query_params) + 'order_side=' + order_side.value
-
-        if cursor is not None:
-            query_params = self._next_param(query_params) + 'cursor=' + cursor
-
-        if product_type is not None:
-            query_params = self._next_param(
-                query_params) + 'product_type=' + product_type.value
-
-        if order_placement_source is not None:
-            query_params = self._next_param(
-                query_params) + 'order_placement_source=' + order_placement_source.value
-
-        headers = self._build_request_headers(method, request_path) if self._is_legacy_auth(
-        ) else self._build_request_headers_for_cloud(method, self._host, request_path)
+        query = {
+            'product_id': product_id,
+            'order_status': order_status,
+            'limit': limit,
+            'start_date': start_date,
+            'end_date': end_date,
+            'user_native_currency': user_native_currency,
+            'order_type': order_type,
+            'order_side': order_side,
+            'cursor': cursor,
+            'product_type': product_type,
+            'order_placement_source': order_placement_source,
+        }
 
-        response = requests.get(self._base_url+request_path+query_params,
-                                headers=headers,
-                                timeout=self.timeout)
+        if stream:
+            from coinbaseadvanced.models.orders import Order
+            return self._request_streamed('list_orders', query, 'orders', Order)
 
-        page = OrdersPage.from_response(response)
-        return page
+        return self._request('list_orders', query=query)
 
     def list_orders_all(
             self,
@@ -564,6 +735,8 @@ class CoinbaseAdvancedTradeAPIClient(object):
         Returns:
             OrdersPage: An object containing the list of orders and pagination information.
         """
+        from coinbaseadvanced.models.orders import OrdersPage
+
         orders_page = OrdersPage([], has_next=True, cursor=cursor, sequence=0)
 
         while orders_page.has_next:
@@ -587,7 +760,8 @@ class CoinbaseAdvancedTradeAPIClient(object):
 
     def list_fills(self, order_id: Optional[str] = None, product_id: Optional[str] = None,
                    start_date: Optional[datetime] = None, end_date: Optional[datetime] = None,
-                   cursor: Optional[str] = None, limit: int = 100) -> FillsPage:
+                   cursor: Optional[str] = None, limit: int = 100,
+                   stream: bool = False) -> Union[FillsPage, StreamedPage]:
         """
         https://docs.cdp.coinbase.com/advanced-trade/reference/retailbrokerageapi_getfills
 
@@ -613,44 +787,23 @@ class CoinbaseAdvancedTradeAPIClient(object):
                  to be fetched with pagination; also the cursor value
                  in the response can be passed as cursor parameter in
                  the subsequent request.
+        - stream: Returns a `StreamedPage` yielding the fills while the response is received.
         """
 
-        request_path = '/api/v3/brokerage/orders/historical/fills'
-        method = "GET"
-
-        query_params = ''
-
-        if order_id is not None:
-            query_params = self._next_param(
-                query_params) + 'order_id='+order_id
-
-        if product_id is not None:
-            query_params = self._next_param(
-                query_params) + 'product_id='+product_id
-
-        if limit is not None:
-            query_params = self._next_param(query_params) + 'limit='+str(limit)
-
-        if start_date is not None:
-            query_params = self._next_param(query_params) \
-                + 'start_date=' + start_date.strftime("%Y-%m-%dT%H:%M:%SZ")
-
-        if end_date is not None:
-            query_params = self._next_param(query_params) \
-                + 'end_date=' + end_date.strftime("%Y-%m-%dT%H:%M:%SZ")
-
-        if cursor is not None:
-            query_params = self._next_param(query_params) + 'cursor=' + cursor
-
-        headers = self._build_request_headers(method, request_path) if self._is_legacy_auth(
-        ) else self._build_request_headers_for_cloud(method, self._host, request_path)
+        query = {
+            'order_id': order_id,
+            'product_id': product_id,
+            'limit': limit,
+            'start_date': start_date,
+            'end_date': end_date,
+            'cursor': cursor,
+        }
 
-        response = requests.get(self._base_url+request_path+query_params,
-                                headers=headers,
-                                timeout=self.timeout)
+        if stream:
+            from coinbaseadvanced.models.orders import Fill
+            return self._request_streamed('list_fills', query, 'fills', Fill)
 
-        page = FillsPage.from_response(response)
-        return page
+        return self._request('list_fills', query=query)
 
     def list_fills_all(self, order_id: Optional[str] = None, product_id: Optional[str] = None,
                        start_date: Optional[datetime] = None, end_date: Optional[datetime] = None,
@@ -670,6 +823,8 @@ class CoinbaseAdvancedTradeAPIClient(object):
             FillsPage: An instance of the FillsPage class containing the retrieved fills.
 
         """
+        from coinbaseadvanced.models.orders import FillsPage
+
         fills = FillsPage(fills=[], cursor=cursor)
 
         while fills.cursor != '':
@@ -691,17 +846,7 @@ class CoinbaseAdvancedTradeAPIClient(object):
         - order_id: ID of order.
         """
 
-        request_path = f"/api/v3/brokerage/orders/historical/{order_id}"
-        method = "GET"
-
-        headers = self._build_request_headers(method, request_path) if self._is_legacy_auth(
-        ) else self._build_request_headers_for_cloud(method, self._host, request_path)
-
-        response = requests.get(
-            self._base_url+request_path, headers=headers, timeout=self.timeout)
-
-        order = Order.from_get_order_response(response)
-        return order
+        return self._request('get_order', path_params={'order_id': order_id})
 
     # Products #
 
@@ -720,31 +865,100 @@ class CoinbaseAdvancedTradeAPIClient(object):
         - product_type: Type of products to return.
         """
 
-        request_path = '/api/v3/brokerage/products'
-        method = "GET"
+        query = {
+            'limit': limit,
+            'offset': offset,
+            'product_type': product_type,
+        }
+
+        return self._request('list_products', query=query)
 
-        query_params = ''
+    def iter_products_pages(self,
+                            page_size: int = 250,
+                            product_type: Optional[ProductType] = None) -> Iterator[Tuple[int, ProductsPage]]:
+        """
+        Fetches the whole product catalog as offset ranges requested concurrently, yielding
+        `(offset, page)` as each range arrives, so not in offset order.
 
-        if limit is not None:
-            query_params = self._next_param(query_params) + 'limit='+str(limit)
+        The first range tells the total number of products (`num_products`), the other
+        ranges are then all requested at once within the client rate limit. When the
+        total is not reported, ranges are requested `max_workers` at a time until one
+        comes back short.
 
-        if offset is not None:
-            query_params = self._next_param(
-                query_params) + 'offset='+str(offset)
+        Args:
+        - page_size: Number of products per request.
+        - product_type: Type of products to return.
+        """
 
-        if product_type is not None:
-            query_params = self._next_param(
-                query_params) + 'product_type=' + product_type.value
+        from concurrent.futures import as_completed
 
-        headers = self._build_request_headers(method, request_path) if self._is_legacy_auth(
-        ) else self._build_request_headers_for_cloud(method, self._host, request_path)
+        if page_size <= 0:
+            raise ValueError(f"Invalid page size: {page_size}.")
+
+        first = self.list_products(limit=page_size, offset=0, product_type=product_type)
+        yield 0, first
+
+        received = len(first.products)
+        if received < page_size:
+            return
+
+        def fetch(offset: int):
+            return offset, self.list_products(limit=page_size, offset=offset, product_type=product_type)
+
+        total = first.num_products if first.num_products and first.num_products > received else None
+        executor = self._get_executor()
+        next_offset = page_size
+
+        while True:
+            if total is not None:
+                offsets = range(next_offset, total, page_size)
+            else:
+                offsets = range(next_offset, next_offset + page_size * self._max_workers, page_size)
+
+            futures = [executor.submit(fetch, offset) for offset in offsets]
+            complete = total is not None or not futures
+            try:
+                for future in as_completed(futures):
+                    offset, page = future.result()
+                    complete = complete or len(page.products) < page_size
+                    yield offset, page
+            finally:
+                # Left pending when the caller stops iterating or a range fails.
+                for future in futures:
+                    future.cancel()
+
+            if complete:
+                return
+            next_offset = offsets[-1] + page_size
+
+    def list_products_all(self,
+                          page_size: int = 250,
+                          product_type: Optional[ProductType] = None) -> ProductsPage:
+        """
+        Gets the whole product catalog, fetching offset ranges concurrently.
+
+        See `iter_products_pages` to process the ranges as they arrive.
+
+        Args:
+        - page_size: Number of products per request.
+        - product_type: Type of products to return.
+        """
 
-        response = requests.get(self._base_url+request_path+query_params,
-                                headers=headers,
-                                timeout=self.timeout)
+        from coinbaseadvanced.models.products import ProductsPage
 
-        page = ProductsPage.from_response(response)
-        return page
+        pages = sorted(self.iter_products_pages(page_size, product_type), key=lambda item: item[0])
+
+        # A product moving across ranges while they are fetched shows up twice.
+        products_page = ProductsPage([], num_products=0)
+        seen = set()
+        for _, page in pages:
+            for product in page.products:
+                if product.product_id not in seen:
+                    seen.add(product.product_id)
+                    products_page.products.append(product)
+        products_page.num_products = len(products_page.products)
+
+        return products_page
 
     def get_product(self, product_id: str) -> Product:
         """
@@ -756,17 +970,7 @@ class CoinbaseAdvancedTradeAPIClient(object):
         - product_id: The trading pair to get information for.
         """
 
-        request_path = f"/api/v3/brokerage/products/{product_id}"
-        method = "GET"
-
-        headers = self._build_request_headers(method, request_path) if self._is_legacy_auth(
-        ) else self._build_request_headers_for_cloud(method, self._host, request_path)
-
-        response = requests.get(
-            self._base_url+request_path, headers=headers, timeout=self.timeout)
-
-        product = Product.from_response(response)
-        return product
+        return self._request('get_product', path_params={'product_id': product_id})
 
     def get_product_candles(
             self,
@@ -786,27 +990,13 @@ class CoinbaseAdvancedTradeAPIClient(object):
         - granularity: The time slice value for each candle.
         """
 
-        request_path = f"/api/v3/brokerage/products/{product_id}/candles"
-        method = "GET"
-
-        query_params = ''
-
-        query_params = self._next_param(
-            query_params) + 'start=' + str(int(start_date.timestamp()))
-        query_params = self._next_param(
-            query_params) + 'end=' + str(int(end_date.timestamp()))
-        query_params = self._next_param(
-            query_params) + 'granularity=' + granularity.value
-
-        headers = self._build_request_headers(method, request_path) if self._is_legacy_auth(
-        ) else self._build_request_headers_for_cloud(method, self._host, request_path)
-
-        response = requests.get(self._base_url+request_path+query_params,
-                                headers=headers,
-                                timeout=self.timeout)
+        query = {
+            'start': start_date,
+            'end': end_date,
+            'granularity': granularity,
+        }
 
-        product_candles = CandlesPage.from_response(response)
-        return product_candles
+        return self._request('get_product_candles', path_params={'product_id': product_id}, query=query)
 
     def get_product_candles_all(
         self,
@@ -818,42 +1008,108 @@ class CoinbaseAdvancedTradeAPIClient(object):
         Gets all requested product candles
         """
 
-        # step_size: pre-calculate granularity entries in minutes.
-        step_size_in_mins = timedelta(
-            minutes=GRANULARITY_MAP_IN_MINUTES[granularity.value])
-
-        # Max amount of candles that can be returned.
-        # Coinbase API enforcement/error if you try to retrieve >= 300 below:
-        # "start and end argument is invalid - number of candles requested should be less than 300."
-        max_candles_amount = 299
-
-        # request size of 299 (max allowed by coinbase)
-        time_window_in_mins = step_size_in_mins * max_candles_amount
+        from coinbaseadvanced.candle_download import candle_windows
+        from coinbaseadvanced.models.products import CandlesPage
 
         product_candles = CandlesPage([])
 
-        # run through from most recent to oldest to preserve time order in list
-
-        end = end_date
-
-        # while we still have not gotten all the requested candles loop until all are requested
-        while end > start_date:
-            # calculate start for the previous (older) 299 candles
-            begin = end - time_window_in_mins
-
-            # avoid asking for more than requested
-            begin = max(begin, start_date)
-
-            # get the next batch and extend the list
+        # Windows run from most recent to oldest to preserve time order in the list.
+        for begin, end in candle_windows(start_date, end_date, granularity):
             batch_candles = self.get_product_candles(
                 product_id, begin, end, granularity).candles
             product_candles.candles.extend(batch_candles)
 
-            # offset end by one granularity to avoid duplicates
-            end = begin - step_size_in_mins
-
         return product_candles
 
+    def get_candles_for_products(
+            self,
+            product_ids: List[str],
+            start_date: datetime,
+            end_date: datetime,
+            granularity: Granularity,
+            checkpoint_path: Optional[str] = None) -> Iterator[Tuple[str, CandlesPage]]:
+        """
+        Downloads the candles of several products, yielding `(product_id, candles)` as
+        soon as all the candles of a product are received.
+
+        Every (product, window of 299 candles) request is scheduled on the client
+        executor at once, products in the given order, so at most `max_workers`
+        requests are in flight and together they stay within the client rate limit.
+        Candles of each product are ordered most recent first, like `get_product_candles_all`.
+        A failed request does not stop the other products, the first error is raised
+        once they are all yielded.
+
+        Args:
+        - product_ids: The trading pairs.
+        - start_date: Start of the range.
+        - end_date: End of the range.
+        - granularity: The time slice value for each candle.
+        - checkpoint_path: SQLite file saving every window received, see `CandleDownloadCheckpoint`.
+                           Running the same download again with it only requests the missing windows.
+        """
+
+        from concurrent.futures import as_completed
+
+        from coinbaseadvanced.candle_download import CandleDownloadCheckpoint, candle_windows
+        from coinbaseadvanced.models.products import CandlesPage
+
+        windows = candle_windows(start_date, end_date, granularity)
+        product_ids = list(dict.fromkeys(product_ids))
+        checkpoint = CandleDownloadCheckpoint(checkpoint_path) if checkpoint_path is not None else None
+
+        def merged(product_id: str) -> CandlesPage:
+            page = CandlesPage([])
+            for candles in results.pop(product_id):
+                page.candles.extend(candles)
+            return page
+
+        try:
+            results = {}
+            remaining = {}
+            units = []
+            for product_id in product_ids:
+                saved = checkpoint.load(product_id, granularity, windows) if checkpoint is not None else {}
+                results[product_id] = [saved.get(index) for index in range(len(windows))]
+                missing = [index for index in range(len(windows)) if index not in saved]
+                remaining[product_id] = len(missing)
+                units.extend((product_id, index) for index in missing)
+
+            for product_id in product_ids:
+                if not remaining[product_id]:
+                    yield product_id, merged(product_id)
+
+            executor = self._get_executor()
+            futures = {executor.submit(self.get_product_candles, product_id, *windows[index], granularity):
+                       (product_id, index) for product_id, index in units}
+            error = None
+            try:
+                for future in as_completed(futures):
+                    product_id, index = futures[future]
+                    try:
+                        candles = future.result().candles
+                    except Exception as e:  # pylint: disable=broad-except
+                        # The other products carry on, the failed window is requested again on resume.
+                        error = error or e
+                        continue
+
+                    if checkpoint is not None:
+                        checkpoint.save(product_id, granularity, windows[index], candles)
+
+                    results[product_id][index] = candles
+                    remaining[product_id] -= 1
+                    if not remaining[product_id]:
+                        yield product_id, merged(product_id)
+            finally:
+                # Left pending when the caller stops iterating.
+                for future in futures:
+                    future.cancel()
+
+            if error is not None:
+                raise error
+        finally:
+            if checkpoint is not None:
+                checkpoint.close()
+
     def get_market_trades(
             self, product_id: str, limit: int) -> TradesPage:
         """
@@ -867,22 +1123,8 @@ class CoinbaseAdvancedTradeAPIClient(object):
         - limit: Number of trades to return.
         """
 
-        request_path = f"/api/v3/brokerage/products/{product_id}/ticker"
-        method = "GET"
-
-        query_params = ''
-
-        query_params = self._next_param(query_params) + 'limit=' + str(limit)
-
-        headers = self._build_request_headers(method, request_path) if self._is_legacy_auth(
-        ) else self._build_request_headers_for_cloud(method, self._host, request_path)
-
-        response = requests.get(self._base_url+request_path+query_params,
-                                headers=headers,
-                                timeout=self.timeout)
-
-        trades_page = TradesPage.from_response(response)
-        return trades_page
+        return self._request('get_market_trades', path_params={'product_id': product_id},
+                             query={'limit': limit})
 
     def get_product_book(self, product_id: str, limit: Optional[int] = None) -> ProductBook:
         """
@@ -896,25 +1138,42 @@ class CoinbaseAdvancedTradeAPIClient(object):
         - limit: A pagination limit.
         """
 
-        request_path = "/api/v3/brokerage/product_book"
-        method = "GET"
+        return self._request('get_product_book', query={'product_id': product_id, 'limit': limit})
+
+    def get_product_books(self, product_ids: List[str], limit: Optional[int] = None) -> BookSnapshots:
+        """
+        Gets the order books of several products, requesting them concurrently within the client rate limit.
+
+        Every book is a `BookSnapshot` holding its ladders in packed arrays and the time it
+        was received, so the staleness of books can be compared across products. Products
+        whose book could not be fetched are left out and their error kept in `errors`.
 
-        query_params = ''
-        if product_id is not None:
-            query_params = self._next_param(
-                query_params) + 'product_id='+product_id
+        Args:
+        - product_ids: The trading pairs.
+        - limit: Levels per side of every book.
+        """
 
-        if limit is not None:
-            query_params = self._next_param(query_params) + 'limit='+str(limit)
+        from coinbaseadvanced.models.products import BookSnapshots
 
-        headers = self._build_request_headers(method, request_path) if self._is_legacy_auth(
-        ) else self._build_request_headers_for_cloud(method, self._host, request_path)
+        product_ids = list(dict.fromkeys(product_ids))
 
-        response = requests.get(
-            self._base_url+request_path+query_params, headers=headers, timeout=self.timeout)
+        executor = self._get_executor()
+        futures = [executor.submit(self._request, 'get_product_books',
+                                   query={'product_id': product_id, 'limit': limit})
+                   for product_id in product_ids]
+        books = {}
+        errors = {}
+        try:
+            for product_id, future in zip(product_ids, futures):
+                try:
+                    books[product_id] = future.result()
+                except Exception as e:  # pylint: disable=broad-except
+                    errors[product_id] = e
+        finally:
+            for future in futures:
+                future.cancel()
 
-        bid_asks_page = ProductBook.from_response(response)
-        return bid_asks_page
+        return BookSnapshots(books, errors)
 
     def get_best_bid_ask(self, product_ids: Optional[List[str]] = None) -> BidAsksPage:
         """
@@ -926,22 +1185,7 @@ class CoinbaseAdvancedTradeAPIClient(object):
         - product_ids: Subset of all products to be returned instead.
         """
 
-        request_path = "/api/v3/brokerage/best_bid_ask"
-        method = "GET"
-
-        query_params = ''
-        if product_ids is not None:
-            query_params = self._next_param(
-                query_params) + 'product_ids='+'&product_ids='.join(product_ids)
-
-        headers = self._build_request_headers(method, request_path) if self._is_legacy_auth(
-        ) else self._build_request_headers_for_cloud(method, self._host, request_path)
-
-        response = requests.get(
-            self._base_url+request_path+query_params, headers=headers, timeout=self.timeout)
-
-        bid_asks_page = BidAsksPage.from_response(response)
-        return bid_asks_page
+        return self._request('get_best_bid_ask', query={'product_ids': product_ids})
 
     # Fees #
 
@@ -949,43 +1193,21 @@ class CoinbaseAdvancedTradeAPIClient(object):
                                  start_date: Optional[datetime] = None,
                                  end_date: Optional[datetime] = None,
                                  user_native_currency: str = "USD",
-                                 product_type: Optional[ProductType] = None):
+                                 product_type: Optional[ProductType] = None) -> TransactionsSummary:
         """
         https://docs.cdp.coinbase.com/advanced-trade/reference/retailbrokerageapi_gettransactionsummary
 
         Get a summary of transactions with fee tiers, total volume, and fees.
         """
 
-        request_path = '/api/v3/brokerage/transaction_summary'
-        method = "GET"
-
-        query_params = ''
-
-        if start_date is not None:
-            query_params = self._next_param(query_params) \
-                + 'start_date=' + start_date.strftime("%Y-%m-%dT%H:%M:%SZ")
-
-        if end_date is not None:
-            query_params = self._next_param(query_params) \
-                + 'end_date=' + end_date.strftime("%Y-%m-%dT%H:%M:%SZ")
-
-        if user_native_currency is not None:
-            query_params = self._next_param(query_params) \
-                + 'user_native_currency='+user_native_currency
-
-        if product_type is not None:
-            query_params = self._next_param(
-                query_params) + 'product_type='+product_type.value
-
-        headers = self._build_request_headers(method, request_path) if self._is_legacy_auth(
-        ) else self._build_request_headers_for_cloud(method, self._host, request_path)
-
-        response = requests.get(self._base_url+request_path+query_params,
-                                headers=headers,
-                                timeout=self.timeout)
+        query = {
+            'start_date': start_date,
+            'end_date': end_date,
+            'user_native_currency': user_native_currency,
+            'product_type': product_type,
+        }
 
-        page = TransactionsSummary.from_response(response)
-        return page
+        return self._request('get_transactions_summary', query=query)
 
     # Portfolios
 
@@ -1000,22 +1222,7 @@ class CoinbaseAdvancedTradeAPIClient(object):
 
         """
 
-        request_path = '/api/v3/brokerage/portfolios'
-        method = "GET"
-        query_params = ''
-
-        headers = self._build_request_headers(method, request_path) if self._is_legacy_auth(
-        ) else self._build_request_headers_for_cloud(method, self._host, request_path)
-
-        if portfolio_type is not None:
-            query_params = '?portfolio_type='+portfolio_type.value
-
-        response = requests.get(self._base_url+request_path+query_params,
-                                headers=headers,
-                                timeout=self.timeout)
-
-        page = PortfoliosPage.from_response(response)
-        return page
+        return self._request('list_portfolios', query={'portfolio_type': portfolio_type})
 
     def create_portfolio(self, name: str) -> Portfolio:
         """
@@ -1025,22 +1232,7 @@ class CoinbaseAdvancedTradeAPIClient(object):
 
         """
 
-        request_path = "/api/v3/brokerage/portfolios"
-        method = "POST"
-
-        payload = {
-            'name': name,
-        }
-
-        headers = self._build_request_headers(method, request_path, json.dumps(payload)) \
-            if self._is_legacy_auth(
-        ) else self._build_request_headers_for_cloud(method, self._host, request_path)
-        response = requests.post(self._base_url+request_path,
-                                 json=payload, headers=headers,
-                                 timeout=self.timeout)
-
-        portfolio = Portfolio.from_response(response)
-        return portfolio
+        return self._request('create_portfolio', payload={'name': name})
 
     def edit_portfolio(self, portfolio_uuid: str, name: str) -> Portfolio:
         """
@@ -1050,22 +1242,8 @@ class CoinbaseAdvancedTradeAPIClient(object):
 
         """
 
-        request_path = "/api/v3/brokerage/portfolios/"+portfolio_uuid
-        method = "PUT"
-
-        payload = {
-            'name': name,
-        }
-
-        headers = self._build_request_headers(method, request_path, json.dumps(payload))\
-            if self._is_legacy_auth(
-        ) else self._build_request_headers_for_cloud(method, self._host, request_path)
-        response = requests.put(self._base_url+request_path,
-                                json=payload, headers=headers,
-                                timeout=self.timeout)
-
-        portfolio = Portfolio.from_response(response)
-        return portfolio
+        return self._request('edit_portfolio', path_params={'portfolio_uuid': portfolio_uuid},
+                             payload={'name': name})
 
     def delete_portfolio(self, portfolio_uuid: str) -> EmptyResponse:
         """
@@ -1075,19 +1253,8 @@ class CoinbaseAdvancedTradeAPIClient(object):
 
         """
 
-        request_path = "/api/v3/brokerage/portfolios/"+portfolio_uuid
-        method = "DELETE"
-
-        payload = {}
-
-        headers = self._build_request_headers(method, request_path, json.dumps(payload)) \
-            if self._is_legacy_auth(
-        ) else self._build_request_headers_for_cloud(method, self._host, request_path)
-        response = requests.delete(self._base_url+request_path,
-                                   json=payload, headers=headers,
-                                   timeout=self.timeout)
-
-        return EmptyResponse.from_response(response)
+        return self._request('delete_portfolio', path_params={'portfolio_uuid': portfolio_uuid},
+                             payload={})
 
     def get_portfolio_breakdown(self, portfolio_uuid: str) -> PortfolioBreakdown:
         """
@@ -1100,18 +1267,33 @@ class CoinbaseAdvancedTradeAPIClient(object):
 
         """
 
-        request_path = f'/api/v3/brokerage/portfolios/{portfolio_uuid}'
-        method = "GET"
+        return self._request('get_portfolio_breakdown', path_params={'portfolio_uuid': portfolio_uuid})
 
-        headers = self._build_request_headers(method, request_path) if self._is_legacy_auth(
-        ) else self._build_request_headers_for_cloud(method, self._host, request_path)
+    def get_all_portfolio_breakdowns(self,
+                                     portfolio_type: Optional[PortfolioType] = None) -> PortfolioBreakdowns:
+        """
+        Gets the breakdown of every portfolio, requesting them concurrently within the client rate limit.
 
-        response = requests.get(self._base_url+request_path,
-                                headers=headers,
-                                timeout=self.timeout)
+        Deleted portfolios are skipped. The result maps portfolio uuids to their breakdown
+        and combines the spot and perp positions of all portfolios into columnar tables.
 
-        breakdown = PortfolioBreakdown.from_response(response)
-        return breakdown
+        Args:
+        - portfolio_type: Type of portfolios to break down.
+        """
+
+        from coinbaseadvanced.models.portfolios import PortfolioBreakdowns
+
+        uuids = [portfolio.uuid for portfolio in self.list_portfolios(portfolio_type) if not portfolio.deleted]
+
+        executor = self._get_executor()
+        futures = [executor.submit(self.get_portfolio_breakdown, uuid) for uuid in uuids]
+        try:
+            breakdowns = {uuid: future.result() for uuid, future in zip(uuids, futures)}
+        finally:
+            for future in futures:
+                future.cancel()
+
+        return PortfolioBreakdowns(breakdowns)
 
     def move_portfolio_funds(self, funds_value: str,
                              funds_currency: str,
@@ -1124,9 +1306,6 @@ class CoinbaseAdvancedTradeAPIClient(object):
 
         """
 
-        request_path = "/api/v3/brokerage/portfolios/move_funds"
-        method = "POST"
-
         payload = {
             "funds": {
                 "value": funds_value,
@@ -1136,15 +1315,7 @@ class CoinbaseAdvancedTradeAPIClient(object):
             "target_portfolio_uuid": target_portfolio_uuid
         }
 
-        headers = self._build_request_headers(method, request_path, json.dumps(payload)) \
-            if self._is_legacy_auth(
-        ) else self._build_request_headers_for_cloud(method, self._host, request_path)
-        response = requests.post(self._base_url+request_path,
-                                 json=payload, headers=headers,
-                                 timeout=self.timeout)
-
-        transfer = PortfolioFundsTransfer.from_response(response)
-        return transfer
+        return self._request('move_portfolio_funds', payload=payload)
 
     # Common #
 
@@ -1156,19 +1327,163 @@ class CoinbaseAdvancedTradeAPIClient(object):
 
         """
 
-        request_path = "/api/v3/brokerage/time"
-        method = "GET"
+        return self._request('get_unix_time')
+
+    def rate_limit_wait_stats(self, reset: bool = False) -> Dict[Priority, WaitStats]:
+        """
+        Time requests waited for the client rate limiter, by priority class.
+
+        Every endpoint belongs to a `Priority` class, see `coinbaseadvanced.endpoints.ENDPOINTS`.
+        When requests queue up, the ones of the highest class are sent first: cancels,
+        then order creation and edits, account and portfolio reads, market data and
+        finally history and backfill requests such as `list_fills_all` pages.
 
-        headers = self._build_request_headers(method, request_path) if self._is_legacy_auth(
-        ) else self._build_request_headers_for_cloud(method, self._host, request_path)
+        Args:
+        - reset: Start counting again from zero.
+        """
 
-        response = requests.get(
-            self._base_url+request_path, headers=headers, timeout=self.timeout)
+        return self._rate_limiter.wait_stats(reset)
 
-        return UnixTime.from_response(response)
+    def hedge_stats(self, reset: bool = False) -> Dict[str, HedgeStats]:
+        """
+        Hedging outcomes by endpoint name, including the win rate of the duplicates.
+        Empty unless the client was created with `hedging`, see `coinbaseadvanced.hedging.Hedging`.
+
+        Args:
+        - reset: Start counting again from zero.
+        """
+
+        return self.hedging.stats(reset) if self.hedging is not None else {}
 
     # Helpers Methods #
 
+    ## Request Pipeline ##
+
+    def _request(self,
+                 endpoint_name: str,
+                 path_params: Optional[dict] = None,
+                 query: Optional[dict] = None,
+                 payload: Optional[dict] = None,
+                 body: Optional[str] = None,
+                 headers: Optional[dict] = None,
+                 rate_limited: bool = True,
+                 stream: bool = False,
+                 priority: Optional[Priority] = None):
+        """
+        Sends a request to one of the registered `ENDPOINTS` and parses its response.
+
+        `body` and `headers` let callers send an already serialized and signed request,
+        `rate_limited=False` is for callers that already took a rate limiter token and
+        `priority` overrides the rate limiter priority of the endpoint.
+        `stream=True` returns the HTTP response with its body left unread instead of the model.
+        Idempotent endpoints are retried up to `max_retries` times on connection errors,
+        timeouts and retryable status codes. `CircuitOpenError` is raised without sending
+        anything while the circuit breaker of the endpoint family is open.
+        """
+
+        import requests
+
+        endpoint = ENDPOINTS[endpoint_name]
+        request_path = endpoint.build_path(path_params)
+        url = self._base_url + request_path + endpoint.build_query(query)
+
+        if body is None:
+            body = json.dumps(payload) if payload is not None else None
+
+        max_attempts = 1 + (self._max_retries if endpoint.idempotent else 0)
+
+        for attempt in range(max_attempts):
+            # The kill switch is sent even while the circuit is open.
+            if self.circuit_breaker is not None and priority is not Priority.KILL_SWITCH:
+                self.circuit_breaker.allow(endpoint.family)
+
+            if rate_limited:
+                self._rate_limiter.acquire(priority=priority if priority is not None else endpoint.priority)
+
+            request_headers = headers if headers is not None \
+                else self._build_headers(endpoint.method, request_path, body)
+
+            started = time.perf_counter()
+            try:
+                if self.hedging is not None and endpoint.idempotent and not stream \
+                        and self.hedging.applies_to(endpoint.name):
+                    response = self._send_hedged(endpoint, url, request_headers)
+                else:
+                    response = self._send(endpoint.method, url, request_headers, payload, body, stream)
+            except (requests.ConnectionError, requests.Timeout) as error:
+                self.hooks.emit(REQUEST_EVENT, RequestEvent(
+                    endpoint.name, endpoint.method, url, None, time.perf_counter() - started, attempt, error))
+                if attempt + 1 >= max_attempts:
+                    raise
+            else:
+                status_code = getattr(response, 'status_code', None)
+                self.hooks.emit(REQUEST_EVENT, RequestEvent(
+                    endpoint.name, endpoint.method, url, status_code, time.perf_counter() - started, attempt))
+                if attempt + 1 >= max_attempts or status_code not in RETRYABLE_STATUS_CODES:
+                    return response if stream else endpoint.response(response)
+                if stream:
+                    response.close()
+
+            time.sleep(self._retry_backoff * 2 ** attempt)
+
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    def _request_streamed(self, endpoint_name: str, query: dict, key: str, model) -> StreamedPage:
+        from coinbaseadvanced.models.common import StreamedPage
+
+        return StreamedPage.from_response(self._request(endpoint_name, query=query, stream=True), key, model)
+
+    def _send(self, method: str, url: str, headers: dict, payload: Optional[dict], body: Optional[str],
+              stream: bool = False):
+        # `body` is the exact string the legacy signature covers, transports send it as is.
+        return self.transport.send(method, url, headers, payload, body, self.timeout, stream)
+
+    def _send_hedged(self, endpoint, url: str, headers: dict):
+        # The duplicate reuses the signed headers and only goes out if a token is free right now.
+        return self.hedging.send(
+            endpoint.name,
+            lambda: self._send(endpoint.method, url, headers, None, None),
+            lambda: self._rate_limiter.try_acquire(priority=endpoint.priority))
+
+    @property
+    def transport(self) -> Transport:
+        """
+        Transport the requests are sent through.
+        """
+
+        if self._transport is not None:
+            return self._transport
+
+        with self._transport_lock:
+            if self._transport is None:
+                from coinbaseadvanced.http2 import HTTP2Transport, http2_available
+                from coinbaseadvanced.transports import RequestsTransport
+
+                if self._http2 and http2_available():
+                    self._transport = HTTP2Transport(self.timeout)
+                else:
+                    self._http2 = False
+                    self._transport = RequestsTransport()
+            return self._transport
+
+    @property
+    def http2_enabled(self) -> bool:
+        """
+        Whether requests go through the HTTP/2 transport, `False` after falling back to `requests`.
+        """
+
+        # Creating the transport resolves the fallback.
+        return self.transport is not None and self._http2
+
+    def _build_headers(self, method: str, request_path: str, body: Optional[str]) -> dict:
+        if self._is_legacy_auth():
+            headers = self._build_request_headers(method, request_path, body or '')
+        else:
+            headers = self._build_request_headers_for_cloud(method, self._host, request_path)
+        if body is not None:
+            headers['Content-Type'] = 'application/json'
+        return headers
+
     ## Cloud Auth ##
 
     def _build_request_headers_for_cloud(self, method, host, request_path):
@@ -1180,9 +1495,14 @@ class CoinbaseAdvancedTradeAPIClient(object):
         }
 
     def _build_jwt(self, service, uri):
-        private_key_bytes = self._secret_key.encode('utf-8')
-        private_key = serialization.load_pem_private_key(
-            private_key_bytes, password=None)
+        from cryptography.hazmat.primitives import serialization
+        import jwt
+
+        if self._private_key is None:
+            private_key_bytes = self._secret_key.encode('utf-8')
+            self._private_key = serialization.load_pem_private_key(
+                private_key_bytes, password=None)
+        private_key = self._private_key
         jwt_payload = {
             'sub': self._api_key,
             'iss': "coinbase-cloud",
@@ -1214,6 +1534,17 @@ class CoinbaseAdvancedTradeAPIClient(object):
             'CB-ACCESS-SIGN': signature,
         }
 
+    def _build_bulk_request_headers(self, method, request_path, bodies):
+        content_type = {'Content-Type': 'application/json'}
+
+        if not self._is_legacy_auth():
+            # The token only depends on method and path, so it is shared by all the bodies.
+            headers = self._build_request_headers_for_cloud(method, self._host, request_path)
+            return [{**headers, **content_type}] * len(bodies)
+
+        return [{**self._build_request_headers(method, request_path, body), **content_type}
+                for body in bodies]
+
     def _create_signature(self, message):
         signature = hmac.new(
             self._secret_key.encode('utf-8'),
@@ -1225,7 +1556,13 @@ class CoinbaseAdvancedTradeAPIClient(object):
     def _is_legacy_auth(self) -> bool:
         return self._auth_schema == AuthSchema.LEGACY_API_KEYS
 
-    ## Others ##
+    ## Concurrency ##
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        from concurrent.futures import ThreadPoolExecutor
 
-    def _next_param(self, query_params: str) -> str:
-        return query_params + ('?' if query_params == '' else '&')
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers, thread_name_prefix='coinbaseadvanced')
+            return self._executor
@@ -5,10 +5,15 @@ API Client for Coinbase Websocket channels.
 import json
 import time
 import threading
-import websocket
+from typing import TYPE_CHECKING
+
 from coinbaseadvanced.models.market_data import CandlesEvent, HeartbeatEvent, Level2Event, MarketTradesEvent, StatusEvent, TickerBatchEvent, TickerEvent, UserEvent
 from coinbaseadvanced.utils import generate_jwt
 
+# `websocket` is imported when the first subscription starts.
+if TYPE_CHECKING:
+    import websocket
+
 # Mapping of channel names to their corresponding event classes.
 # https://docs.cdp.coinbase.com/advanced-trade/docs/ws-channels/#heartbeats-channel
 CHANNELS = {
@@ -55,7 +60,7 @@ class CoinbaseWebSocketClient:
             "timestamp": int(time.time())
         }
 
-    def _handle_message(self, ws: websocket.WebSocket, message: str) -> None:
+    def _handle_message(self, ws: 'websocket.WebSocket', message: str) -> None:
         """
         Handles incoming WebSocket messages.
 
@@ -105,6 +110,8 @@ class CoinbaseWebSocketClient:
         if callback:
             self.callbacks[channel] = callback
 
+        import websocket
+
         def run():
             ws = websocket.WebSocketApp(
                 self.ws_url,
@@ -118,7 +125,7 @@ class CoinbaseWebSocketClient:
         thread = threading.Thread(target=run)
         thread.start()
 
-    def _on_open(self, ws: websocket.WebSocket, product_ids: list, channel: str):
+    def _on_open(self, ws: 'websocket.WebSocket', product_ids: list, channel: str):
         """
         Handles the WebSocket connection opening by sending subscription messages.
 
@@ -132,16 +139,18 @@ class CoinbaseWebSocketClient:
         heartbeat_message = self._create_message("subscribe", product_ids, "heartbeats")
         ws.send(json.dumps(heartbeat_message))
 
-    def _on_error(self, ws: websocket.WebSocket, error: str):
+    def _on_error(self, ws: 'websocket.WebSocket', error: str):
         """
         Handles errors from the WebSocket.
 
         :param ws: The WebSocket instance.
         :param error: The error message.
         """
+        import websocket
+
         raise websocket.WebSocketException(f"WebSocket error: {error}")
 
-    def _on_close(self, ws: websocket.WebSocket, close_status_code, close_msg):
+    def _on_close(self, ws: 'websocket.WebSocket', close_status_code, close_msg):
         """
         Handles the WebSocket connection closing.
 
@@ -149,5 +158,7 @@ class CoinbaseWebSocketClient:
         :param close_status_code: The status code for the connection closure.
         :param close_msg: The message for the connection closure.
         """
+        import websocket
+
         raise websocket.WebSocketConnectionClosedException(
             f"Closed connection with status: {close_status_code}, message: {close_msg}")
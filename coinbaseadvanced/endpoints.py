@@ -0,0 +1,232 @@
+"""
+Declarative table of the Coinbase Advanced Trade REST endpoints.
+
+Every endpoint describes its HTTP method, path template, query parameters and the
+model factory parsing its response. Templates and parameter serializers are compiled
+once at import time so the client only joins pre-built pieces on every call, while
+model modules are only imported the first time one of their endpoints responds.
+"""
+
+import importlib
+
+from datetime import datetime
+from string import Formatter
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from coinbaseadvanced.rate_limiter import Priority
+
+API_PREFIX = '/api/v3/brokerage'
+
+
+def _as_str(value: Any) -> str:
+    return str(value)
+
+
+def _as_enum(value: Any) -> str:
+    return value.value
+
+
+def _as_iso_datetime(value: datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _as_unix_timestamp(value: datetime) -> str:
+    return str(int(value.timestamp()))
+
+
+def _as_csv(value: list) -> str:
+    return ','.join(value)
+
+
+class Param:
+    """
+    Query parameter of an endpoint.
+
+    Args:
+    - name: Argument name used by the client and sent as query key.
+    - serializer: Converts the argument into its query string representation.
+    - repeated: The argument is a list sent as one `name=value` pair per item.
+    """
+
+    __slots__ = ('name', 'serializer', 'repeated', '_prefix')
+
+    def __init__(self, name: str, serializer: Callable[[Any], str] = _as_str, repeated: bool = False) -> None:
+        self.name = name
+        self.serializer = serializer
+        self.repeated = repeated
+        self._prefix = name + '='
+
+    def encode(self, value: Any) -> str:
+        """
+        Encodes `value` as `name=value` query string piece(s).
+        """
+
+        if self.repeated:
+            return '&'.join(self._prefix + self.serializer(item) for item in value)
+        return self._prefix + self.serializer(value)
+
+
+class Endpoint:
+    """
+    Declarative description of a REST endpoint.
+
+    Args:
+    - name: Unique endpoint name, matching the client method using it.
+    - method: HTTP method.
+    - path: Path template relative to the brokerage API prefix, e.g. `/accounts/{account_id}`.
+    - response: Factory building the result model out of the HTTP response, referenced
+                as `<models module>:<Model>.<factory>`, e.g. `accounts:Account.from_response`.
+    - params: Query parameters, in the order they are sent.
+    - priority: Scheduling class of its requests when they wait for the rate limiter.
+    - family: Group of endpoints sharing a circuit breaker, defaults to the models module of `response`.
+    """
+
+    __slots__ = ('name', 'method', 'path', 'response_ref', 'params', 'priority', 'family', 'idempotent',
+                 '_path_parts', '_response')
+
+    def __init__(self,
+                 name: str,
+                 method: str,
+                 path: str,
+                 response: str,
+                 params: Tuple[Param, ...] = (),
+                 priority: Priority = Priority.ACCOUNT,
+                 family: Optional[str] = None) -> None:
+        self.name = name
+        self.method = method
+        self.path = API_PREFIX + path
+        self.response_ref = response
+        self.params = params
+        self.priority = priority
+        self.family = family or response.partition(':')[0]
+        self.idempotent = method == 'GET'
+
+        self._path_parts = tuple(
+            (literal, field) for literal, field, _, _ in Formatter().parse(self.path))
+        self._response: Optional[Callable] = None
+
+    @property
+    def response(self) -> Callable:
+        """
+        Factory building the result model, its models module is imported on first use.
+        """
+
+        if self._response is None:
+            module_name, _, attribute = self.response_ref.partition(':')
+            model_name, _, factory = attribute.partition('.')
+            module = importlib.import_module('coinbaseadvanced.models.' + module_name)
+            self._response = getattr(getattr(module, model_name), factory)
+
+        return self._response
+
+    def build_path(self, path_params: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Renders the path template with `path_params`.
+        """
+
+        if path_params is None:
+            return self.path
+
+        return ''.join(literal + (str(path_params[field]) if field else '')
+                       for literal, field in self._path_parts)
+
+    def build_query(self, query: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Renders the query string, including the leading `?`, skipping `None` arguments.
+        """
+
+        if not query:
+            return ''
+
+        pieces = [param.encode(query[param.name]) for param in self.params
+                  if query.get(param.name) is not None]
+        pieces = [piece for piece in pieces if piece]
+
+        return '?' + '&'.join(pieces) if pieces else ''
+
+
+_ENDPOINTS = (
+    # Accounts #
+    Endpoint('list_accounts', 'GET', '/accounts', 'accounts:AccountsPage.from_response',
+             (Param('limit'), Param('cursor'))),
+    Endpoint('get_account', 'GET', '/accounts/{account_id}', 'accounts:Account.from_response'),
+
+    # Orders #
+    Endpoint('create_order', 'POST', '/orders', 'orders:Order.from_create_order_response',
+             priority=Priority.ORDER),
+    Endpoint('edit_order', 'POST', '/orders/edit', 'orders:OrderEdit.from_response',
+             priority=Priority.ORDER),
+    Endpoint('edit_order_preview', 'POST', '/orders/edit_preview', 'orders:OrderEditPreview.from_response',
+             priority=Priority.ORDER),
+    Endpoint('cancel_orders', 'POST', '/orders/batch_cancel/', 'orders:OrderBatchCancellation.from_response',
+             priority=Priority.CANCEL),
+    Endpoint('list_orders', 'GET', '/orders/historical/batch', 'orders:OrdersPage.from_response',
+             (Param('product_id'),
+              Param('order_status', _as_csv),
+              Param('limit'),
+              Param('start_date', _as_iso_datetime),
+              Param('end_date', _as_iso_datetime),
+              Param('user_native_currency'),
+              Param('order_type', _as_enum),
+              Param('order_side', _as_enum),
+              Param('cursor'),
+              Param('product_type', _as_enum),
+              Param('order_placement_source', _as_enum)),
+             priority=Priority.HISTORY),
+    Endpoint('list_fills', 'GET', '/orders/historical/fills', 'orders:FillsPage.from_response',
+             (Param('order_id'),
+              Param('product_id'),
+              Param('limit'),
+              Param('start_date', _as_iso_datetime),
+              Param('end_date', _as_iso_datetime),
+              Param('cursor')),
+             priority=Priority.HISTORY),
+    Endpoint('get_order', 'GET', '/orders/historical/{order_id}', 'orders:Order.from_get_order_response'),
+
+    # Products #
+    Endpoint('list_products', 'GET', '/products', 'products:ProductsPage.from_response',
+             (Param('limit'), Param('offset'), Param('product_type', _as_enum)),
+             priority=Priority.MARKET_DATA),
+    Endpoint('get_product', 'GET', '/products/{product_id}', 'products:Product.from_response',
+             priority=Priority.MARKET_DATA),
+    Endpoint('get_product_candles', 'GET', '/products/{product_id}/candles', 'products:CandlesPage.from_response',
+             (Param('start', _as_unix_timestamp),
+              Param('end', _as_unix_timestamp),
+              Param('granularity', _as_enum)),
+             priority=Priority.HISTORY),
+    Endpoint('get_market_trades', 'GET', '/products/{product_id}/ticker', 'products:TradesPage.from_response',
+             (Param('limit'),),
+             priority=Priority.MARKET_DATA),
+    Endpoint('get_product_book', 'GET', '/product_book', 'products:ProductBook.from_response',
+             (Param('product_id'), Param('limit')),
+             priority=Priority.MARKET_DATA),
+    Endpoint('get_product_books', 'GET', '/product_book', 'products:BookSnapshot.from_response',
+             (Param('product_id'), Param('limit')),
+             priority=Priority.MARKET_DATA),
+    Endpoint('get_best_bid_ask', 'GET', '/best_bid_ask', 'products:BidAsksPage.from_response',
+             (Param('product_ids', repeated=True),),
+             priority=Priority.MARKET_DATA),
+
+    # Fees #
+    Endpoint('get_transactions_summary', 'GET', '/transaction_summary', 'fees:TransactionsSummary.from_response',
+             (Param('start_date', _as_iso_datetime),
+              Param('end_date', _as_iso_datetime),
+              Param('user_native_currency'),
+              Param('product_type', _as_enum))),
+
+    # Portfolios #
+    Endpoint('list_portfolios', 'GET', '/portfolios', 'portfolios:PortfoliosPage.from_response',
+             (Param('portfolio_type', _as_enum),)),
+    Endpoint('create_portfolio', 'POST', '/portfolios', 'portfolios:Portfolio.from_response'),
+    Endpoint('edit_portfolio', 'PUT', '/portfolios/{portfolio_uuid}', 'portfolios:Portfolio.from_response'),
+    Endpoint('delete_portfolio', 'DELETE', '/portfolios/{portfolio_uuid}', 'common:EmptyResponse.from_response',
+             family='portfolios'),
+    Endpoint('get_portfolio_breakdown', 'GET', '/portfolios/{portfolio_uuid}', 'portfolios:PortfolioBreakdown.from_response'),
+    Endpoint('move_portfolio_funds', 'POST', '/portfolios/move_funds', 'portfolios:PortfolioFundsTransfer.from_response'),
+
+    # Common #
+    Endpoint('get_unix_time', 'GET', '/time', 'common:UnixTime.from_response',
+             priority=Priority.MARKET_DATA),
+)
+
+ENDPOINTS: Dict[str, Endpoint] = {endpoint.name: endpoint for endpoint in _ENDPOINTS}
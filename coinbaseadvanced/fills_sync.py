@@ -0,0 +1,210 @@
+"""
+Incremental synchronization of fills into a local SQLite database.
+"""
+
+import sqlite3
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Iterator, Optional
+
+if TYPE_CHECKING:
+    from coinbaseadvanced.client import CoinbaseAdvancedTradeAPIClient
+    from coinbaseadvanced.models.orders import Fill
+
+_TIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
+
+_FILL_COLUMNS = ('trade_id', 'entry_id', 'order_id', 'product_id', 'trade_time', 'trade_type',
+                 'price', 'size', 'commission', 'side', 'liquidity_indicator', 'size_in_quote',
+                 'user_id', 'sequence_timestamp')
+
+_SCHEMA = f'''
+CREATE TABLE IF NOT EXISTS fills (
+    {' TEXT, '.join(_FILL_COLUMNS)} TEXT,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (trade_id)
+);
+CREATE INDEX IF NOT EXISTS fills_trade_time ON fills (trade_time);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    scope TEXT PRIMARY KEY,
+    last_trade_time TEXT,
+    run_start_date TEXT,
+    cursor TEXT
+);
+'''
+
+_INSERT_FILL = (f"INSERT OR IGNORE INTO fills ({', '.join(_FILL_COLUMNS)}, synced_at) "
+                f"VALUES ({', '.join('?' * len(_FILL_COLUMNS))}, ?)")
+
+
+class FillsSyncResult:
+    """
+    Outcome of one synchronization run.
+
+    Attributes:
+        new_fills (int): Fills added to the local table.
+        pages (int): Pages requested to Coinbase.
+        last_trade_time (Optional[datetime]): Most recent trade time stored locally.
+        resumed (bool): Whether the run continued an interrupted one.
+        elapsed (float): Seconds the run took.
+    """
+
+    __slots__ = ('new_fills', 'pages', 'last_trade_time', 'resumed', 'elapsed')
+
+    def __init__(self, new_fills: int, pages: int, last_trade_time: Optional[datetime],
+                 resumed: bool, elapsed: float) -> None:
+        self.new_fills = new_fills
+        self.pages = pages
+        self.last_trade_time = last_trade_time
+        self.resumed = resumed
+        self.elapsed = elapsed
+
+    def __repr__(self):
+        return (f"FillsSyncResult(new_fills={self.new_fills}, pages={self.pages}, "
+                f"last_trade_time={self.last_trade_time}, resumed={self.resumed}, elapsed={self.elapsed})")
+
+
+class FillsSynchronizer:
+    """
+    Appends the fills newer than the last synchronized one to a local SQLite table.
+
+    Every run starts at the persisted checkpoint (last seen trade time) instead of
+    the beginning of the history, so it only costs as many requests as there are new
+    fills. Fills are deduplicated by trade id and the table is append only. The
+    pagination cursor is persisted after every page, an interrupted run is resumed
+    from it by the next one.
+
+    Args:
+    - client: REST client.
+    - database_path: SQLite database file, created if missing.
+    - product_id: Only synchronize fills of this product. Defaults to all products.
+    - limit: Page size used when listing fills.
+    """
+
+    def __init__(self,
+                 client: 'CoinbaseAdvancedTradeAPIClient',
+                 database_path: str,
+                 product_id: Optional[str] = None,
+                 limit: int = 100) -> None:
+        self._client = client
+        self._product_id = product_id
+        self._scope = product_id if product_id is not None else '*'
+        self._limit = limit
+
+        self._connection = sqlite3.connect(database_path)
+        self._connection.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """
+        Closes the database connection.
+        """
+
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def last_trade_time(self) -> Optional[datetime]:
+        """
+        Checkpoint of the last completed run.
+        """
+
+        row = self._connection.execute(
+            "SELECT last_trade_time FROM checkpoints WHERE scope = ?", (self._scope,)).fetchone()
+        return _parse_time(row[0]) if row is not None and row[0] is not None else None
+
+    def sync(self) -> FillsSyncResult:
+        """
+        Fetches and stores the fills newer than the checkpoint.
+        """
+
+        started = time.perf_counter()
+
+        row = self._connection.execute(
+            "SELECT last_trade_time, run_start_date, cursor FROM checkpoints WHERE scope = ?",
+            (self._scope,)).fetchone()
+        last_trade_time, run_start_date, cursor = row if row is not None else (None, None, None)
+
+        resumed = cursor is not None
+        if not resumed:
+            # Inclusive lower bound, fills of that very second are deduplicated by trade id.
+            run_start_date = last_trade_time
+
+        start_date = _parse_time(run_start_date) if run_start_date is not None else None
+        new_fills = 0
+        pages = 0
+
+        while cursor != '':
+            page = self._client.list_fills(product_id=self._product_id, start_date=start_date,
+                                           cursor=cursor, limit=self._limit)
+            pages += 1
+
+            rows = [_fill_row(fill) for fill in page.fills]
+            with self._connection:
+                before = self._connection.total_changes
+                now = time.time()
+                self._connection.executemany(_INSERT_FILL, [r + (now,) for r in rows])
+                new_fills += self._connection.total_changes - before
+
+                cursor = page.cursor or ''
+                self._save_checkpoint(last_trade_time, run_start_date, cursor or None)
+
+        # Pages of an interrupted run were stored already, the table holds the newest trade time.
+        query = "SELECT MAX(trade_time) FROM fills"
+        args: tuple = ()
+        if self._product_id is not None:
+            query += " WHERE product_id = ?"
+            args = (self._product_id,)
+        newest = self._connection.execute(query, args).fetchone()[0]
+
+        with self._connection:
+            self._save_checkpoint(newest, None, None)
+
+        return FillsSyncResult(new_fills, pages, _parse_time(newest) if newest is not None else None,
+                               resumed, time.perf_counter() - started)
+
+    def fills(self, since: Optional[datetime] = None) -> Iterator[dict]:
+        """
+        Iterates the locally stored fills in trade time order.
+
+        Args:
+        - since: Only fills traded at or after this time.
+        """
+
+        conditions = []
+        args: tuple = ()
+        if since is not None:
+            conditions.append("trade_time >= ?")
+            args += (since.strftime(_TIME_FORMAT),)
+        if self._product_id is not None:
+            conditions.append("product_id = ?")
+            args += (self._product_id,)
+
+        query = f"SELECT {', '.join(_FILL_COLUMNS)} FROM fills"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+
+        for row in self._connection.execute(query + " ORDER BY trade_time, trade_id", args):
+            yield dict(zip(_FILL_COLUMNS, row))
+
+    def _save_checkpoint(self, last_trade_time: Optional[str], run_start_date: Optional[str],
+                         cursor: Optional[str]) -> None:
+        self._connection.execute(
+            "INSERT OR REPLACE INTO checkpoints (scope, last_trade_time, run_start_date, cursor) "
+            "VALUES (?, ?, ?, ?)", (self._scope, last_trade_time, run_start_date, cursor))
+
+
+def _format_time(value: Optional[datetime]) -> Optional[str]:
+    return value.strftime(_TIME_FORMAT) if value is not None else None
+
+
+def _parse_time(value: str) -> datetime:
+    return datetime.strptime(value, _TIME_FORMAT)
+
+
+def _fill_row(fill: 'Fill') -> tuple:
+    return (fill.trade_id, fill.entry_id, fill.order_id, fill.product_id, _format_time(fill.trade_time),
+            fill.trade_type, fill.price, fill.size, fill.commission, fill.side, fill.liquidity_indicator,
+            str(fill.size_in_quote), fill.user_id, _format_time(fill.sequence_timestamp))
@@ -0,0 +1,222 @@
+"""
+Hedged requests, cutting the latency tail of idempotent reads.
+
+When a response takes longer than a percentile of the latencies observed for its
+endpoint, the same request is sent a second time and whichever response arrives first
+is used. Hedges are capped to a fraction of the requests and only sent when the rate
+limiter has a token to spare, so hedging never delays other requests.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import TYPE_CHECKING, Callable, Deque, Dict, Iterable, Optional
+
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+
+
+class HedgeStats:
+    """
+    Hedging outcome of one endpoint.
+
+    Attributes:
+        requests (int): Requests sent through the hedging path.
+        hedges (int): Duplicates sent.
+        wins (int): Duplicates whose response arrived first and was used.
+        denied (int): Duplicates not sent because the hedge budget or the rate limit was exhausted.
+    """
+
+    __slots__ = ('requests', 'hedges', 'wins', 'denied')
+
+    def __init__(self, requests: int = 0, hedges: int = 0, wins: int = 0, denied: int = 0) -> None:
+        self.requests = requests
+        self.hedges = hedges
+        self.wins = wins
+        self.denied = denied
+
+    @property
+    def win_rate(self) -> float:
+        """
+        Share of the hedges that won, 0 before any hedge was sent.
+        """
+
+        return self.wins / self.hedges if self.hedges else 0.0
+
+    def __repr__(self):
+        return (f"HedgeStats(requests={self.requests}, hedges={self.hedges}, wins={self.wins}, "
+                f"denied={self.denied}, win_rate={self.win_rate})")
+
+
+class Hedging:
+    """
+    Hedging policy of a client, together with the latencies and outcomes it observed.
+
+    Usage:
+        client = CoinbaseAdvancedTradeAPIClient(..., hedging=Hedging(percentile=95))
+        ...
+        client.hedge_stats()['get_order'].win_rate
+
+    Args:
+    - percentile: Latency percentile of an endpoint after which a duplicate is sent.
+    - max_hedge_ratio: Maximum share of the requests that may be duplicated.
+    - min_samples: Latencies observed for an endpoint before its requests are hedged.
+    - window: Most recent latencies of every endpoint the percentile is computed over.
+    - endpoints: Names of the endpoints to hedge, see `coinbaseadvanced.endpoints.ENDPOINTS`.
+                 Defaults to every idempotent endpoint.
+    - max_workers: Threads sending the hedged requests and their duplicates.
+    """
+
+    def __init__(self,
+                 percentile: float = 95.0,
+                 max_hedge_ratio: float = 0.05,
+                 min_samples: int = 20,
+                 window: int = 256,
+                 endpoints: Optional[Iterable[str]] = None,
+                 max_workers: int = 16) -> None:
+        if not 0 < percentile < 100:
+            raise ValueError("percentile must be between 0 and 100")
+        if max_hedge_ratio < 0:
+            raise ValueError("max_hedge_ratio must not be negative")
+
+        self.percentile = percentile
+        self.max_hedge_ratio = max_hedge_ratio
+        self.min_samples = max(1, min_samples)
+        self.window = window
+        self.endpoints = frozenset(endpoints) if endpoints is not None else None
+        self.max_workers = max_workers
+
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._stats: Dict[str, HedgeStats] = {}
+        self._requests = 0
+        self._hedges = 0
+        self._lock = threading.Lock()
+        self._executor: Optional['ThreadPoolExecutor'] = None
+
+    def applies_to(self, endpoint_name: str) -> bool:
+        """
+        Whether the requests of an idempotent endpoint are hedged.
+        """
+
+        return self.endpoints is None or endpoint_name in self.endpoints
+
+    def delay(self, endpoint_name: str) -> Optional[float]:
+        """
+        Seconds to wait for a response of `endpoint_name` before hedging it,
+        `None` until enough latencies were observed.
+        """
+
+        with self._lock:
+            latencies = self._latencies.get(endpoint_name)
+            if latencies is None or len(latencies) < self.min_samples:
+                return None
+            ordered = sorted(latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))]
+
+    def record(self, endpoint_name: str, latency: float) -> None:
+        """
+        Adds an observed latency of `endpoint_name`.
+        """
+
+        with self._lock:
+            latencies = self._latencies.get(endpoint_name)
+            if latencies is None:
+                latencies = self._latencies[endpoint_name] = deque(maxlen=self.window)
+            latencies.append(latency)
+
+    def stats(self, reset: bool = False) -> Dict[str, HedgeStats]:
+        """
+        Hedging outcomes so far, by endpoint name.
+
+        Args:
+        - reset: Start counting again from zero, the observed latencies are kept.
+        """
+
+        with self._lock:
+            stats = {name: HedgeStats(s.requests, s.hedges, s.wins, s.denied) for name, s in self._stats.items()}
+            if reset:
+                self._stats = {}
+                self._requests = self._hedges = 0
+        return stats
+
+    def send(self, endpoint_name: str, send: Callable[[], object], try_acquire: Callable[[], bool]):
+        """
+        Calls `send`, calling it a second time when its response is late, and returns
+        the first response received.
+
+        Args:
+        - endpoint_name: Endpoint the request belongs to.
+        - send: Sends the request and returns its response, raising transport errors.
+        - try_acquire: Takes a rate limiter token for the duplicate without waiting,
+                       returns whether it got one.
+        """
+
+        delay = self.delay(endpoint_name)
+        with self._lock:
+            stats = self._stats.get(endpoint_name)
+            if stats is None:
+                stats = self._stats[endpoint_name] = HedgeStats()
+            stats.requests += 1
+            self._requests += 1
+
+        if delay is None:
+            return self._timed(endpoint_name, send)
+
+        executor = self._get_executor()
+        primary = executor.submit(self._timed, endpoint_name, send)
+        if wait([primary], timeout=delay).done:
+            return primary.result()
+
+        with self._lock:
+            allowed = self._hedges < self.max_hedge_ratio * self._requests
+            if allowed:
+                self._hedges += 1
+        if not allowed or not try_acquire():
+            with self._lock:
+                if allowed:
+                    self._hedges -= 1
+                stats.denied += 1
+            return primary.result()
+
+        with self._lock:
+            stats.hedges += 1
+        hedge = executor.submit(self._timed, endpoint_name, send)
+
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            # On a tie the primary response is used.
+            for future in sorted(done, key=lambda f: f is hedge):
+                if future.exception() is None:
+                    if future is hedge:
+                        with self._lock:
+                            stats.wins += 1
+                    # The other response is not used, release its connection once it arrives.
+                    (hedge if future is primary else primary).add_done_callback(_close_response)
+                    return future.result()
+
+        # Both failed, raise the error of the original request.
+        return primary.result()
+
+    def _timed(self, endpoint_name: str, send: Callable[[], object]):
+        started = time.perf_counter()
+        response = send()
+        self.record(endpoint_name, time.perf_counter() - started)
+        return response
+
+    def _get_executor(self) -> 'ThreadPoolExecutor':
+        from concurrent.futures import ThreadPoolExecutor
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix='coinbaseadvanced-hedging')
+            return self._executor
+
+
+def _close_response(future) -> None:
+    if future.exception() is None:
+        close = getattr(future.result(), 'close', None)
+        if close is not None:
+            close()
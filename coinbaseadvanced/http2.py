@@ -0,0 +1,138 @@
+"""
+Optional HTTP/2 transport, many concurrent requests multiplexed on one TLS connection.
+
+Requires httpx with HTTP/2 support, installed with the `http2` extra:
+`pip install coinbaseadvanced[http2]`.
+"""
+
+import importlib.util
+import json
+from typing import Iterator, Optional
+
+from coinbaseadvanced.transports import Transport
+
+
+def http2_available() -> bool:
+    """
+    Whether httpx and its HTTP/2 dependencies can be imported.
+    """
+
+    return all(importlib.util.find_spec(name) is not None for name in ('httpx', 'h2'))
+
+
+class HTTP2Response:
+    """
+    The subset of `requests.Response` the models read, on top of an httpx response.
+
+    Attributes:
+        status_code (int): HTTP status code.
+        http_version (str): Protocol negotiated with the server, e.g. `HTTP/2`.
+        headers: Response headers.
+        reason (str): Reason phrase.
+    """
+
+    __slots__ = ('status_code', 'http_version', 'headers', 'reason', '_response')
+
+    def __init__(self, response) -> None:
+        self.status_code = response.status_code
+        self.http_version = response.http_version
+        self.headers = response.headers
+        self.reason = response.reason_phrase
+        self._response = response
+
+    @property
+    def ok(self) -> bool:
+        """
+        Whether the status code is below 400, like `requests.Response.ok`.
+        """
+
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        """
+        Decoded body, read first if the response was streamed.
+        """
+
+        self._response.read()
+        return self._response.text
+
+    def json(self):
+        """
+        Decoded JSON body.
+        """
+
+        return json.loads(self.text)
+
+    def iter_content(self, chunk_size: Optional[int] = None) -> Iterator[bytes]:
+        """
+        Body chunks of a streamed response, like `requests.Response.iter_content`.
+        """
+
+        return self._response.iter_bytes(chunk_size)
+
+    def close(self) -> None:
+        """
+        Releases the stream of a streamed response.
+        """
+
+        self._response.close()
+
+    def __repr__(self):
+        return f"HTTP2Response(status_code={self.status_code}, http_version={self.http_version})"
+
+
+class HTTP2Transport(Transport):
+    """
+    Sends requests through a shared httpx client with HTTP/2 enabled.
+
+    Every thread shares the same connection per host: requests in flight at the same
+    time are interleaved as HTTP/2 streams instead of each holding a connection of the
+    pool. Servers which do not negotiate HTTP/2 (ALPN) are spoken HTTP/1.1 to.
+    Transport errors are raised as their `requests` counterparts so the client retry
+    logic does not depend on the transport used.
+
+    Args:
+    - timeout: Default timeout in seconds.
+    - max_connections: Maximum number of connections kept open, per host.
+    - verify: TLS verification, see httpx; a path or `ssl.SSLContext` to trust a test server.
+    """
+
+    def __init__(self, timeout: float = 10, max_connections: int = 4, verify=True) -> None:
+        import httpx
+
+        self._httpx = httpx
+        self._client = httpx.Client(http2=True, timeout=timeout, verify=verify,
+                                    limits=httpx.Limits(max_connections=max_connections))
+
+    def send(self, method: str, url: str, headers: Optional[dict] = None, json_payload: Optional[dict] = None,
+             data: Optional[str] = None, timeout: Optional[float] = None, stream: bool = False) -> HTTP2Response:
+        """
+        Sends one request, raising `requests.Timeout` or `requests.ConnectionError` on transport errors.
+
+        With `stream=True` the body is left unread, see `HTTP2Response.iter_content`.
+        """
+
+        import requests
+
+        kwargs = {'headers': headers}
+        if data is not None:
+            kwargs['content'] = data
+        if timeout is not None:
+            kwargs['timeout'] = timeout
+
+        try:
+            request = self._client.build_request(method, url, **kwargs)
+            response = self._client.send(request, stream=stream)
+        except self._httpx.TimeoutException as error:
+            raise requests.Timeout(str(error)) from error
+        except self._httpx.TransportError as error:
+            raise requests.ConnectionError(str(error)) from error
+        return HTTP2Response(response)
+
+    def close(self) -> None:
+        """
+        Closes the open connections.
+        """
+
+        self._client.close()
@@ -0,0 +1,529 @@
+"""
+Technical indicators: SMA, EMA, RSI, ATR and VWAP.
+
+The functions compute whole series at once over numpy arrays, e.g. the columns of a
+`coinbaseadvanced.candles.CandleArrays`, and require the `numpy` extra. The classes
+keep the state of one series and advance it by one bar in constant time, they are fed
+with the websocket `candles` channel through `CandleIndicators`.
+
+Warm-up values are `nan` (functions) or `None` (classes). EMA, RSI and ATR are seeded
+with the simple average of their first `period` values, RSI and ATR use Wilder's smoothing.
+"""
+
+import math
+import threading
+from collections import deque
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Union
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from coinbaseadvanced.candles import CandleArrays
+    from coinbaseadvanced.models.market_data import CandlesEvent
+    from coinbaseadvanced.models.products import Candle
+
+# Largest exponent used by the blocked exponential smoothing, keeps the weights finite.
+_MAX_WEIGHT_EXPONENT = 150 * math.log(10)
+
+
+def _numpy():
+    import numpy
+    return numpy
+
+
+def _smooth(values: 'np.ndarray', alpha: float, seed: float) -> 'np.ndarray':
+    # y[k] = (1 - alpha) * y[k - 1] + alpha * x[k], starting at y[-1] = seed. Computed in
+    # closed form over blocks short enough for (1 - alpha) ** -k not to overflow.
+    np = _numpy()
+    result = np.empty(len(values), dtype=np.float64)
+    decay = 1.0 - alpha
+    if decay == 0.0:
+        result[:] = values
+        return result
+
+    block = max(1, int(_MAX_WEIGHT_EXPONENT / -math.log(decay)))
+    powers = decay ** np.arange(1, block + 1, dtype=np.float64)
+    previous = seed
+    for offset in range(0, len(values), block):
+        chunk = values[offset:offset + block]
+        weights = powers[:len(chunk)]
+        result[offset:offset + len(chunk)] = weights * (previous + alpha * np.cumsum(chunk / weights))
+        previous = result[offset + len(chunk) - 1]
+
+    return result
+
+
+def _seeded_smoothing(values: 'np.ndarray', period: int, alpha: float) -> 'np.ndarray':
+    np = _numpy()
+    result = np.full(len(values), np.nan)
+    if period <= 0:
+        raise ValueError(f"Invalid period: {period}.")
+    if len(values) < period:
+        return result
+
+    seed = float(np.mean(values[:period]))
+    result[period - 1] = seed
+    result[period:] = _smooth(values[period:], alpha, seed)
+    return result
+
+
+def sma(values: 'np.ndarray', period: int) -> 'np.ndarray':
+    """
+    Simple moving average over `period` values.
+    """
+
+    np = _numpy()
+    values = np.asarray(values, dtype=np.float64)
+    if period <= 0:
+        raise ValueError(f"Invalid period: {period}.")
+
+    result = np.full(len(values), np.nan)
+    if len(values) >= period:
+        sums = np.cumsum(np.concatenate(([0.0], values)))
+        result[period - 1:] = (sums[period:] - sums[:-period]) / period
+    return result
+
+
+def ema(values: 'np.ndarray', period: int) -> 'np.ndarray':
+    """
+    Exponential moving average with smoothing factor `2 / (period + 1)`.
+    """
+
+    np = _numpy()
+    return _seeded_smoothing(np.asarray(values, dtype=np.float64), period, 2.0 / (period + 1))
+
+
+def rsi(close: 'np.ndarray', period: int = 14) -> 'np.ndarray':
+    """
+    Relative strength index, between 0 and 100.
+    """
+
+    np = _numpy()
+    close = np.asarray(close, dtype=np.float64)
+    result = np.full(len(close), np.nan)
+    if len(close) <= period:
+        return result
+
+    deltas = np.diff(close)
+    gains = _seeded_smoothing(np.maximum(deltas, 0.0), period, 1.0 / period)
+    losses = _seeded_smoothing(np.maximum(-deltas, 0.0), period, 1.0 / period)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = 100.0 - 100.0 / (1.0 + gains / losses)
+    values[(losses == 0.0) & (gains > 0.0)] = 100.0
+    values[(losses == 0.0) & (gains == 0.0)] = 50.0
+
+    result[1:] = values
+    return result
+
+
+def true_range(high: 'np.ndarray', low: 'np.ndarray', close: 'np.ndarray') -> 'np.ndarray':
+    """
+    True range of every bar, the first one is its high-low range.
+    """
+
+    np = _numpy()
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+
+    previous = np.concatenate((close[:1], close[:-1]))
+    ranges = np.maximum(high, previous) - np.minimum(low, previous)
+    ranges[:1] = high[:1] - low[:1]
+    return ranges
+
+
+def atr(high: 'np.ndarray', low: 'np.ndarray', close: 'np.ndarray', period: int = 14) -> 'np.ndarray':
+    """
+    Average true range.
+    """
+
+    return _seeded_smoothing(true_range(high, low, close), period, 1.0 / period)
+
+
+def vwap(high: 'np.ndarray', low: 'np.ndarray', close: 'np.ndarray', volume: 'np.ndarray',
+         start: Optional['np.ndarray'] = None, session: Optional[int] = None) -> 'np.ndarray':
+    """
+    Volume weighted average of the typical price `(high + low + close) / 3`.
+
+    Args:
+    - high, low, close, volume: Candle columns.
+    - start: Candle starts in unix seconds, required with `session`.
+    - session: Restarts the average every `session` seconds (e.g. 86400 for daily VWAP),
+               cumulative over the whole series by default.
+    """
+
+    np = _numpy()
+    volume = np.asarray(volume, dtype=np.float64)
+    typical = (np.asarray(high, dtype=np.float64) + np.asarray(low, dtype=np.float64)
+               + np.asarray(close, dtype=np.float64)) / 3.0
+
+    weighted = np.cumsum(typical * volume)
+    volumes = np.cumsum(volume)
+
+    if session is not None and len(volume):
+        if start is None:
+            raise ValueError("Candle starts are required to split sessions.")
+        sessions = np.asarray(start, dtype=np.int64) // session
+        firsts = np.concatenate(([0], np.flatnonzero(np.diff(sessions)) + 1))
+        lengths = np.diff(np.concatenate((firsts, [len(volume)])))
+        weighted -= np.repeat(np.concatenate(([0.0], weighted[firsts[1:] - 1])), lengths)
+        volumes -= np.repeat(np.concatenate(([0.0], volumes[firsts[1:] - 1])), lengths)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(volumes > 0.0, weighted / volumes, typical)
+
+
+class SMA:
+    """
+    Incremental simple moving average.
+    """
+
+    def __init__(self, period: int) -> None:
+        if period <= 0:
+            raise ValueError(f"Invalid period: {period}.")
+        self.period = period
+        self.value: Optional[float] = None
+        self._window: deque = deque()
+        self._sum = 0.0
+
+    def peek(self, value: float) -> Optional[float]:
+        """
+        Average there would be after `update(value)`, without changing the state.
+        """
+
+        count = len(self._window) + 1
+        if count < self.period:
+            return None
+        dropped = self._window[0] if count > self.period else 0.0
+        return (self._sum + value - dropped) / self.period
+
+    def update(self, value: float) -> Optional[float]:
+        """
+        Adds the value of a closed bar.
+        """
+
+        self.value = self.peek(value)
+        self._window.append(value)
+        self._sum += value
+        if len(self._window) > self.period:
+            self._sum -= self._window.popleft()
+        return self.value
+
+
+class _SeededSmoothing:
+    # Average of the first `period` values, exponential smoothing afterwards.
+
+    def __init__(self, period: int, alpha: float) -> None:
+        if period <= 0:
+            raise ValueError(f"Invalid period: {period}.")
+        self.period = period
+        self.value: Optional[float] = None
+        self._alpha = alpha
+        self._count = 0
+        self._sum = 0.0
+
+    def peek(self, value: float) -> Optional[float]:
+        if self.value is not None:
+            return self.value + self._alpha * (value - self.value)
+        if self._count + 1 < self.period:
+            return None
+        return (self._sum + value) / self.period
+
+    def update(self, value: float) -> Optional[float]:
+        self.value = self.peek(value)
+        self._count += 1
+        self._sum += value
+        return self.value
+
+
+class EMA(_SeededSmoothing):
+    """
+    Incremental exponential moving average.
+    """
+
+    def __init__(self, period: int) -> None:
+        super().__init__(period, 2.0 / (period + 1))
+
+
+class RSI:
+    """
+    Incremental relative strength index.
+    """
+
+    def __init__(self, period: int = 14) -> None:
+        self.period = period
+        self.value: Optional[float] = None
+        self._gains = _SeededSmoothing(period, 1.0 / period)
+        self._losses = _SeededSmoothing(period, 1.0 / period)
+        self._previous: Optional[float] = None
+
+    def peek(self, close: float) -> Optional[float]:
+        """
+        RSI there would be after `update(close)`, without changing the state.
+        """
+
+        if self._previous is None:
+            return None
+        delta = close - self._previous
+        return self._index(self._gains.peek(max(delta, 0.0)), self._losses.peek(max(-delta, 0.0)))
+
+    def update(self, close: float) -> Optional[float]:
+        """
+        Adds the close of a closed bar.
+        """
+
+        if self._previous is not None:
+            delta = close - self._previous
+            self.value = self._index(self._gains.update(max(delta, 0.0)), self._losses.update(max(-delta, 0.0)))
+        self._previous = close
+        return self.value
+
+    @staticmethod
+    def _index(gain: Optional[float], loss: Optional[float]) -> Optional[float]:
+        if gain is None or loss is None:
+            return None
+        if loss == 0.0:
+            return 100.0 if gain > 0.0 else 50.0
+        return 100.0 - 100.0 / (1.0 + gain / loss)
+
+
+class ATR:
+    """
+    Incremental average true range.
+    """
+
+    def __init__(self, period: int = 14) -> None:
+        self.period = period
+        self.value: Optional[float] = None
+        self._average = _SeededSmoothing(period, 1.0 / period)
+        self._previous: Optional[float] = None
+
+    def _range(self, high: float, low: float) -> float:
+        if self._previous is None:
+            return high - low
+        return max(high, self._previous) - min(low, self._previous)
+
+    def peek(self, high: float, low: float, close: float) -> Optional[float]:  # pylint: disable=unused-argument
+        """
+        ATR there would be after `update(high, low, close)`, without changing the state.
+        """
+
+        return self._average.peek(self._range(high, low))
+
+    def update(self, high: float, low: float, close: float) -> Optional[float]:
+        """
+        Adds a closed bar.
+        """
+
+        self.value = self._average.update(self._range(high, low))
+        self._previous = close
+        return self.value
+
+
+class VWAP:
+    """
+    Incremental volume weighted average price.
+
+    Args:
+    - session: Restarts the average every `session` seconds, cumulative when `None`.
+    """
+
+    def __init__(self, session: Optional[int] = None) -> None:
+        self.session = session
+        self.value: Optional[float] = None
+        self._session_id: Optional[int] = None
+        self._weighted = 0.0
+        self._volume = 0.0
+
+    def _totals(self, high: float, low: float, close: float, volume: float, start: Optional[int]):
+        typical = (high + low + close) / 3.0
+        weighted, volumes = self._weighted, self._volume
+        if self.session is not None and start is not None and start // self.session != self._session_id:
+            weighted, volumes = 0.0, 0.0
+        return typical, weighted + typical * volume, volumes + volume
+
+    def peek(self, high: float, low: float, close: float, volume: float,
+             start: Optional[int] = None) -> Optional[float]:
+        """
+        VWAP there would be after `update(...)`, without changing the state.
+        """
+
+        typical, weighted, volumes = self._totals(high, low, close, volume, start)
+        return weighted / volumes if volumes > 0.0 else typical
+
+    def update(self, high: float, low: float, close: float, volume: float,
+               start: Optional[int] = None) -> Optional[float]:
+        """
+        Adds a closed bar starting at `start`, unix seconds.
+        """
+
+        typical, self._weighted, self._volume = self._totals(high, low, close, volume, start)
+        if self.session is not None and start is not None:
+            self._session_id = start // self.session
+        self.value = self._weighted / self._volume if self._volume > 0.0 else typical
+        return self.value
+
+
+class IndicatorValues:
+    """
+    Indicator values of one product at one candle.
+
+    Attributes:
+        product_id (str): Product.
+        start (int): Candle start, unix seconds.
+        closed (bool): Whether the candle is closed, values of open candles are provisional.
+        sma, ema, rsi, atr, vwap (Optional[float]): Indicators, `None` while warming up.
+    """
+
+    __slots__ = ('product_id', 'start', 'closed', 'sma', 'ema', 'rsi', 'atr', 'vwap')
+
+    def __init__(self, product_id: str, start: int, closed: bool, sma: Optional[float], ema: Optional[float],
+                 rsi: Optional[float], atr: Optional[float], vwap: Optional[float]) -> None:
+        # pylint: disable=redefined-outer-name
+        self.product_id = product_id
+        self.start = start
+        self.closed = closed
+        self.sma = sma
+        self.ema = ema
+        self.rsi = rsi
+        self.atr = atr
+        self.vwap = vwap
+
+    def __repr__(self):
+        return (f"IndicatorValues(product_id={self.product_id}, start={self.start}, closed={self.closed}, "
+                f"sma={self.sma}, ema={self.ema}, rsi={self.rsi}, atr={self.atr}, vwap={self.vwap})")
+
+
+class _ProductIndicators:
+
+    def __init__(self, periods: Dict[str, int], vwap_session: Optional[int]) -> None:
+        self.sma = SMA(periods['sma'])
+        self.ema = EMA(periods['ema'])
+        self.rsi = RSI(periods['rsi'])
+        self.atr = ATR(periods['atr'])
+        self.vwap = VWAP(vwap_session)
+        # Candle in progress: (start, high, low, close, volume).
+        self.pending: Optional[tuple] = None
+
+    def commit(self, product_id: str) -> IndicatorValues:
+        start, high, low, close, volume = self.pending
+        return IndicatorValues(product_id, start, True, self.sma.update(close), self.ema.update(close),
+                               self.rsi.update(close), self.atr.update(high, low, close),
+                               self.vwap.update(high, low, close, volume, start))
+
+    def provisional(self, product_id: str) -> IndicatorValues:
+        start, high, low, close, volume = self.pending
+        return IndicatorValues(product_id, start, False, self.sma.peek(close), self.ema.peek(close),
+                               self.rsi.peek(close), self.atr.peek(high, low, close),
+                               self.vwap.peek(high, low, close, volume, start))
+
+
+class CandleIndicators:
+    """
+    Maintains the indicators of every product from the websocket `candles` channel.
+
+    The channel sends the candle in progress again on every change. Indicator state
+    only advances, in constant time, once a candle is replaced by the next one; until
+    then values are provisional, computed on top of the closed candles.
+
+    Usage:
+        indicators = CandleIndicators(callback=print)
+        indicators.warm_up("BTC-USD", resample(client.get_product_candles_all(...), Granularity.FIVE_MINUTE))
+        websocket_client.subscribe(["BTC-USD"], "candles", callback=indicators.on_candles)
+
+    Args:
+    - callback: Called with an `IndicatorValues` on every candle update.
+    - sma_period, ema_period, rsi_period, atr_period: Indicator periods, in candles.
+    - vwap_session: VWAP session length in seconds, daily by default.
+    """
+
+    def __init__(self,
+                 callback: Optional[Callable[[IndicatorValues], None]] = None,
+                 sma_period: int = 20,
+                 ema_period: int = 20,
+                 rsi_period: int = 14,
+                 atr_period: int = 14,
+                 vwap_session: Optional[int] = 86400) -> None:
+        self._callbacks: List[Callable[[IndicatorValues], None]] = [callback] if callback is not None else []
+        self._periods = {'sma': sma_period, 'ema': ema_period, 'rsi': rsi_period, 'atr': atr_period}
+        self._vwap_session = vwap_session
+        self._products: Dict[str, _ProductIndicators] = {}
+        self._latest: Dict[str, IndicatorValues] = {}
+        self._lock = threading.Lock()
+
+    def add_callback(self, callback: Callable[[IndicatorValues], None]) -> None:
+        """
+        Registers `callback(values)` to be called on every candle update.
+        """
+
+        self._callbacks.append(callback)
+
+    def latest(self, product_id: str) -> Optional[IndicatorValues]:
+        """
+        Last values computed for `product_id`.
+        """
+
+        return self._latest.get(product_id)
+
+    def warm_up(self, product_id: str, candles: Union['CandleArrays', Iterable['Candle']]) -> None:
+        """
+        Feeds historical candles, a `CandleArrays` or `Candle` objects in any order.
+
+        The last candle is kept as the candle in progress, REST responses include the one
+        still open: a websocket update with the same start replaces it instead of counting it twice.
+        """
+
+        if hasattr(candles, 'volume'):
+            rows = zip(candles.start.tolist(), candles.high.tolist(), candles.low.tolist(),
+                       candles.close.tolist(), candles.volume.tolist())
+        else:
+            rows = sorted((int(c.start), float(c.high), float(c.low), float(c.close), float(c.volume))
+                          for c in candles)
+
+        with self._lock:
+            state = self._state(product_id)
+            for row in rows:
+                if state.pending is not None and row[0] < state.pending[0]:
+                    continue
+                if state.pending is not None and row[0] > state.pending[0]:
+                    state.commit(product_id)
+                state.pending = tuple(row)
+            if state.pending is not None:
+                self._latest[product_id] = state.provisional(product_id)
+
+    def on_candles(self, event: 'CandlesEvent') -> None:
+        """
+        Websocket callback for the `candles` channel.
+        """
+
+        for candle in event.candles:
+            self.update(candle.product_id, int(candle.start), float(candle.high), float(candle.low),
+                        float(candle.close), float(candle.volume))
+
+    def update(self, product_id: str, start: int, high: float, low: float, close: float, volume: float) -> None:
+        """
+        Applies a new version of the candle in progress of `product_id`.
+        """
+
+        emitted = []
+        with self._lock:
+            state = self._state(product_id)
+            if state.pending is not None and start < state.pending[0]:
+                return  # Stale update of a candle already closed.
+            if state.pending is not None and start > state.pending[0]:
+                emitted.append(state.commit(product_id))
+
+            state.pending = (start, high, low, close, volume)
+            emitted.append(state.provisional(product_id))
+            self._latest[product_id] = emitted[-1]
+
+        for values in emitted:
+            for callback in self._callbacks:
+                callback(values)
+
+    def _state(self, product_id: str) -> _ProductIndicators:
+        state = self._products.get(product_id)
+        if state is None:
+            state = self._products[product_id] = _ProductIndicators(self._periods, self._vwap_session)
+        return state
@@ -0,0 +1,108 @@
+"""
+Instrumentation hooks for the API client.
+"""
+
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+# Emitted once per HTTP attempt with a `RequestEvent`.
+REQUEST_EVENT = 'request'
+
+# Emitted on every state change of a circuit breaker with a `CircuitEvent`.
+CIRCUIT_EVENT = 'circuit'
+
+
+class RequestEvent:
+    """
+    One HTTP attempt made by the client.
+
+    Attributes:
+        endpoint (str): Endpoint name, see `coinbaseadvanced.endpoints.ENDPOINTS`.
+        method (str): HTTP method.
+        url (str): Full URL requested.
+        status_code (Optional[int]): Response status, `None` when no response was received.
+        elapsed (float): Seconds the attempt took.
+        attempt (int): Zero based attempt number, greater than zero for retries.
+        error (Optional[Exception]): Transport error raised by the attempt, if any.
+    """
+
+    __slots__ = ('endpoint', 'method', 'url', 'status_code', 'elapsed', 'attempt', 'error')
+
+    def __init__(self,
+                 endpoint: str,
+                 method: str,
+                 url: str,
+                 status_code: Optional[int],
+                 elapsed: float,
+                 attempt: int,
+                 error: Optional[Exception] = None) -> None:
+        self.endpoint = endpoint
+        self.method = method
+        self.url = url
+        self.status_code = status_code
+        self.elapsed = elapsed
+        self.attempt = attempt
+        self.error = error
+
+    def __repr__(self):
+        return (f"RequestEvent(endpoint={self.endpoint}, method={self.method}, status_code={self.status_code}, "
+                f"elapsed={self.elapsed}, attempt={self.attempt}, error={self.error!r})")
+
+
+class CircuitEvent:
+    """
+    State change of the circuit breaker of an endpoint family.
+
+    Attributes:
+        family (str): Endpoint family, see `coinbaseadvanced.endpoints.Endpoint.family`.
+        previous (str): State left, `closed`, `open` or `half_open`.
+        state (str): State entered.
+        reason (str): What triggered the change.
+    """
+
+    __slots__ = ('family', 'previous', 'state', 'reason')
+
+    def __init__(self, family: str, previous: str, state: str, reason: str) -> None:
+        self.family = family
+        self.previous = previous
+        self.state = state
+        self.reason = reason
+
+    def __repr__(self):
+        return (f"CircuitEvent(family={self.family}, previous={self.previous}, state={self.state}, "
+                f"reason={self.reason})")
+
+
+class Hooks:
+    """
+    Thread-safe registry of instrumentation callbacks keyed by event name.
+    """
+
+    def __init__(self) -> None:
+        self._callbacks: Dict[str, List[Callable[[Any], None]]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, event: str, callback: Callable[[Any], None]) -> None:
+        """
+        Registers `callback` to be called with the payload of every `event`.
+        """
+
+        with self._lock:
+            self._callbacks[event] = self._callbacks.get(event, []) + [callback]
+
+    def remove(self, event: str, callback: Callable[[Any], None]) -> None:
+        """
+        Unregisters a callback previously added for `event`.
+        """
+
+        with self._lock:
+            self._callbacks[event] = [c for c in self._callbacks.get(event, []) if c is not callback]
+
+    def emit(self, event: str, payload: Any) -> None:
+        """
+        Calls every callback registered for `event` with `payload`.
+        """
+
+        # Lists are replaced, never mutated, so they can be read without the lock.
+        for callback in self._callbacks.get(event, ()):
+            callback(payload)
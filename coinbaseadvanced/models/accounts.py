@@ -4,12 +4,14 @@ Object models for account related endpoints args and response.
 
 from uuid import UUID
 from datetime import datetime
-from typing import List, Optional
-import requests
+from typing import TYPE_CHECKING, List, Optional
 
 from coinbaseadvanced.models.common import BaseModel, ValueCurrency
 from coinbaseadvanced.models.error import CoinbaseAdvancedTradeAPIError
 
+if TYPE_CHECKING:
+    import requests
+
 
 class Account(BaseModel):
     """
@@ -50,7 +52,7 @@ class Account(BaseModel):
         self.kwargs = kwargs
 
     @classmethod
-    def from_response(cls, response: requests.Response) -> 'Account':
+    def from_response(cls, response: 'requests.Response') -> 'Account':
         """
         Factory method.
         """
@@ -91,7 +93,7 @@ class AccountsPage(BaseModel):
         self.kwargs = kwargs
 
     @classmethod
-    def from_response(cls, response: requests.Response) -> 'AccountsPage':
+    def from_response(cls, response: 'requests.Response') -> 'AccountsPage':
         """
         Factory Method.
         """
@@ -2,10 +2,13 @@
 Object models for order related endpoints args and response.
 """
 
-import requests
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Optional
 
 from coinbaseadvanced.models.error import CoinbaseAdvancedTradeAPIError
 
+if TYPE_CHECKING:
+    import requests
+
 
 class BaseModel:
     """
@@ -38,7 +41,7 @@ class EmptyResponse(BaseModel):
         self.kwargs = kwargs
 
     @classmethod
-    def from_response(cls, response: requests.Response) -> 'EmptyResponse':
+    def from_response(cls, response: 'requests.Response') -> 'EmptyResponse':
         """
         Factory Method that creates an EmptyResponse object from a requests.Response object.
 
@@ -82,7 +85,7 @@ class UnixTime(BaseModel):
         self.kwargs = kwargs
 
     @classmethod
-    def from_response(cls, response: requests.Response) -> 'UnixTime':
+    def from_response(cls, response: 'requests.Response') -> 'UnixTime':
         """
         Factory Method.
         """
@@ -107,3 +110,111 @@ class ValueCurrency(BaseModel):
         self.currency = currency
 
         self.kwargs = kwargs
+
+
+class ChunkTiming(BaseModel):
+    """
+    Timing of one chunk of a bulk operation split across several requests.
+
+    Attributes:
+        index (int): Position of the chunk within the bulk operation.
+        size (int): Amount of items sent in the chunk.
+        elapsed (float): Seconds the chunk request took, rate limiter wait excluded.
+        error (Optional[str]): Error raised by the chunk request, if any.
+    """
+
+    index: int
+    size: int
+    elapsed: float
+    error: Optional[str]
+
+    def __init__(self, index: int, size: int, elapsed: float, error: Optional[str] = None, **kwargs) -> None:
+        self.index = index
+        self.size = size
+        self.elapsed = elapsed
+        self.error = error
+
+        self.kwargs = kwargs
+
+
+class StreamedPage(BaseModel):
+    """
+    Page whose items are built while its response body is being received.
+
+    Iterating the page reads the body incrementally and yields each item as soon as it
+    is decoded, so the whole payload never has to be held in memory nor decoded
+    before the first item is available. A page can only be iterated once.
+
+    Attributes:
+        key (str): Name of the items array in the response, e.g. `orders`.
+        fields (dict): Other members of the response, e.g. `cursor` and `has_next`;
+            complete once the iteration finished.
+    """
+
+    key: str
+    fields: dict
+
+    def __init__(self, response: 'requests.Response', key: str, model: Callable[..., Any],
+                 chunk_size: int = 1 << 16) -> None:
+        self.key = key
+        self.fields = {}
+
+        self._response = response
+        self._model = model
+        self._chunk_size = chunk_size
+        self._consumed = False
+
+    @classmethod
+    def from_response(cls, response: 'requests.Response', key: str,
+                      model: Callable[..., Any]) -> 'StreamedPage':
+        """
+        Factory Method, `response` must have been requested with `stream=True`.
+        """
+
+        if not response.ok:
+            raise CoinbaseAdvancedTradeAPIError.not_ok_response(response)
+
+        return cls(response, key, model)
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._consumed:
+            raise RuntimeError("A streamed page can only be iterated once.")
+        self._consumed = True
+
+        from coinbaseadvanced.streaming import iter_json_array
+
+        model = self._model
+        try:
+            for item in iter_json_array(self._response.iter_content(self._chunk_size), self.key, self.fields):
+                yield model(**item)
+        finally:
+            self._response.close()
+
+    def close(self) -> None:
+        """
+        Releases the connection without reading the rest of the body.
+        """
+
+        self._consumed = True
+        self._response.close()
+
+    @property
+    def cursor(self) -> Optional[str]:
+        """
+        Cursor of the next page.
+        """
+
+        return self.fields.get('cursor')
+
+    @property
+    def has_next(self) -> bool:
+        """
+        Whether more pages are available, `False` until the response says otherwise.
+        """
+
+        return bool(self.fields.get('has_next', False))
+
+    def __repr__(self):
+        return f"StreamedPage(key={self.key}, fields={self.fields})"
+
+    __str__ = __repr__
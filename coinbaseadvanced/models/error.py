@@ -3,7 +3,11 @@ Encapsulating error types.
 """
 
 import json
-import requests
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import requests
 
 
 class CoinbaseAdvancedTradeAPIError(Exception):
@@ -19,7 +23,7 @@ class CoinbaseAdvancedTradeAPIError(Exception):
         return str(self.error_dict)
 
     @classmethod
-    def not_ok_response(cls, response: requests.Response) -> 'CoinbaseAdvancedTradeAPIError':
+    def not_ok_response(cls, response: 'requests.Response') -> 'CoinbaseAdvancedTradeAPIError':
         """
         Factory Method for Coinbase Advanced errors.
         """
@@ -30,3 +34,35 @@ class CoinbaseAdvancedTradeAPIError(Exception):
             error_result = {'reason': response.text}
 
         return cls(error_dict=error_result)
+
+
+class CircuitOpenError(CoinbaseAdvancedTradeAPIError):
+    """
+    Raised without sending the request while the circuit breaker of its endpoint family
+    is open, see `coinbaseadvanced.circuit_breaker.CircuitBreaker`.
+
+    Attributes:
+        family (str): Endpoint family whose circuit is open.
+        retry_after (float): Seconds until the circuit lets a probe request through.
+    """
+
+    def __init__(self, family: str, retry_after: float):
+        super().__init__({'error': 'CIRCUIT_OPEN', 'family': family, 'retry_after': retry_after})
+        self.family = family
+        self.retry_after = retry_after
+
+
+class OrderRejectedError(CoinbaseAdvancedTradeAPIError):
+    """
+    Raised when Coinbase rejects an order created on the caller behalf, e.g. by
+    `coinbaseadvanced.requote.RequoteEngine`.
+
+    Attributes:
+        order_error (OrderError): Rejection details returned by `create_order`.
+    """
+
+    def __init__(self, order_error):
+        super().__init__({'error': order_error.error, 'message': order_error.message,
+                          'error_details': order_error.error_details,
+                          'new_order_failure_reason': order_error.new_order_failure_reason})
+        self.order_error = order_error
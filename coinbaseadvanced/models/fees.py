@@ -2,12 +2,14 @@
 Object models for fees related endpoints args and response.
 """
 
-from typing import Optional
-import requests
+from typing import TYPE_CHECKING, Optional
 
 from coinbaseadvanced.models.common import BaseModel
 from coinbaseadvanced.models.error import CoinbaseAdvancedTradeAPIError
 
+if TYPE_CHECKING:
+    import requests
+
 
 class FeeTier(BaseModel):
     """
@@ -110,7 +112,7 @@ class TransactionsSummary(BaseModel):
         self.kwargs = kwargs
 
     @classmethod
-    def from_response(cls, response: requests.Response) -> 'TransactionsSummary':
+    def from_response(cls, response: 'requests.Response') -> 'TransactionsSummary':
         """
         Factory Method.
         """
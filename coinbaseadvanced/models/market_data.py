@@ -114,7 +114,8 @@ class CandleUpdate:
 
 
 class MarketTradesEvent:
-    def __init__(self, channel: str, client_id: str, timestamp: str, sequence_num: int, trades: list):
+    def __init__(self, channel: str, client_id: str, timestamp: str, sequence_num: int,
+                 trades: list = None, events: list = None):
         """
         Initializes a MarketTradesEvent object.
 
@@ -123,12 +124,17 @@ class MarketTradesEvent:
         :param timestamp: The timestamp of the event.
         :param sequence_num: The sequence number of the event.
         :param trades: A list of trade data.
+        :param events: A list of event data, as sent by the websocket, whose trades are added to `trades`.
         """
         self.channel = channel
         self.client_id = client_id
         self.timestamp = timestamp
         self.sequence_num = sequence_num
-        self.trades = [TradeDetail(trade) for trade in trades]
+        self.trades = [TradeDetail(trade) for trade in trades] if trades is not None else []
+        self.is_snapshot = False
+        for event in events or ():
+            self.trades.extend([TradeDetail(trade) for trade in event.get('trades', ())])
+            self.is_snapshot = self.is_snapshot or event.get('type') == 'snapshot'
 
     def __repr__(self):
         return f"MarketTradesEvent(channel={self.channel}, trades={self.trades})"
@@ -307,6 +313,8 @@ class UserEvent:
         self.profile_id = profile_id
         self.orders = []
         self.positions = {"perpetual_futures_positions": [], "expiring_futures_positions": []}
+        # The first message of a subscription is a snapshot of all the open orders.
+        self.is_snapshot = any(event.get('type') == 'snapshot' for event in events)
         for event in events:
             if 'orders' in event:
                 self.orders.extend([Order(order) for order in event['orders']])
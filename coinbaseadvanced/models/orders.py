@@ -2,15 +2,16 @@
 Object models for order related endpoints args and response.
 """
 
-from typing import List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
 from datetime import datetime
 from enum import Enum
 
-import requests
-
-from coinbaseadvanced.models.common import BaseModel
+from coinbaseadvanced.models.common import BaseModel, ChunkTiming
 from coinbaseadvanced.models.error import CoinbaseAdvancedTradeAPIError
 
+if TYPE_CHECKING:
+    import requests
+
 
 class Side(Enum):
     """
@@ -364,7 +365,7 @@ class Order(BaseModel):
         self.kwargs = kwargs
 
     @classmethod
-    def from_create_order_response(cls, response: requests.Response) -> 'Order':
+    def from_create_order_response(cls, response: 'requests.Response') -> 'Order':
         """
         Factory method from the `create_order` response object.
         """
@@ -387,7 +388,7 @@ class Order(BaseModel):
         return cls(**success_response, order_configuration=order_configuration)
 
     @classmethod
-    def from_get_order_response(cls, response: requests.Response) -> 'Order':
+    def from_get_order_response(cls, response: 'requests.Response') -> 'Order':
         """
         Factory method for creation from the `get_order` response object.
         """
@@ -402,6 +403,133 @@ class Order(BaseModel):
         return cls(**order)
 
 
+class OrderSpec(BaseModel):
+    """
+    Arguments of an order to be created, as accepted by the `create_order` endpoint.
+    """
+
+    client_order_id: str
+    product_id: str
+    side: Side
+    order_configuration: dict
+    retail_portfolio_id: Optional[str]
+
+    def __init__(self,
+                 client_order_id: str,
+                 product_id: str,
+                 side: Side,
+                 order_configuration: dict,
+                 retail_portfolio_id: Optional[str] = None, **kwargs) -> None:
+        self.client_order_id = client_order_id
+        self.product_id = product_id
+        self.side = side
+        self.order_configuration = order_configuration
+        self.retail_portfolio_id = retail_portfolio_id
+
+        self.kwargs = kwargs
+
+    @classmethod
+    def limit(cls,
+              client_order_id: str,
+              product_id: str,
+              side: Side,
+              limit_price: float,
+              base_size: float,
+              cancel_time: Optional[datetime] = None,
+              post_only: Optional[bool] = None,
+              retail_portfolio_id: Optional[str] = None) -> 'OrderSpec':
+        """
+        Factory method for limit orders, same arguments as `create_limit_order`.
+        """
+
+        order_configuration = {}
+
+        limit_order_configuration: Dict[str, Union[str, bool]] = {
+            "limit_price": str(limit_price),
+            "base_size": str(base_size),
+        }
+
+        if post_only is not None:
+            limit_order_configuration['post_only'] = post_only
+
+        if cancel_time is not None:
+            limit_order_configuration['end_time'] = cancel_time.strftime(
+                "%Y-%m-%dT%H:%M:%SZ")
+            order_configuration['limit_limit_gtd'] = limit_order_configuration
+        else:
+            order_configuration['limit_limit_gtc'] = limit_order_configuration
+
+        return cls(client_order_id, product_id, side, order_configuration, retail_portfolio_id)
+
+    def to_payload(self) -> dict:
+        """
+        Request body of the `create_order` endpoint for this order.
+        """
+
+        payload = {
+            'client_order_id': self.client_order_id,
+            'product_id': self.product_id,
+            'side': self.side.value,
+            'order_configuration': self.order_configuration,
+        }
+        if self.retail_portfolio_id is not None:
+            payload['retail_portfolio_id'] = self.retail_portfolio_id
+
+        return payload
+
+
+class OrderPlacement(BaseModel):
+    """
+    Outcome of one order of a bulk placement.
+
+    Attributes:
+        order (Optional[Order]): Created order, `order_error` is set when Coinbase rejected it.
+        error (Optional[Exception]): Error raised while placing the order, if any.
+        latency (float): Seconds between sending the order and parsing its response.
+    """
+
+    order: Optional[Order]
+    error: Optional[Exception]
+    latency: float
+
+    def __init__(self, order: Optional[Order], error: Optional[Exception], latency: float, **kwargs) -> None:
+        self.order = order
+        self.error = error
+        self.latency = latency
+
+        self.kwargs = kwargs
+
+
+class OrdersBulkPlacement(BaseModel):
+    """
+    Outcome of a bulk order placement, placements are in the same order as the input.
+
+    Attributes:
+        placements (List[OrderPlacement]): One placement per requested order.
+        elapsed (float): End to end seconds of the bulk placement.
+    """
+
+    placements: List[OrderPlacement]
+    elapsed: float
+
+    def __init__(self, placements: List[OrderPlacement], elapsed: float, **kwargs) -> None:
+        self.placements = placements
+        self.elapsed = elapsed
+
+        self.kwargs = kwargs
+
+    @property
+    def orders(self) -> List[Optional[Order]]:
+        """
+        Created orders, `None` for the ones whose placement raised.
+        """
+
+        return [placement.order for placement in self.placements]
+
+    def __iter__(self):
+        return self.placements.__iter__()
+
+
 class OrdersPage(BaseModel):
     """
     Orders page.
@@ -429,7 +557,7 @@ class OrdersPage(BaseModel):
         self.kwargs = kwargs
 
     @classmethod
-    def from_response(cls, response: requests.Response) -> 'OrdersPage':
+    def from_response(cls, response: 'requests.Response') -> 'OrdersPage':
         """
         Factory Method.
         """
@@ -463,7 +591,7 @@ class OrderEdit(BaseModel):
         self.kwargs = kwargs
 
     @classmethod
-    def from_response(cls, response: requests.Response) -> 'OrderEdit':
+    def from_response(cls, response: 'requests.Response') -> 'OrderEdit':
         """
         Factory Method.
         """
@@ -504,7 +632,7 @@ class OrderEditPreview(BaseModel):
         self.kwargs = kwargs
 
     @classmethod
-    def from_response(cls, response: requests.Response) -> 'OrderEditPreview':
+    def from_response(cls, response: 'requests.Response') -> 'OrderEditPreview':
         """
         Factory Method.
         """
@@ -539,14 +667,30 @@ class OrderBatchCancellation(BaseModel):
     """
 
     results: List[OrderCancellation]
+    chunk_timings: List[ChunkTiming]
 
-    def __init__(self, results: List[OrderCancellation], **kwargs) -> None:
+    def __init__(self, results: List[OrderCancellation],
+                 chunk_timings: Optional[List[ChunkTiming]] = None, **kwargs) -> None:
         self.results = results
+        self.chunk_timings = chunk_timings if chunk_timings is not None else []
 
         self.kwargs = kwargs
 
     @classmethod
-    def from_response(cls, response: requests.Response) -> 'OrderBatchCancellation':
+    def merge(cls, cancellations: List['OrderBatchCancellation'],
+              chunk_timings: Optional[List[ChunkTiming]] = None) -> 'OrderBatchCancellation':
+        """
+        Merges the cancellations of several `batch_cancel` calls into a single one.
+        """
+
+        results = []
+        for cancellation in cancellations:
+            results.extend(cancellation.results)
+
+        return cls(results=results, chunk_timings=chunk_timings)
+
+    @classmethod
+    def from_response(cls, response: 'requests.Response') -> 'OrderBatchCancellation':
         """
         Factory method.
         """
@@ -559,6 +703,52 @@ class OrderBatchCancellation(BaseModel):
         return cls(**result)
 
 
+class CancelAllReport(BaseModel):
+    """
+    Outcome of a `cancel_all` kill switch.
+
+    Attributes:
+        cancellation (OrderBatchCancellation): Cancellations of every round, with their chunk timings.
+        open_order_ids (List[str]): Orders still open after the last round, by the last
+                                    verification or, unverified, the ones whose cancel failed.
+        source (str): Where the orders to cancel were first found, `local` for an
+                      `OrderStateStore` or `rest` for `list_orders`.
+        rounds (int): Cancel rounds sent.
+        verified (bool): Whether `open_order_ids` comes from a `list_orders` check rather than
+                         from the local store or the cancel results.
+        time_to_flat (Optional[float]): Seconds until no order was verified open, `None` when not flat.
+        elapsed (float): End to end seconds of the kill switch.
+    """
+
+    cancellation: OrderBatchCancellation
+    open_order_ids: List[str]
+    source: str
+    rounds: int
+    verified: bool
+    time_to_flat: Optional[float]
+    elapsed: float
+
+    def __init__(self, cancellation: OrderBatchCancellation, open_order_ids: List[str], source: str,
+                 rounds: int, verified: bool, time_to_flat: Optional[float], elapsed: float, **kwargs) -> None:
+        self.cancellation = cancellation
+        self.open_order_ids = open_order_ids
+        self.source = source
+        self.rounds = rounds
+        self.verified = verified
+        self.time_to_flat = time_to_flat
+        self.elapsed = elapsed
+
+        self.kwargs = kwargs
+
+    @property
+    def flat(self) -> bool:
+        """
+        Whether no order was left open.
+        """
+
+        return not self.open_order_ids
+
+
 class Fill(BaseModel):
     """
     Object representing an order filled.
@@ -639,7 +829,7 @@ class FillsPage(BaseModel):
         self.kwargs = kwargs
 
     @classmethod
-    def from_response(cls, response: requests.Response) -> 'FillsPage':
+    def from_response(cls, response: 'requests.Response') -> 'FillsPage':
         """
         Factory Method.
         """
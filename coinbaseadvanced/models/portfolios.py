@@ -2,16 +2,18 @@
 Object models for portfolios related endpoints args and response.
 """
 
-from typing import List
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple, Union
 from enum import Enum
 from uuid import UUID
 
-import requests
-
 from coinbaseadvanced.models.common import BaseModel, ValueCurrency
 from coinbaseadvanced.models.error import CoinbaseAdvancedTradeAPIError
 from coinbaseadvanced.models.futures import FuturesPosition, FuturesPositionSide, MarginType
 
+if TYPE_CHECKING:
+    import requests
+
 
 class UserRawCurrency(BaseModel):
     """
@@ -61,7 +63,7 @@ class Portfolio(BaseModel):
         self.kwargs = kwargs
 
     @classmethod
-    def from_response(cls, response: requests.Response) -> 'Portfolio':
+    def from_response(cls, response: 'requests.Response') -> 'Portfolio':
         """
         Factory Method.
         """
@@ -245,7 +247,7 @@ class PortfolioBreakdown(BaseModel):
         self.kwargs = kwargs
 
     @classmethod
-    def from_response(cls, response: requests.Response) -> 'PortfolioBreakdown':
+    def from_response(cls, response: 'requests.Response') -> 'PortfolioBreakdown':
         """
         Factory Method.
         """
@@ -271,7 +273,7 @@ class PortfoliosPage(BaseModel):
         self.kwargs = kwargs
 
     @classmethod
-    def from_response(cls, response: requests.Response) -> 'PortfoliosPage':
+    def from_response(cls, response: 'requests.Response') -> 'PortfoliosPage':
         """
         Factory Method.
         """
@@ -286,6 +288,125 @@ class PortfoliosPage(BaseModel):
         return self.portfolios.__iter__()
 
 
+# Columns of `PositionsTable`, in order.
+SPOT_POSITION_COLUMNS = ('portfolio_uuid', 'asset', 'account_uuid', 'total_balance_fiat', 'total_balance_crypto',
+                         'available_to_trade_fiat', 'allocation', 'one_day_change', 'cost_basis',
+                         'cost_basis_currency', 'is_cash')
+
+PERP_POSITION_COLUMNS = ('portfolio_uuid', 'product_id', 'symbol', 'position_side', 'margin_type', 'net_size',
+                         'buy_order_size', 'sell_order_size', 'leverage', 'vwap', 'mark_price',
+                         'liquidation_price', 'unrealized_pnl', 'position_notional', 'im_notional', 'mm_notional')
+
+
+class PositionsTable(BaseModel):
+    """
+    Positions of several portfolios in columnar form, one list per attribute.
+
+    Amounts are floats, currency amounts are in the user native currency. Every row
+    carries the `portfolio_uuid` it belongs to.
+
+    Attributes:
+        columns (Dict[str, list]): Column name to values, all of the same length.
+    """
+
+    columns: Dict[str, list]
+
+    def __init__(self, columns: Dict[str, list]) -> None:
+        self.columns = columns
+
+    @classmethod
+    def from_spot_positions(cls, positions: Iterable[Tuple[str, SpotPosition]]) -> 'PositionsTable':
+        """
+        Builds the table of `(portfolio_uuid, position)` pairs.
+        """
+
+        columns: Dict[str, list] = {name: [] for name in SPOT_POSITION_COLUMNS}
+        for portfolio_uuid, position in positions:
+            row = (portfolio_uuid, position.asset, position.account_uuid, float(position.total_balance_fiat),
+                   float(position.total_balance_crypto), float(position.available_to_trade_fiat),
+                   float(position.allocation), float(position.one_day_change), float(position.cost_basis.value),
+                   position.cost_basis.currency, bool(position.is_cash))
+            for values, value in zip(columns.values(), row):
+                values.append(value)
+        return cls(columns)
+
+    @classmethod
+    def from_perp_positions(cls, positions: Iterable[Tuple[str, PerpPosition]]) -> 'PositionsTable':
+        """
+        Builds the table of `(portfolio_uuid, position)` pairs.
+        """
+
+        def native(amount: UserRawCurrency) -> float:
+            return float(amount.user_native_currency.value)
+
+        columns: Dict[str, list] = {name: [] for name in PERP_POSITION_COLUMNS}
+        for portfolio_uuid, position in positions:
+            row = (portfolio_uuid, position.product_id, position.symbol, position.position_side.name,
+                   position.margin_type.name, float(position.net_size), float(position.buy_order_size),
+                   float(position.sell_order_size), float(position.leverage), native(position.vwap),
+                   native(position.mark_price), native(position.liquidation_price),
+                   native(position.unrealized_pnl), native(position.position_notional),
+                   native(position.im_notional), native(position.mm_notional))
+            for values, value in zip(columns.values(), row):
+                values.append(value)
+        return cls(columns)
+
+    def __len__(self) -> int:
+        return len(self.columns['portfolio_uuid'])
+
+    def __getitem__(self, column: str) -> list:
+        return self.columns[column]
+
+    def total(self, column: str, by: Optional[str] = None) -> Union[float, Dict[str, float]]:
+        """
+        Sum of a numeric column, grouped by the values of column `by` if given,
+        e.g. `total('total_balance_fiat', by='asset')`.
+        """
+
+        values = self.columns[column]
+        if by is None:
+            return float(sum(values))
+
+        totals: Dict[str, float] = {}
+        for key, value in zip(self.columns[by], values):
+            totals[key] = totals.get(key, 0.0) + value
+        return totals
+
+    def __repr__(self):
+        return f"PositionsTable(rows={len(self)}, columns={list(self.columns)})"
+
+
+class PortfolioBreakdowns(BaseModel, Mapping):
+    """
+    Breakdowns of several portfolios, a mapping of portfolio uuid to `PortfolioBreakdown`.
+
+    Attributes:
+        breakdowns (Dict[str, PortfolioBreakdown]): Breakdown of every portfolio.
+        spot_positions (PositionsTable): Spot positions of all the portfolios.
+        perp_positions (PositionsTable): Perpetual futures positions of all the portfolios.
+    """
+
+    breakdowns: Dict[str, PortfolioBreakdown]
+    spot_positions: PositionsTable
+    perp_positions: PositionsTable
+
+    def __init__(self, breakdowns: Dict[str, PortfolioBreakdown]) -> None:
+        self.breakdowns = breakdowns
+        self.spot_positions = PositionsTable.from_spot_positions(
+            (uuid, position) for uuid, breakdown in breakdowns.items() for position in breakdown.spot_positions)
+        self.perp_positions = PositionsTable.from_perp_positions(
+            (uuid, position) for uuid, breakdown in breakdowns.items() for position in breakdown.perp_positions)
+
+    def __getitem__(self, portfolio_uuid: str) -> PortfolioBreakdown:
+        return self.breakdowns[portfolio_uuid]
+
+    def __iter__(self):
+        return iter(self.breakdowns)
+
+    def __len__(self) -> int:
+        return len(self.breakdowns)
+
+
 class PortfolioFundsTransfer(BaseModel):
     """
     Represents a funds transfer between two portfolios.
@@ -309,7 +430,7 @@ class PortfolioFundsTransfer(BaseModel):
         self.kwargs = kwargs
 
     @classmethod
-    def from_response(cls, response: requests.Response) -> 'PortfolioFundsTransfer':
+    def from_response(cls, response: 'requests.Response') -> 'PortfolioFundsTransfer':
         """
         Factory method that creates a PortfolioFundsTransfer object from a response.
 
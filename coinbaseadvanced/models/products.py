@@ -2,16 +2,20 @@
 Object models for products related endpoints args and response.
 """
 
+import time as _time
+from array import array
+from collections.abc import Mapping
 from uuid import UUID
 from datetime import datetime
-from typing import List
+from typing import TYPE_CHECKING, Dict, List, Optional
 from enum import Enum
 
-import requests
-
 from coinbaseadvanced.models.common import BaseModel
 from coinbaseadvanced.models.error import CoinbaseAdvancedTradeAPIError
 
+if TYPE_CHECKING:
+    import requests
+
 
 class ProductType(Enum):
     """
@@ -154,7 +158,7 @@ class Product(BaseModel):
         self.kwargs = kwargs
 
     @classmethod
-    def from_response(cls, response: requests.Response) -> 'Product':
+    def from_response(cls, response: 'requests.Response') -> 'Product':
         """
         Factory Method.
         """
@@ -184,7 +188,7 @@ class ProductsPage(BaseModel):
         self.kwargs = kwargs
 
     @classmethod
-    def from_response(cls, response: requests.Response) -> 'ProductsPage':
+    def from_response(cls, response: 'requests.Response') -> 'ProductsPage':
         """
         Factory Method.
         """
@@ -242,7 +246,7 @@ class CandlesPage(BaseModel):
         self.kwargs = kwargs
 
     @classmethod
-    def from_response(cls, response: requests.Response) -> 'CandlesPage':
+    def from_response(cls, response: 'requests.Response') -> 'CandlesPage':
         """
         Factory Method.
         """
@@ -330,7 +334,7 @@ class BidAsksPage(BaseModel):
         self.kwargs = kwargs
 
     @classmethod
-    def from_response(cls, response: requests.Response) -> 'BidAsksPage':
+    def from_response(cls, response: 'requests.Response') -> 'BidAsksPage':
         """
         Factory Method.
         """
@@ -358,7 +362,7 @@ class ProductBook(BaseModel):
         self.kwargs = kwargs
 
     @classmethod
-    def from_response(cls, response: requests.Response) -> 'ProductBook':
+    def from_response(cls, response: 'requests.Response') -> 'ProductBook':
         """
         Factory Method.
         """
@@ -370,6 +374,131 @@ class ProductBook(BaseModel):
         return cls(**result)
 
 
+class BookSnapshot(BaseModel):
+    """
+    Order book of a product as packed arrays, best level first on each side.
+
+    Prices and sizes are `array('d')` columns instead of `Bid`/`Ask` objects, numpy
+    users can wrap them without copies, e.g. `numpy.frombuffer(snapshot.bid_prices)`.
+
+    Attributes:
+        product_id (str): Product.
+        time (str): Time of the book according to Coinbase.
+        fetched_at (float): Unix time the response was received, to compare the staleness of books.
+        bid_prices, bid_sizes (array): Bid ladder, decreasing prices.
+        ask_prices, ask_sizes (array): Ask ladder, increasing prices.
+    """
+
+    product_id: str
+    time: str
+    fetched_at: float
+    bid_prices: array
+    bid_sizes: array
+    ask_prices: array
+    ask_sizes: array
+
+    def __init__(self, product_id: str, bids: list, asks: list, time: str, fetched_at: float, **kwargs) -> None:
+        self.product_id = product_id
+        self.time = time
+        self.fetched_at = fetched_at
+        self.bid_prices = array('d', [float(level['price']) for level in bids or ()])
+        self.bid_sizes = array('d', [float(level['size']) for level in bids or ()])
+        self.ask_prices = array('d', [float(level['price']) for level in asks or ()])
+        self.ask_sizes = array('d', [float(level['size']) for level in asks or ()])
+
+        self.kwargs = kwargs
+
+    @classmethod
+    def from_response(cls, response: 'requests.Response') -> 'BookSnapshot':
+        """
+        Factory Method, parses a `get_product_book` response.
+        """
+
+        fetched_at = _time.time()
+
+        if not response.ok:
+            raise CoinbaseAdvancedTradeAPIError.not_ok_response(response)
+
+        result = response.json()
+        return cls(fetched_at=fetched_at, **result['pricebook'])
+
+    @property
+    def best_bid(self) -> Optional[float]:
+        """
+        Highest bid price, `None` when there are no bids.
+        """
+
+        return self.bid_prices[0] if self.bid_prices else None
+
+    @property
+    def best_ask(self) -> Optional[float]:
+        """
+        Lowest ask price, `None` when there are no asks.
+        """
+
+        return self.ask_prices[0] if self.ask_prices else None
+
+    @property
+    def mid(self) -> Optional[float]:
+        """
+        Mid price, `None` while a side is empty.
+        """
+
+        if not self.bid_prices or not self.ask_prices:
+            return None
+        return (self.bid_prices[0] + self.ask_prices[0]) / 2
+
+    def age(self, now: Optional[float] = None) -> float:
+        """
+        Seconds since the book was fetched.
+        """
+
+        return (now if now is not None else _time.time()) - self.fetched_at
+
+    def __str__(self):
+        return repr(self)
+
+    def __repr__(self):
+        return (f"BookSnapshot(product_id={self.product_id}, bids={len(self.bid_prices)}, "
+                f"asks={len(self.ask_prices)}, best_bid={self.best_bid}, best_ask={self.best_ask}, "
+                f"fetched_at={self.fetched_at})")
+
+
+class BookSnapshots(BaseModel, Mapping):
+    """
+    Books of several products fetched together, a mapping of product id to `BookSnapshot`.
+
+    Attributes:
+        books (Dict[str, BookSnapshot]): Books fetched successfully.
+        errors (Dict[str, Exception]): Error of every product whose book could not be fetched.
+    """
+
+    books: Dict[str, BookSnapshot]
+    errors: Dict[str, Exception]
+
+    def __init__(self, books: Dict[str, BookSnapshot], errors: Optional[Dict[str, Exception]] = None) -> None:
+        self.books = books
+        self.errors = errors or {}
+
+    def __getitem__(self, product_id: str) -> BookSnapshot:
+        return self.books[product_id]
+
+    def __iter__(self):
+        return iter(self.books)
+
+    def __len__(self) -> int:
+        return len(self.books)
+
+    @property
+    def fetch_skew(self) -> float:
+        """
+        Seconds between the first and the last book fetched, 0 with fewer than two books.
+        """
+
+        fetched = [book.fetched_at for book in self.books.values()]
+        return max(fetched) - min(fetched) if len(fetched) > 1 else 0.0
+
+
 class Trade(BaseModel):
     """
     Trade object data.
@@ -427,7 +556,7 @@ class TradesPage(BaseModel):
         self.kwargs = kwargs
 
     @classmethod
-    def from_response(cls, response: requests.Response) -> 'TradesPage':
+    def from_response(cls, response: 'requests.Response') -> 'TradesPage':
         """
         Factory Method.
         """
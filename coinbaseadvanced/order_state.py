@@ -0,0 +1,278 @@
+"""
+Local order state maintained from the websocket `user` channel.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from coinbaseadvanced.client import CoinbaseAdvancedTradeAPIClient
+    from coinbaseadvanced.models import market_data, orders
+
+# Order statuses for which the order is still working on the book.
+OPEN_STATUSES = frozenset(('PENDING', 'OPEN', 'QUEUED', 'CANCEL_QUEUED'))
+
+
+class TrackedOrder:
+    """
+    Snapshot of an order as known locally, built either from REST or from the `user` channel.
+    """
+
+    __slots__ = ('order_id', 'client_order_id', 'product_id', 'side', 'order_type', 'status',
+                 'limit_price', 'filled_size', 'average_filled_price', 'leaves_quantity',
+                 'time_in_force', 'updated_at')
+
+    def __init__(self,
+                 order_id: str,
+                 client_order_id: Optional[str],
+                 product_id: Optional[str],
+                 side: Optional[str],
+                 order_type: Optional[str],
+                 status: Optional[str],
+                 limit_price: Optional[str] = None,
+                 filled_size: Optional[str] = None,
+                 average_filled_price: Optional[str] = None,
+                 leaves_quantity: Optional[str] = None,
+                 time_in_force: Optional[str] = None,
+                 updated_at: Optional[float] = None) -> None:
+        self.order_id = order_id
+        self.client_order_id = client_order_id
+        self.product_id = product_id
+        self.side = side
+        self.order_type = order_type
+        self.status = status
+        self.limit_price = limit_price
+        self.filled_size = filled_size
+        self.average_filled_price = average_filled_price
+        self.leaves_quantity = leaves_quantity
+        self.time_in_force = time_in_force
+        self.updated_at = updated_at if updated_at is not None else time.time()
+
+    @property
+    def is_open(self) -> bool:
+        """
+        Whether the order is still working on the book.
+        """
+
+        return self.status in OPEN_STATUSES
+
+    @classmethod
+    def from_rest(cls, order: 'orders.Order') -> 'TrackedOrder':
+        """
+        Factory method from an order returned by the REST endpoints.
+        """
+
+        limit_price = None
+        configuration = order.order_configuration
+        if configuration is not None:
+            for limit in (configuration.limit_limit_gtc, configuration.limit_limit_gtd,
+                          configuration.stop_limit_stop_limit_gtc, configuration.stop_limit_stop_limit_gtd):
+                if limit is not None:
+                    limit_price = limit.limit_price
+                    break
+
+        return cls(order.order_id, order.client_order_id, order.product_id, order.side,
+                   order.order_type, order.status, limit_price, order.filled_size,
+                   order.average_filled_price, None, order.time_in_force)
+
+    @classmethod
+    def from_user_channel(cls, order: 'market_data.Order') -> 'TrackedOrder':
+        """
+        Factory method from an order of a `user` channel event.
+        """
+
+        return cls(order.order_id, order.client_order_id, order.product_id, order.order_side,
+                   order.order_type, order.status, order.limit_price, order.cumulative_quantity,
+                   order.avg_price, order.leaves_quantity, order.time_in_force)
+
+    def __repr__(self):
+        return (f"TrackedOrder(order_id={self.order_id}, client_order_id={self.client_order_id}, "
+                f"product_id={self.product_id}, side={self.side}, status={self.status}, "
+                f"limit_price={self.limit_price}, filled_size={self.filled_size})")
+
+
+class OrderStateStore:
+    """
+    Keeps open and recently closed orders up to date from the websocket `user` channel.
+
+    The store is bootstrapped from REST, then every `UserEvent` is applied to it.
+    REST is only used again after a gap in the stream: when the connection restarts
+    (sequence numbers go back) the next snapshot is reconciled against the local open
+    orders and the ones missing from it are fetched individually.
+
+    Usage:
+        store = OrderStateStore(client)
+        store.bootstrap()
+        websocket_client.subscribe(["BTC-USD"], "user", callback=store.on_user_event)
+
+    Args:
+    - client: REST client used to bootstrap and to recover from gaps.
+    - product_ids: Only track orders for these products. Defaults to all products.
+    - recent_capacity: How many closed orders to keep for lookups.
+    """
+
+    def __init__(self,
+                 client: 'CoinbaseAdvancedTradeAPIClient',
+                 product_ids: Optional[List[str]] = None,
+                 recent_capacity: int = 1000) -> None:
+        self._client = client
+        self._product_ids = frozenset(product_ids) if product_ids is not None else None
+        self._recent_capacity = recent_capacity
+
+        self._open: Dict[str, TrackedOrder] = {}
+        self._recent: 'OrderedDict[str, TrackedOrder]' = OrderedDict()
+        self._by_client_order_id: Dict[str, str] = {}
+        self._listeners: List[Callable[[TrackedOrder, Optional[TrackedOrder]], None]] = []
+
+        self._last_sequence: Optional[int] = None
+        # The first snapshot is reconciled as well, orders may close between `bootstrap()`
+        # and the subscription.
+        self._gap = True
+        self._lock = threading.RLock()
+
+        self.rest_calls = 0
+
+    # Lookups #
+
+    def get(self, order_id: str) -> Optional[TrackedOrder]:
+        """
+        Order by its ID, open or recently closed.
+        """
+
+        order = self._open.get(order_id)
+        return order if order is not None else self._recent.get(order_id)
+
+    def get_by_client_order_id(self, client_order_id: str) -> Optional[TrackedOrder]:
+        """
+        Order by the client set ID given at creation.
+        """
+
+        order_id = self._by_client_order_id.get(client_order_id)
+        return self.get(order_id) if order_id is not None else None
+
+    def open_orders(self, product_id: Optional[str] = None) -> List[TrackedOrder]:
+        """
+        Currently open orders, optionally only the ones of `product_id`.
+        """
+
+        orders = list(self._open.values())
+        if product_id is None:
+            return orders
+        return [order for order in orders if order.product_id == product_id]
+
+    def add_listener(self, callback: Callable[[TrackedOrder, Optional[TrackedOrder]], None]) -> None:
+        """
+        Registers `callback(order, previous)` to be called every time an order changes.
+        """
+
+        self._listeners.append(callback)
+
+    # Updates #
+
+    def bootstrap(self) -> int:
+        """
+        Loads the open orders from REST, returns the amount of orders loaded.
+        """
+
+        page = self._client.list_orders_all(order_status=['OPEN'])
+        self.rest_calls += 1
+
+        with self._lock:
+            for order in page.orders:
+                self._apply(TrackedOrder.from_rest(order))
+
+        return len(page.orders)
+
+    def on_user_event(self, event: 'market_data.UserEvent') -> None:
+        """
+        Websocket callback for the `user` channel.
+        """
+
+        with self._lock:
+            if self._last_sequence is not None and event.sequence_num <= self._last_sequence:
+                # The connection restarted, updates sent meanwhile were lost.
+                self._gap = True
+            self._last_sequence = event.sequence_num
+
+            seen = set()
+            for order in event.orders:
+                tracked = TrackedOrder.from_user_channel(order)
+                seen.add(tracked.order_id)
+                self._apply(tracked)
+
+            missing = []
+            if event.is_snapshot and self._gap:
+                missing = self._missing(seen)
+                self._gap = False
+
+        self._reconcile(missing)
+
+    def resync(self) -> None:
+        """
+        Reconciles the local open orders with REST, e.g. after being disconnected for a while.
+        """
+
+        page = self._client.list_orders_all(order_status=['OPEN'])
+        self.rest_calls += 1
+
+        with self._lock:
+            seen = set()
+            for order in page.orders:
+                tracked = TrackedOrder.from_rest(order)
+                seen.add(tracked.order_id)
+                self._apply(tracked)
+            missing = self._missing(seen)
+
+        self._reconcile(missing)
+
+    def _missing(self, seen: set) -> List[str]:
+        # Orders still open locally that the server no longer lists as open were
+        # closed while updates were missed.
+        return [order_id for order_id in self._open if order_id not in seen]
+
+    def _reconcile(self, order_ids: List[str]) -> None:
+        # Final states are fetched without holding the lock, so lookups and websocket
+        # updates do not wait for the REST round trips.
+        error = None
+        for order_id in order_ids:
+            try:
+                order = TrackedOrder.from_rest(self._client.get_order(order_id))
+            except Exception as e:  # pylint: disable=broad-except
+                # The other orders are still fetched, the next snapshot retries this one.
+                with self._lock:
+                    self.rest_calls += 1
+                    self._gap = True
+                error = error or e
+                continue
+            with self._lock:
+                self.rest_calls += 1
+                # Skipped if an update received meanwhile already closed it.
+                if order_id in self._open:
+                    self._apply(order)
+
+        if error is not None:
+            raise error
+
+    def _apply(self, order: TrackedOrder) -> None:
+        if self._product_ids is not None and order.product_id not in self._product_ids:
+            return
+
+        previous = self._open.pop(order.order_id, None)
+        closed = self._recent.pop(order.order_id, None)
+        previous = previous if previous is not None else closed
+
+        if order.is_open:
+            self._open[order.order_id] = order
+        else:
+            self._recent[order.order_id] = order
+            while len(self._recent) > self._recent_capacity:
+                _, evicted = self._recent.popitem(last=False)
+                self._by_client_order_id.pop(evicted.client_order_id, None)
+
+        if order.client_order_id:
+            self._by_client_order_id[order.client_order_id] = order.order_id
+
+        for listener in self._listeners:
+            listener(order, previous)
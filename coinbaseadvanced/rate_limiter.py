@@ -0,0 +1,204 @@
+"""
+Client side rate limiting for Coinbase Advanced Trade endpoints.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from enum import IntEnum
+from typing import Dict, List, Optional, Tuple
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket.
+
+    Coinbase enforces a per-second request budget on the REST endpoints:
+    https://docs.cdp.coinbase.com/advanced-trade/docs/rest-api-rate-limits
+
+    Args:
+    - rate: Tokens refilled per second.
+    - burst: Maximum amount of tokens the bucket can hold. Defaults to `rate`.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1, int(rate)))
+
+        self._tokens = self.burst
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._last_refill = now
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """
+        Takes `tokens` from the bucket if they are available right now.
+        """
+
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1) -> float:
+        """
+        Blocks until `tokens` are available and takes them.
+
+        Returns the amount of seconds the caller waited.
+        """
+
+        started = time.monotonic()
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return now - started
+                missing = tokens - self._tokens
+            time.sleep(missing / self.rate)
+
+
+class Priority(IntEnum):
+    """
+    Scheduling classes of the requests sharing a `PriorityRateLimiter`, lower values served first.
+    """
+
+    # `cancel_all` kill switch, ahead of every other request.
+    KILL_SWITCH = -1
+    CANCEL = 0
+    ORDER = 1
+    ACCOUNT = 2
+    MARKET_DATA = 3
+    HISTORY = 4
+
+
+class WaitStats:
+    """
+    Time the requests of one priority class waited for the rate limiter.
+
+    Attributes:
+        count (int): Tokens acquired.
+        total (float): Seconds waited, all acquisitions together.
+        max (float): Longest wait, in seconds.
+    """
+
+    __slots__ = ('count', 'total', 'max')
+
+    def __init__(self, count: int = 0, total: float = 0.0, max: float = 0.0) -> None:  # pylint: disable=redefined-builtin
+        self.count = count
+        self.total = total
+        self.max = max
+
+    @property
+    def mean(self) -> float:
+        """
+        Average wait, in seconds.
+        """
+
+        return self.total / self.count if self.count else 0.0
+
+    def _add(self, waited: float) -> None:
+        self.count += 1
+        self.total += waited
+        if waited > self.max:
+            self.max = waited
+
+    def __repr__(self):
+        return f"WaitStats(count={self.count}, mean={self.mean}, max={self.max})"
+
+
+class PriorityRateLimiter(RateLimiter):
+    """
+    Token bucket handing its tokens to the waiting caller of highest priority first.
+
+    When requests queue up behind the rate limit, a cancel waits only for the next token
+    instead of for every history page requested before it: lower priority callers, e.g.
+    `list_fills_all` crawls, yield automatically. Callers of the same priority are served
+    in arrival order.
+
+    Args:
+    - rate: Tokens refilled per second.
+    - burst: Maximum amount of tokens the bucket can hold. Defaults to `rate`.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None) -> None:
+        super().__init__(rate, burst)
+        self._available = threading.Condition(self._lock)
+        self._waiters: List[Tuple[int, int]] = []
+        self._arrivals = itertools.count()
+        self._wait_stats: Dict[Priority, WaitStats] = {priority: WaitStats() for priority in Priority}
+
+    def try_acquire(self, tokens: float = 1, priority: Priority = Priority.ACCOUNT) -> bool:
+        """
+        Takes `tokens` from the bucket if they are available right now and no caller of
+        the same or higher priority is waiting for them.
+        """
+
+        with self._lock:
+            if self._waiters and self._waiters[0][0] <= priority:
+                return False
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                self._wait_stats[Priority(priority)]._add(0.0)
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1, priority: Priority = Priority.ACCOUNT) -> float:
+        """
+        Blocks until `tokens` are available and no caller of higher priority is waiting, then takes them.
+
+        Returns the amount of seconds the caller waited.
+        """
+
+        started = time.monotonic()
+        waiter = (priority, next(self._arrivals))
+        with self._available:
+            heapq.heappush(self._waiters, waiter)
+            try:
+                while True:
+                    if self._waiters[0] != waiter:
+                        # Woken up when the head of the queue leaves.
+                        self._available.wait()
+                        continue
+
+                    now = time.monotonic()
+                    self._refill(now)
+                    if self._tokens >= tokens:
+                        self._tokens -= tokens
+                        waited = now - started
+                        self._wait_stats[Priority(priority)]._add(waited)
+                        return waited
+                    # A caller of higher priority arriving meanwhile becomes the head of
+                    # the queue and takes the token this one is waiting for.
+                    self._available.wait((tokens - self._tokens) / self.rate)
+            finally:
+                self._waiters.remove(waiter)
+                heapq.heapify(self._waiters)
+                self._available.notify_all()
+
+    def wait_stats(self, reset: bool = False) -> Dict[Priority, WaitStats]:
+        """
+        Time waited for tokens so far, by priority class.
+
+        Args:
+        - reset: Start counting again from zero.
+        """
+
+        with self._lock:
+            stats = {priority: WaitStats(s.count, s.total, s.max) for priority, s in self._wait_stats.items()}
+            if reset:
+                self._wait_stats = {priority: WaitStats() for priority in Priority}
+        return stats
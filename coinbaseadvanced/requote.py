@@ -0,0 +1,352 @@
+"""
+Requote engine keeping quoted price levels in line with their targets.
+
+Each level (any hashable key chosen by the caller, e.g. `("BTC-USD", "BUY", 0)`) holds
+one working limit order. Moving a level edits its order in place when the order can be
+edited (GTC limit orders, one round trip and the queue position is kept when only the
+size goes down), and falls back to cancelling it and creating a new one otherwise.
+"""
+
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Hashable, List, Mapping, Optional
+
+from coinbaseadvanced.models.error import CoinbaseAdvancedTradeAPIError, OrderRejectedError
+
+if TYPE_CHECKING:
+    from coinbaseadvanced.client import CoinbaseAdvancedTradeAPIClient
+    from coinbaseadvanced.models.orders import Order, Side
+
+# Actions of a `RequoteResult`.
+CREATE = 'create'
+EDIT = 'edit'
+REPLACE = 'replace'
+CANCEL = 'cancel'
+SKIP = 'skip'
+
+# Cancel failures meaning the order is no longer working, or already being cancelled.
+CLOSED_CANCEL_FAILURE_REASONS = frozenset(('ORDER_IS_FULLY_FILLED', 'DUPLICATE_CANCEL_REQUEST'))
+
+
+class Quote:
+    """
+    Target order of a level.
+
+    Args:
+    - product_id: The product the order is for e.g. 'BTC-USD'.
+    - side: Order side.
+    - limit_price: Limit price of the order.
+    - base_size: Amount of base currency of the order.
+    - post_only: Post only limit order.
+    - cancel_time: Makes the order good till this time, such orders cannot be edited.
+    """
+
+    __slots__ = ('product_id', 'side', 'limit_price', 'base_size', 'post_only', 'cancel_time')
+
+    def __init__(self,
+                 product_id: str,
+                 side: 'Side',
+                 limit_price: float,
+                 base_size: float,
+                 post_only: Optional[bool] = None,
+                 cancel_time: Optional[datetime] = None) -> None:
+        self.product_id = product_id
+        self.side = side
+        self.limit_price = limit_price
+        self.base_size = base_size
+        self.post_only = post_only
+        self.cancel_time = cancel_time
+
+    @property
+    def editable(self) -> bool:
+        """
+        Whether orders of this quote are GTC limit orders, the only ones `edit_order` accepts.
+        """
+
+        return self.cancel_time is None
+
+    def _terms(self) -> tuple:
+        return (self.product_id, self.side, self.limit_price, self.base_size, self.post_only, self.cancel_time)
+
+    def __eq__(self, other):
+        return isinstance(other, Quote) and self._terms() == other._terms()
+
+    def __hash__(self):
+        return hash(self._terms())
+
+    def __repr__(self):
+        return (f"Quote(product_id={self.product_id}, side={self.side}, limit_price={self.limit_price}, "
+                f"base_size={self.base_size})")
+
+
+class RequoteResult:
+    """
+    Outcome of one level update.
+
+    Attributes:
+        key (Hashable): Level updated.
+        action (str): `create`, `edit`, `replace`, `cancel` or `skip` when nothing changed.
+        order_id (Optional[str]): Working order of the level after the update.
+        error (Optional[Exception]): Error raised by the update, the level is left as it was.
+        latency (float): Seconds the requests of the update took.
+    """
+
+    __slots__ = ('key', 'action', 'order_id', 'error', 'latency')
+
+    def __init__(self, key: Hashable, action: str, order_id: Optional[str],
+                 error: Optional[Exception] = None, latency: float = 0.0) -> None:
+        self.key = key
+        self.action = action
+        self.order_id = order_id
+        self.error = error
+        self.latency = latency
+
+    def __repr__(self):
+        return (f"RequoteResult(key={self.key}, action={self.action}, order_id={self.order_id}, "
+                f"error={self.error!r}, latency={self.latency})")
+
+
+class RequoteStats:
+    """
+    Level updates made by a `RequoteEngine`.
+
+    Attributes:
+        creates (int): Orders created for levels without one.
+        edits (int): Orders edited in place.
+        replaces (int): Orders cancelled and created again.
+        edit_fallbacks (int): Replaces made because an edit was rejected.
+        cancels (int): Levels cancelled.
+        skipped (int): Updates leaving the price and size unchanged, no request sent.
+        coalesced (int): Updates superseded by a newer one before being sent.
+        failures (int): Updates that raised or whose order was rejected.
+    """
+
+    __slots__ = ('creates', 'edits', 'replaces', 'edit_fallbacks', 'cancels', 'skipped', 'coalesced', 'failures')
+
+    def __init__(self) -> None:
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+    def copy(self) -> 'RequoteStats':
+        """
+        Snapshot of the counters.
+        """
+
+        stats = RequoteStats()
+        for name in self.__slots__:
+            setattr(stats, name, getattr(self, name))
+        return stats
+
+    def __repr__(self):
+        return "RequoteStats(" + ", ".join(f"{name}={getattr(self, name)}" for name in self.__slots__) + ")"
+
+
+class _Level:
+    # Working order of a level and the update queued behind the one in flight.
+
+    __slots__ = ('quote', 'order_id', 'editable', 'in_flight', 'pending', 'pending_future')
+
+    def __init__(self) -> None:
+        self.quote: Optional[Quote] = None
+        self.order_id: Optional[str] = None
+        self.editable = False
+        self.in_flight = False
+        self.pending: Optional[Quote] = None
+        self.pending_future: Optional[Future] = None
+
+
+# Queued in place of a quote to cancel a level.
+_CANCELLED = object()
+
+
+class RequoteEngine:
+    """
+    Moves many quoted levels concurrently, each level through at most one request at a time.
+
+    Updates of different levels are sent in parallel. While an update of a level is in
+    flight, newer updates of that level are coalesced: only the latest is sent once the
+    current one completes, and the futures of the superseded ones resolve with its result.
+    Updates matching the working order of the level are skipped.
+
+    Usage:
+        engine = RequoteEngine(client)
+        results = engine.requote_many({
+            ("BTC-USD", "BUY", 0): Quote("BTC-USD", Side.BUY, 60000, 0.01),
+            ("BTC-USD", "SELL", 0): Quote("BTC-USD", Side.SELL, 60010, 0.01),
+        })
+
+    Args:
+    - client: REST client sending the orders.
+    - max_workers: Levels updated concurrently.
+    """
+
+    def __init__(self, client: 'CoinbaseAdvancedTradeAPIClient', max_workers: int = 8) -> None:
+        self._client = client
+        self._levels: Dict[Hashable, _Level] = {}
+        self._stats = RequoteStats()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='coinbaseadvanced-requote')
+
+    def adopt(self, key: Hashable, order: 'Order', quote: Quote) -> None:
+        """
+        Makes an existing open order the working order of `key`, `quote` describing its current terms.
+        """
+
+        configuration = order.order_configuration
+        with self._lock:
+            level = self._levels.setdefault(key, _Level())
+            level.quote = quote
+            level.order_id = order.order_id
+            level.editable = configuration is not None and configuration.limit_limit_gtc is not None
+
+    def requote(self, key: Hashable, quote: Quote) -> 'Future[RequoteResult]':
+        """
+        Moves the level `key` to `quote`, creating its order if it has none.
+
+        Returns a future resolving once the update, or a newer one superseding it, is done.
+        """
+
+        return self._submit(key, quote)
+
+    def requote_many(self, quotes: Mapping[Hashable, Quote]) -> List[RequoteResult]:
+        """
+        Moves several levels concurrently and waits for them, results are in the order of `quotes`.
+        """
+
+        futures = [self._submit(key, quote) for key, quote in quotes.items()]
+        return [future.result() for future in futures]
+
+    def cancel(self, key: Hashable) -> 'Future[RequoteResult]':
+        """
+        Cancels the working order of `key`, after the update in flight if any.
+        """
+
+        return self._submit(key, _CANCELLED)
+
+    def order_id(self, key: Hashable) -> Optional[str]:
+        """
+        Working order of the level `key`, `None` if it has none.
+        """
+
+        level = self._levels.get(key)
+        return level.order_id if level is not None else None
+
+    def in_flight(self) -> List[Hashable]:
+        """
+        Levels with an update in flight.
+        """
+
+        with self._lock:
+            return [key for key, level in self._levels.items() if level.in_flight]
+
+    def stats(self) -> RequoteStats:
+        """
+        Updates made so far.
+        """
+
+        with self._lock:
+            return self._stats.copy()
+
+    def close(self) -> None:
+        """
+        Waits for the updates in flight and stops the engine threads.
+        """
+
+        self._executor.shutdown(wait=True)
+
+    def _submit(self, key: Hashable, quote) -> Future:
+        with self._lock:
+            level = self._levels.setdefault(key, _Level())
+
+            if level.in_flight:
+                if level.pending_future is not None:
+                    self._stats.coalesced += 1
+                else:
+                    level.pending_future = Future()
+                level.pending = quote
+                return level.pending_future
+
+            if quote is not _CANCELLED and level.order_id is not None and quote == level.quote:
+                self._stats.skipped += 1
+                future = Future()
+                future.set_result(RequoteResult(key, SKIP, level.order_id))
+                return future
+
+            level.in_flight = True
+
+        future = Future()
+        self._executor.submit(self._run, key, level, quote, future)
+        return future
+
+    def _run(self, key: Hashable, level: _Level, quote, future: Future) -> None:
+        while True:
+            try:
+                future.set_result(self._apply(key, level, quote))
+            except BaseException as error:  # pylint: disable=broad-except
+                future.set_exception(error)
+
+            with self._lock:
+                if level.pending_future is None:
+                    level.in_flight = False
+                    return
+                quote, future = level.pending, level.pending_future
+                level.pending = level.pending_future = None
+
+    def _apply(self, key: Hashable, level: _Level, quote) -> RequoteResult:
+        # Only the thread holding `in_flight` touches the level order fields.
+        started = time.perf_counter()
+
+        if quote is _CANCELLED:
+            action = CANCEL
+        elif level.order_id is None:
+            action = CREATE
+        elif quote == level.quote:
+            with self._lock:
+                self._stats.skipped += 1
+            return RequoteResult(key, SKIP, level.order_id)
+        elif level.editable and quote.editable and (quote.product_id, quote.side, quote.post_only) == \
+                (level.quote.product_id, level.quote.side, level.quote.post_only):
+            action = EDIT
+        else:
+            action = REPLACE
+
+        counter = {CREATE: 'creates', EDIT: 'edits', REPLACE: 'replaces', CANCEL: 'cancels'}
+        try:
+            if action == EDIT:
+                edit = self._client.edit_order(level.order_id, quote.limit_price, quote.base_size)
+                if edit.success:
+                    level.quote = quote
+                else:
+                    with self._lock:
+                        self._stats.edit_fallbacks += 1
+                    action = REPLACE
+
+            if action in (REPLACE, CANCEL) and level.order_id is not None:
+                result = self._client.cancel_orders([level.order_id]).results[0]
+                # Creating the new order while the old one may still be working would double the exposure.
+                if not result['success'] and result['failure_reason'] not in CLOSED_CANCEL_FAILURE_REASONS:
+                    raise CoinbaseAdvancedTradeAPIError(result)
+                level.order_id = level.quote = None
+                level.editable = False
+
+            if action in (CREATE, REPLACE):
+                order = self._client.create_limit_order(
+                    str(uuid.uuid4()), quote.product_id, quote.side, quote.limit_price, quote.base_size,
+                    quote.cancel_time, quote.post_only)
+                if order.order_error is not None:
+                    raise OrderRejectedError(order.order_error)
+                level.order_id = order.order_id
+                level.quote = quote
+                level.editable = quote.editable
+        except Exception as error:  # pylint: disable=broad-except
+            with self._lock:
+                self._stats.failures += 1
+            return RequoteResult(key, action, level.order_id, error, time.perf_counter() - started)
+
+        with self._lock:
+            setattr(self._stats, counter[action], getattr(self._stats, counter[action]) + 1)
+        return RequoteResult(key, action, level.order_id, None, time.perf_counter() - started)
+
@@ -0,0 +1,417 @@
+"""
+Websocket ingestion spread over worker processes, sharded by product.
+
+Every shard process runs its own connection and parser for a subset of the products
+and publishes normalized events to the parent through a `SharedRing`. `l2_data`
+messages are normalized into `L2Batch` records, packed arrays of floats which the
+parent decodes without any parsing; events of other channels are sent pickled.
+"""
+
+import json
+import multiprocessing
+import os
+import pickle
+import struct
+import threading
+import time
+from array import array
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from coinbaseadvanced.client_websocket import CHANNELS, CoinbaseWebSocketClient
+from coinbaseadvanced.shared_ring import SharedRing
+from coinbaseadvanced.utils import parse_timestamp
+
+_L2_RECORD = 1
+_EVENT_RECORD = 2
+
+# Record type, received at, sequence number, snapshot flag, product id length, updates.
+_L2_HEADER = struct.Struct('<Bdq?HI')
+_EVENT_HEADER = struct.Struct('<Bd')
+
+# Producer counters of the shard rings.
+_MESSAGES, _BYTES, _WAITS, _FEED_LAG, _HEARTBEAT = range(5)
+
+SIDE_BID = 0
+SIDE_OFFER = 1
+
+
+class L2Batch:
+    """
+    Updates of one product book from one `l2_data` message.
+
+    Attributes:
+        product_id (str): Product.
+        is_snapshot (bool): Whether the updates replace the whole book.
+        sequence_num (int): Sequence number of the message.
+        received_at (float): Unix time the shard received the message.
+        sides (array): `SIDE_BID` or `SIDE_OFFER` for every update.
+        prices (array): Price levels.
+        quantities (array): New quantities, zero removes the level.
+        event_times (array): Unix time of every update.
+    """
+
+    __slots__ = ('product_id', 'is_snapshot', 'sequence_num', 'received_at', 'sides', 'prices',
+                 'quantities', 'event_times')
+
+    def __init__(self, product_id: str, is_snapshot: bool, sequence_num: int, received_at: float,
+                 sides: array, prices: array, quantities: array, event_times: array) -> None:
+        self.product_id = product_id
+        self.is_snapshot = is_snapshot
+        self.sequence_num = sequence_num
+        self.received_at = received_at
+        self.sides = sides
+        self.prices = prices
+        self.quantities = quantities
+        self.event_times = event_times
+
+    def __len__(self):
+        return len(self.prices)
+
+    def updates(self) -> Iterator[Tuple[int, float, float, float]]:
+        """
+        Iterates `(side, price, quantity, event_time)` tuples.
+        """
+
+        return zip(self.sides, self.prices, self.quantities, self.event_times)
+
+    def encode(self) -> bytes:
+        """
+        Serializes the batch into a ring record.
+        """
+
+        product_id = self.product_id.encode()
+        return b''.join((_L2_HEADER.pack(_L2_RECORD, self.received_at, self.sequence_num, self.is_snapshot,
+                                         len(product_id), len(self.prices)),
+                         product_id, self.prices.tobytes(), self.quantities.tobytes(),
+                         self.event_times.tobytes(), self.sides.tobytes()))
+
+    @classmethod
+    def decode(cls, record: bytes) -> 'L2Batch':
+        """
+        Factory method from a ring record.
+        """
+
+        _, received_at, sequence_num, is_snapshot, id_length, count = _L2_HEADER.unpack_from(record)
+        offset = _L2_HEADER.size
+        product_id = record[offset:offset + id_length].decode()
+        offset += id_length
+
+        columns = []
+        for _ in range(3):
+            column = array('d')
+            column.frombytes(record[offset:offset + count * 8])
+            columns.append(column)
+            offset += count * 8
+        sides = array('B', record[offset:offset + count])
+
+        return cls(product_id, is_snapshot, sequence_num, received_at, sides, *columns)
+
+    def __repr__(self):
+        return (f"L2Batch(product_id={self.product_id}, is_snapshot={self.is_snapshot}, "
+                f"sequence_num={self.sequence_num}, updates={len(self)})")
+
+
+def normalize_message(message: str, received_at: float) -> Tuple[List[bytes], Optional[float]]:
+    """
+    Converts a raw websocket message into ring records.
+
+    :param message: The raw message.
+    :param received_at: Unix time the message was received.
+    :return: The records and the server timestamp of the message, if any.
+    """
+    data = json.loads(message)
+    channel = data.get('channel')
+    if data.get('type') == 'error':
+        raise ValueError(f"Error message: {data['message']}")
+
+    server_time = parse_timestamp(data['timestamp']) if data.get('timestamp') else None
+    if channel in ('subscriptions', 'heartbeats'):
+        return [], server_time
+
+    if channel == 'l2_data':
+        records = []
+        for event in data.get('events', ()):
+            updates = event.get('updates', ())
+            batch = L2Batch(event.get('product_id', ''), event.get('type') == 'snapshot',
+                            data.get('sequence_num', 0), received_at,
+                            array('B', [SIDE_BID if u['side'] == 'bid' else SIDE_OFFER for u in updates]),
+                            array('d', [float(u['price_level']) for u in updates]),
+                            array('d', [float(u['new_quantity']) for u in updates]),
+                            array('d', [parse_timestamp(u['event_time']) for u in updates]))
+            records.append(batch.encode())
+        return records, server_time
+
+    if channel in CHANNELS:
+        event = CHANNELS[channel](**data)
+        return [_EVENT_HEADER.pack(_EVENT_RECORD, received_at) + pickle.dumps(event, pickle.HIGHEST_PROTOCOL)], \
+            server_time
+
+    raise ValueError(f"Unrecognized channel: {channel}")
+
+
+def decode_record(record: bytes) -> Tuple[object, float]:
+    """
+    Converts a ring record back into an event, returns it with the time it was received.
+    """
+
+    if record[0] == _L2_RECORD:
+        batch = L2Batch.decode(record)
+        return batch, batch.received_at
+
+    _, received_at = _EVENT_HEADER.unpack_from(record)
+    return pickle.loads(record[_EVENT_HEADER.size:]), received_at
+
+
+class _ShardWebSocketClient(CoinbaseWebSocketClient):
+    # Worker side connection publishing normalized records instead of calling callbacks.
+
+    def __init__(self, api_key: str, signing_key: str, ws_url: str, ring: SharedRing) -> None:
+        super().__init__(api_key, signing_key, ws_url)
+        self.ring = ring
+        self.messages = 0
+        self.bytes = 0
+        self.waits = 0
+
+    def _handle_message(self, ws, message: str) -> None:
+        received_at = time.time()
+        records, server_time = normalize_message(message, received_at)
+
+        for record in records:
+            # Back-pressure: wait for the parent rather than losing book updates.
+            while not self.ring.put(record):
+                self.waits += 1
+                self.ring.set_counter(_WAITS, self.waits)
+                time.sleep(0.0005)
+
+        self.messages += 1
+        self.bytes += len(message)
+        ring = self.ring
+        ring.set_counter(_MESSAGES, self.messages)
+        ring.set_counter(_BYTES, self.bytes)
+        ring.set_counter(_HEARTBEAT, received_at)
+        if server_time is not None:
+            ring.set_counter(_FEED_LAG, received_at - server_time)
+
+    def _on_error(self, ws, error: str):
+        pass
+
+    def _on_close(self, ws, close_status_code, close_msg):
+        pass
+
+    def run(self, product_ids: List[str], channel: str, stop: 'multiprocessing.synchronize.Event') -> None:
+        """
+        Keeps the subscription connected until `stop` is set.
+        """
+        import websocket
+
+        while not stop.is_set():
+            ws = websocket.WebSocketApp(self.ws_url, on_message=self._handle_message,
+                                        on_error=self._on_error, on_close=self._on_close)
+            ws.on_open = lambda ws: self._on_open(ws, product_ids, channel)
+
+            def close_on_stop(ws=ws):
+                stop.wait()
+                ws.close()
+
+            threading.Thread(target=close_on_stop, daemon=True).start()
+            ws.run_forever()
+            # Reconnect, the new subscription starts with a snapshot.
+            stop.wait(1.0)
+
+
+def _run_shard(api_key: str, signing_key: str, ws_url: str, product_ids: List[str], channel: str,
+               ring_name: str, stop: 'multiprocessing.synchronize.Event') -> None:
+    ring = SharedRing(ring_name, create=False)
+    try:
+        _ShardWebSocketClient(api_key, signing_key, ws_url, ring).run(product_ids, channel, stop)
+    finally:
+        ring.close()
+
+
+class ShardStats:
+    """
+    Ingestion metrics of one shard.
+
+    Attributes:
+        shard (int): Shard index.
+        product_ids (List[str]): Products handled by the shard.
+        alive (bool): Whether the worker process is running.
+        messages (int): Websocket messages received by the worker.
+        bytes (int): Websocket payload received by the worker.
+        messages_per_second (float): Throughput since the previous `stats()` call.
+        events (int): Records consumed by the parent.
+        backpressure_waits (int): Times the worker waited for room in the ring.
+        feed_lag (float): Seconds between the server timestamp and the worker receiving the last message.
+        ring_lag (float): Seconds the last consumed record waited in the ring.
+        max_ring_lag (float): Largest `ring_lag` seen.
+        ring_used (int): Bytes waiting in the ring.
+        last_message_age (Optional[float]): Seconds since the worker received a message.
+    """
+
+    __slots__ = ('shard', 'product_ids', 'alive', 'messages', 'bytes', 'messages_per_second', 'events',
+                 'backpressure_waits', 'feed_lag', 'ring_lag', 'max_ring_lag', 'ring_used', 'last_message_age')
+
+    def __init__(self, **kwargs) -> None:
+        for name in self.__slots__:
+            setattr(self, name, kwargs[name])
+
+    def __repr__(self):
+        return (f"ShardStats(shard={self.shard}, alive={self.alive}, messages={self.messages}, "
+                f"messages_per_second={self.messages_per_second}, feed_lag={self.feed_lag}, "
+                f"ring_lag={self.ring_lag}, ring_used={self.ring_used})")
+
+
+class _Shard:
+
+    def __init__(self, index: int, product_ids: List[str], ring: SharedRing) -> None:
+        self.index = index
+        self.product_ids = product_ids
+        self.ring = ring
+        self.process: Optional[multiprocessing.Process] = None
+        self.events = 0
+        self.ring_lag = 0.0
+        self.max_ring_lag = 0.0
+        self.sampled_messages = 0.0
+        self.sampled_at = time.monotonic()
+
+
+class ShardedWebSocketClient:
+    """
+    Runs websocket subscriptions in worker processes to scale parsing past one core.
+
+    Products are spread round-robin over `shards` processes, each with its own
+    connection, and the parent receives their normalized events through one shared
+    memory ring per shard: `L2Batch` objects for `l2_data`, model events otherwise.
+
+    Usage:
+        client = ShardedWebSocketClient(api_key, signing_key, shards=4)
+        client.subscribe(product_ids, "level2", callback=handle_event)
+        ...
+        print(client.stats())
+        client.close()
+
+    Args:
+    - api_key: The API key for Coinbase.
+    - signing_key: The signing key for generating JWT.
+    - ws_url: The WebSocket URL.
+    - shards: Number of worker processes, defaults to the number of CPUs.
+    - ring_capacity: Bytes of every shard ring.
+    """
+
+    def __init__(self,
+                 api_key: str,
+                 signing_key: str,
+                 ws_url: str = "wss://advanced-trade-ws.coinbase.com",
+                 shards: Optional[int] = None,
+                 ring_capacity: int = 1 << 24) -> None:
+        self.api_key = api_key
+        self.signing_key = signing_key
+        self.ws_url = ws_url
+        self.shards = shards or os.cpu_count() or 1
+        self.ring_capacity = ring_capacity
+
+        self._context = multiprocessing.get_context('spawn')
+        self._stop = self._context.Event()
+        self._shards: List[_Shard] = []
+        self._dispatcher: Optional[threading.Thread] = None
+        self._closed = threading.Event()
+
+    def subscribe(self, product_ids: List[str], channel: str,
+                  callback: Optional[Callable[[object], None]] = None) -> None:
+        """
+        Starts the shard processes subscribed to `channel`.
+
+        :param product_ids: Products to subscribe to, spread across the shards.
+        :param channel: The channel to subscribe to.
+        :param callback: Called in a parent thread with every event, leave empty to `poll` manually.
+        """
+        if self._shards:
+            raise RuntimeError("Shards are already running.")
+
+        count = min(self.shards, len(product_ids))
+        for index in range(count):
+            shard = _Shard(index, product_ids[index::count], SharedRing(capacity=self.ring_capacity))
+            shard.process = self._context.Process(
+                target=_run_shard, name=f'coinbaseadvanced-shard-{index}', daemon=True,
+                args=(self.api_key, self.signing_key, self.ws_url, shard.product_ids, channel,
+                      shard.ring.name, self._stop))
+            shard.process.start()
+            self._shards.append(shard)
+
+        if callback is not None:
+            self._dispatcher = threading.Thread(target=self._dispatch, args=(callback,),
+                                                name='coinbaseadvanced-shard-dispatcher', daemon=True)
+            self._dispatcher.start()
+
+    def poll(self, callback: Callable[[object], None], max_events: int = 1024) -> int:
+        """
+        Consumes up to `max_events` per shard, calling `callback` with each one.
+
+        :return: The number of events consumed.
+        """
+        consumed = 0
+        for shard in self._shards:
+            records = shard.ring.get_many(max_events)
+            if not records:
+                continue
+
+            now = time.time()
+            for record in records:
+                event, received_at = decode_record(record)
+                callback(event)
+
+            lag = now - received_at
+            shard.ring_lag = lag
+            shard.max_ring_lag = max(shard.max_ring_lag, lag)
+            shard.events += len(records)
+            consumed += len(records)
+
+        return consumed
+
+    def stats(self) -> List[ShardStats]:
+        """
+        Metrics of every shard.
+        """
+
+        result = []
+        now, monotonic = time.time(), time.monotonic()
+        for shard in self._shards:
+            ring = shard.ring
+            messages = ring.counter(_MESSAGES)
+            elapsed = monotonic - shard.sampled_at
+            rate = (messages - shard.sampled_messages) / elapsed if elapsed > 0 else 0.0
+            shard.sampled_messages, shard.sampled_at = messages, monotonic
+            heartbeat = ring.counter(_HEARTBEAT)
+
+            result.append(ShardStats(
+                shard=shard.index, product_ids=shard.product_ids,
+                alive=shard.process is not None and shard.process.is_alive(),
+                messages=int(messages), bytes=int(ring.counter(_BYTES)), messages_per_second=rate,
+                events=shard.events, backpressure_waits=int(ring.counter(_WAITS)),
+                feed_lag=ring.counter(_FEED_LAG), ring_lag=shard.ring_lag, max_ring_lag=shard.max_ring_lag,
+                ring_used=ring.used, last_message_age=now - heartbeat if heartbeat else None))
+
+        return result
+
+    def close(self, timeout: float = 5.0) -> None:
+        """
+        Stops the shard processes and frees the rings.
+        """
+
+        self._stop.set()
+        self._closed.set()
+        if self._dispatcher is not None:
+            self._dispatcher.join(timeout)
+
+        for shard in self._shards:
+            shard.process.join(timeout)
+            if shard.process.is_alive():
+                shard.process.terminate()
+            shard.ring.close()
+        self._shards = []
+
+    def _dispatch(self, callback: Callable[[object], None]) -> None:
+        while not self._closed.is_set():
+            if not self.poll(callback):
+                # Nothing pending, yield instead of spinning.
+                self._closed.wait(0.0005)
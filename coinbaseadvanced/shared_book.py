@@ -0,0 +1,331 @@
+"""
+Top of book table in shared memory, written from the websocket and read by any local process.
+
+One writer process keeps a row per product with the best bid and ask, their sizes,
+the last trade and the feed sequence number. Readers attach to the table by name and
+read rows without locks nor system calls: every row is guarded by a sequence counter
+(seqlock), odd while the writer updates it, and readers retry when it changed while
+they were copying the row.
+"""
+
+import math
+import struct
+import sys
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+
+from coinbaseadvanced.book_metrics import BookMetrics, BookMetricsTracker
+from coinbaseadvanced.utils import parse_timestamp
+
+if TYPE_CHECKING:
+    from coinbaseadvanced.models.market_data import Level2Event, MarketTradesEvent, TickerEvent
+
+_MAGIC = 0x42544243  # "CBTB"
+_VERSION = 1
+
+# Magic, version, row size, capacity, product count.
+_HEADER = struct.Struct('<IHHII')
+_HEADER_SIZE = 64
+_PRODUCT_ID_SIZE = 32
+_COUNT_OFFSET = 12
+
+_SEQUENCE = struct.Struct('<Q')
+# Best bid, bid size, best ask, ask size, last price, last size, last trade time, feed sequence, updated at.
+_ROW = struct.Struct('<dddddddqd')
+# Rows span two cache lines so writes to one product never invalidate another one.
+_ROW_SIZE = 128
+
+# Reads retried in a tight loop before yielding the CPU to the writer.
+_SPINS = 64
+
+# Names of the blocks created by this process, see `_attach`.
+_created = set()
+
+
+class TopOfBook:
+    """
+    Consistent copy of one product row, unknown values are `nan`.
+
+    Attributes:
+        product_id (str): Product.
+        best_bid, bid_size, best_ask, ask_size (float): Top of the book.
+        last_price, last_size (float): Last trade, the size is only known from `market_trades`.
+        last_trade_time (float): Unix time of the last trade.
+        sequence_num (int): Sequence number of the websocket message applied last.
+        updated_at (float): Unix time the row was written.
+    """
+
+    __slots__ = ('product_id', 'best_bid', 'bid_size', 'best_ask', 'ask_size', 'last_price', 'last_size',
+                 'last_trade_time', 'sequence_num', 'updated_at')
+
+    def __init__(self, product_id: str, values: tuple) -> None:
+        self.product_id = product_id
+        (self.best_bid, self.bid_size, self.best_ask, self.ask_size, self.last_price, self.last_size,
+         self.last_trade_time, self.sequence_num, self.updated_at) = values
+
+    @property
+    def mid(self) -> float:
+        """
+        Mid price, `nan` while a side is unknown.
+        """
+
+        return (self.best_bid + self.best_ask) / 2
+
+    def __repr__(self):
+        return (f"TopOfBook(product_id={self.product_id}, best_bid={self.best_bid}, bid_size={self.bid_size}, "
+                f"best_ask={self.best_ask}, ask_size={self.ask_size}, last_price={self.last_price}, "
+                f"sequence_num={self.sequence_num})")
+
+
+def _rows_offset(capacity: int) -> int:
+    return _HEADER_SIZE + capacity * _PRODUCT_ID_SIZE
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    # Before Python 3.13 attaching registers the block with the resource tracker of the
+    # reader process, which would free it when the reader exits.
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)  # pylint: disable=unexpected-keyword-arg
+
+    shm = shared_memory.SharedMemory(name=name)
+    if shm.name not in _created:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, 'shared_memory')  # pylint: disable=protected-access
+    return shm
+
+
+class TopOfBookWriter:
+    """
+    Owns the shared table and writes it from websocket events; one writer per table.
+
+    Usage:
+        writer = TopOfBookWriter("coinbase-top", ["BTC-USD", "ETH-USD"])
+        websocket_client.subscribe(["BTC-USD", "ETH-USD"], "ticker", callback=writer.on_ticker)
+
+    Args:
+    - name: Shared memory name readers attach to.
+    - product_ids: Products known upfront, more are added on their first event.
+    - capacity: Maximum number of products.
+    """
+
+    def __init__(self, name: str, product_ids: Iterable[str] = (), capacity: int = 1024) -> None:
+        size = _rows_offset(capacity) + capacity * _ROW_SIZE
+        self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        _created.add(self._shm.name)
+        self.name = self._shm.name
+        self.capacity = capacity
+
+        buf = self._shm.buf
+        buf[:_rows_offset(capacity)] = bytes(_rows_offset(capacity))
+        _HEADER.pack_into(buf, 0, _MAGIC, _VERSION, _ROW_SIZE, capacity, 0)
+
+        self._rows_offset = _rows_offset(capacity)
+        self._slots: Dict[str, int] = {}
+        self._values: List[list] = []
+        self._sequences: List[int] = []
+        # Callbacks of several subscriptions run on different threads, the seqlock needs a single writer.
+        self._lock = threading.Lock()
+
+        # Level2 books are kept to extract their best levels.
+        self._books = BookMetricsTracker(depth=1, callback=self._on_book_metrics)
+
+        with self._lock:
+            for product_id in product_ids:
+                self._slot(product_id)
+
+    def _slot(self, product_id: str) -> int:
+        slot = self._slots.get(product_id)
+        if slot is not None:
+            return slot
+
+        slot = len(self._slots)
+        if slot >= self.capacity:
+            raise ValueError(f"The table is full ({self.capacity} products).")
+
+        encoded = product_id.encode()
+        if len(encoded) > _PRODUCT_ID_SIZE:
+            raise ValueError(f"Product id too long: {product_id}.")
+
+        buf = self._shm.buf
+        entry = _HEADER_SIZE + slot * _PRODUCT_ID_SIZE
+        buf[entry:entry + _PRODUCT_ID_SIZE] = encoded.ljust(_PRODUCT_ID_SIZE, b'\0')
+        self._values.append([math.nan] * 7 + [0, 0.0])
+        self._sequences.append(0)
+        self._write(slot)
+        # Published last, readers only look up entries below the count.
+        struct.pack_into('<I', buf, _COUNT_OFFSET, slot + 1)
+
+        self._slots[product_id] = slot
+        return slot
+
+    def _write(self, slot: int) -> None:
+        buf = self._shm.buf
+        offset = self._rows_offset + slot * _ROW_SIZE
+        values = self._values[slot]
+        values[8] = time.time()
+
+        sequence = self._sequences[slot]
+        _SEQUENCE.pack_into(buf, offset, sequence + 1)
+        _ROW.pack_into(buf, offset + _SEQUENCE.size, *values)
+        _SEQUENCE.pack_into(buf, offset, sequence + 2)
+        self._sequences[slot] = sequence + 2
+
+    def update(self, product_id: str, best_bid: Optional[float] = None, bid_size: Optional[float] = None,
+               best_ask: Optional[float] = None, ask_size: Optional[float] = None,
+               last_price: Optional[float] = None, last_size: Optional[float] = None,
+               last_trade_time: Optional[float] = None, sequence_num: Optional[int] = None) -> None:
+        """
+        Writes the given fields of a product row, the others keep their value.
+        """
+
+        with self._lock:
+            slot = self._slot(product_id)
+            values = self._values[slot]
+            for index, value in enumerate((best_bid, bid_size, best_ask, ask_size, last_price, last_size,
+                                           last_trade_time, sequence_num)):
+                if value is not None:
+                    values[index] = value
+            self._write(slot)
+
+    def on_ticker(self, event: 'TickerEvent') -> None:
+        """
+        Websocket callback for the `ticker` and `ticker_batch` channels.
+        """
+
+        for ticker in event.tickers:
+            self.update(ticker.product_id,
+                        best_bid=_float(ticker.best_bid), bid_size=_float(ticker.best_bid_quantity),
+                        best_ask=_float(ticker.best_ask), ask_size=_float(ticker.best_ask_quantity),
+                        last_price=_float(ticker.price), sequence_num=event.sequence_num)
+
+    def on_level2(self, event: 'Level2Event') -> None:
+        """
+        Websocket callback for the `l2_data` channel.
+        """
+
+        self._books.on_level2(event)
+
+    def on_market_trades(self, event: 'MarketTradesEvent') -> None:
+        """
+        Websocket callback for the `market_trades` channel.
+        """
+
+        # Trades of a message are not ordered, keep the latest one of each product.
+        # The fractional digits of the timestamps vary, compare them parsed.
+        latest = {}
+        for trade in event.trades:
+            trade_time = parse_timestamp(trade.time)
+            current = latest.get(trade.product_id)
+            if current is None or trade_time > current[0]:
+                latest[trade.product_id] = (trade_time, trade)
+
+        for trade_time, trade in latest.values():
+            self.update(trade.product_id, last_price=float(trade.price), last_size=float(trade.size),
+                        last_trade_time=trade_time, sequence_num=event.sequence_num)
+
+    def _on_book_metrics(self, metrics: BookMetrics) -> None:
+        nan = math.nan
+        self.update(metrics.product_id,
+                    best_bid=metrics.best_bid if metrics.best_bid is not None else nan,
+                    bid_size=metrics.best_bid_size if metrics.best_bid_size is not None else nan,
+                    best_ask=metrics.best_ask if metrics.best_ask is not None else nan,
+                    ask_size=metrics.best_ask_size if metrics.best_ask_size is not None else nan,
+                    sequence_num=metrics.sequence_num)
+
+    def close(self) -> None:
+        """
+        Frees the table, readers still attached keep their mapping.
+        """
+
+        self._shm.close()
+        self._shm.unlink()
+        _created.discard(self.name)
+
+
+class TopOfBookReader:
+    """
+    Lock-free reader of a table written by a `TopOfBookWriter`, possibly in another process.
+
+    Args:
+    - name: Shared memory name given to the writer.
+    - timeout: Seconds to keep retrying a row the writer keeps updating before giving up.
+    """
+
+    def __init__(self, name: str, timeout: float = 1.0) -> None:
+        self._shm = _attach(name)
+        self._buf = self._shm.buf
+        magic, version, row_size, capacity, _ = _HEADER.unpack_from(self._buf, 0)
+        if magic != _MAGIC or version != _VERSION or row_size != _ROW_SIZE:
+            self._shm.close()
+            raise ValueError(f"{name} is not a top of book table.")
+
+        self._rows_offset = _rows_offset(capacity)
+        self._timeout = timeout
+        self._slots: Dict[str, int] = {}
+
+    def product_ids(self) -> List[str]:
+        """
+        Products currently in the table.
+        """
+
+        self._refresh()
+        return list(self._slots)
+
+    def _refresh(self) -> None:
+        count = struct.unpack_from('<I', self._buf, _COUNT_OFFSET)[0]
+        for slot in range(len(self._slots), count):
+            entry = _HEADER_SIZE + slot * _PRODUCT_ID_SIZE
+            product_id = bytes(self._buf[entry:entry + _PRODUCT_ID_SIZE]).rstrip(b'\0').decode()
+            self._slots[product_id] = slot
+
+    def get(self, product_id: str) -> Optional[TopOfBook]:
+        """
+        Consistent copy of the row of `product_id`, `None` if the writer does not know it.
+        """
+
+        slot = self._slots.get(product_id)
+        if slot is None:
+            self._refresh()
+            slot = self._slots.get(product_id)
+            if slot is None:
+                return None
+
+        buf = self._buf
+        offset = self._rows_offset + slot * _ROW_SIZE
+        attempts = 0
+        deadline = None
+        while True:
+            before = _SEQUENCE.unpack_from(buf, offset)[0]
+            if not before & 1:
+                values = _ROW.unpack_from(buf, offset + _SEQUENCE.size)
+                if _SEQUENCE.unpack_from(buf, offset)[0] == before:
+                    return TopOfBook(product_id, values)
+
+            attempts += 1
+            if attempts >= _SPINS:
+                # The writer may have been preempted mid-update, let it run.
+                deadline = deadline or time.monotonic() + self._timeout
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Could not read a consistent row for {product_id}.")
+                time.sleep(0)
+
+    def get_all(self) -> Dict[str, TopOfBook]:
+        """
+        Consistent copies of every row, each row read independently.
+        """
+
+        return {product_id: self.get(product_id) for product_id in self.product_ids()}
+
+    def close(self) -> None:
+        """
+        Detaches from the table.
+        """
+
+        self._buf = None
+        self._shm.close()
+
+
+def _float(value: Optional[str]) -> Optional[float]:
+    return float(value) if value not in (None, '') else None
@@ -0,0 +1,157 @@
+"""
+Single producer, single consumer ring buffer of byte records in shared memory.
+"""
+
+import struct
+from multiprocessing import shared_memory
+from typing import List, Optional
+
+# Header, the producer and consumer fields live on separate cache lines.
+_HEADER_SIZE = 128
+_WRITE_OFFSET = 0
+_CAPACITY_OFFSET = 8
+# Producer owned counters, see `SharedRing.counter`.
+_COUNTERS_OFFSET = 16
+COUNTERS = 5
+_READ_OFFSET = 64
+
+_INDEX = struct.Struct('<Q')
+_COUNTER = struct.Struct('<d')
+_LENGTH = struct.Struct('<I')
+# Record length marking that the rest of the buffer is unused and records continue at its start.
+_WRAP = 0xFFFFFFFF
+_ALIGNMENT = 8
+
+
+def _aligned(size: int) -> int:
+    return (size + _ALIGNMENT - 1) & ~(_ALIGNMENT - 1)
+
+
+class SharedRing:
+    """
+    Ring buffer of variable size records shared by two processes without locks.
+
+    Exactly one process may `put` and one process may `get`. Each side only writes its
+    own index (write index for the producer, read index for the consumer), an index is
+    published after the bytes it covers. Records are length prefixed and 8 bytes aligned;
+    a record never wraps, the tail of the buffer is skipped instead.
+
+    Args:
+    - name: Shared memory block name, required to attach to an existing ring.
+    - capacity: Data size in bytes when creating the ring.
+    - create: Whether to create the block or attach to an existing one.
+    """
+
+    def __init__(self, name: Optional[str] = None, capacity: int = 1 << 22, create: bool = True) -> None:
+        if create:
+            capacity = _aligned(capacity)
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=_HEADER_SIZE + capacity)
+            self._shm.buf[:_HEADER_SIZE] = bytes(_HEADER_SIZE)
+            _INDEX.pack_into(self._shm.buf, _CAPACITY_OFFSET, capacity)
+        else:
+            # Meant to be attached by child processes, which share the creator's resource
+            # tracker, so the block is only freed by the creator.
+            self._shm = shared_memory.SharedMemory(name=name)
+
+        self._owner = create
+        self._buf = self._shm.buf
+        self.name = self._shm.name
+        self.capacity = _INDEX.unpack_from(self._buf, _CAPACITY_OFFSET)[0]
+
+    def _index(self, offset: int) -> int:
+        return _INDEX.unpack_from(self._buf, offset)[0]
+
+    @property
+    def used(self) -> int:
+        """
+        Bytes currently held by unread records, approximate while the other side is active.
+        """
+
+        return self._index(_WRITE_OFFSET) - self._index(_READ_OFFSET)
+
+    def put(self, payload: bytes) -> bool:
+        """
+        Appends a record, returns `False` without writing it when the ring is full.
+        """
+
+        size = _aligned(_LENGTH.size + len(payload))
+        if size > self.capacity:
+            raise ValueError(f"Record of {len(payload)} bytes does not fit in the ring.")
+
+        write = self._index(_WRITE_OFFSET)
+        position = write % self.capacity
+        tail = self.capacity - position
+        needed = size + (tail if size > tail else 0)
+        if needed > self.capacity - (write - self._index(_READ_OFFSET)):
+            return False
+
+        buf = self._buf
+        if size > tail:
+            _LENGTH.pack_into(buf, _HEADER_SIZE + position, _WRAP)
+            write += tail
+            position = 0
+
+        start = _HEADER_SIZE + position
+        _LENGTH.pack_into(buf, start, len(payload))
+        buf[start + _LENGTH.size:start + _LENGTH.size + len(payload)] = payload
+
+        _INDEX.pack_into(buf, _WRITE_OFFSET, write + size)
+        return True
+
+    def get_many(self, max_records: int = 1024) -> List[bytes]:
+        """
+        Removes and returns up to `max_records` records, oldest first.
+        """
+
+        buf = self._buf
+        read = self._index(_READ_OFFSET)
+        write = self._index(_WRITE_OFFSET)
+
+        records = []
+        while read < write and len(records) < max_records:
+            position = read % self.capacity
+            length = _LENGTH.unpack_from(buf, _HEADER_SIZE + position)[0]
+            if length == _WRAP:
+                read += self.capacity - position
+                continue
+
+            start = _HEADER_SIZE + position + _LENGTH.size
+            records.append(bytes(buf[start:start + length]))
+            read += _aligned(_LENGTH.size + length)
+
+        if records or read != self._index(_READ_OFFSET):
+            _INDEX.pack_into(buf, _READ_OFFSET, read)
+        return records
+
+    def get(self) -> Optional[bytes]:
+        """
+        Removes and returns the oldest record, `None` when the ring is empty.
+        """
+
+        records = self.get_many(1)
+        return records[0] if records else None
+
+    def counter(self, index: int) -> float:
+        """
+        Producer owned counter `index`, between 0 and `COUNTERS - 1`.
+        """
+
+        return _COUNTER.unpack_from(self._buf, _COUNTERS_OFFSET + index * _COUNTER.size)[0]
+
+    def set_counter(self, index: int, value: float) -> None:
+        """
+        Sets a producer owned counter, only the producer may call it.
+        """
+
+        _COUNTER.pack_into(self._buf, _COUNTERS_OFFSET + index * _COUNTER.size, value)
+
+    def close(self) -> None:
+        """
+        Detaches from the ring, the creator also frees it.
+        """
+
+        self._buf = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
@@ -0,0 +1,129 @@
+"""
+Incremental parsing of JSON responses made of one large array and a few scalar fields.
+"""
+
+import codecs
+import json
+from typing import Any, Dict, Iterable, Iterator
+
+_WHITESPACE = ' \t\n\r'
+
+# Parsed text kept in memory is trimmed once this many characters have been consumed.
+_TRIM_SIZE = 1 << 16
+
+
+class _Reader:
+    # Text buffer refilled from byte chunks, decoding one JSON value at a time.
+
+    __slots__ = ('_chunks', '_decoder', '_raw_decode', 'text', 'position', 'eof')
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._raw_decode = json.JSONDecoder().raw_decode
+        self.text = ''
+        self.position = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+
+        if self.position >= _TRIM_SIZE:
+            self.text = self.text[self.position:]
+            self.position = 0
+
+        for chunk in self._chunks:
+            if chunk:
+                self.text += self._decoder.decode(chunk)
+                return True
+        self.text += self._decoder.decode(b'', final=True)
+        self.eof = True
+        return True
+
+    def peek(self) -> str:
+        """
+        Next non whitespace character, consuming the whitespace, `''` at the end.
+        """
+
+        while True:
+            text, position = self.text, self.position
+            while position < len(text) and text[position] in _WHITESPACE:
+                position += 1
+            self.position = position
+            if position < len(text):
+                return text[position]
+            if not self._fill():
+                return ''
+
+    def expect(self, character: str) -> None:
+        """
+        Consumes `character`, the next non whitespace one.
+        """
+
+        found = self.peek()
+        if found != character:
+            raise ValueError(f"Expected {character!r} at {self.position}, found {found!r}.")
+        self.position += 1
+
+    def value(self) -> Any:
+        """
+        Decodes the next JSON value.
+        """
+
+        self.peek()
+        while True:
+            try:
+                value, end = self._raw_decode(self.text, self.position)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+
+            # A number or literal ending the buffer may continue in the next chunk.
+            if end == len(self.text) and not self.eof and self._fill():
+                continue
+
+            self.position = end
+            return value
+
+
+def iter_json_array(chunks: Iterable[bytes], key: str, fields: Dict[str, Any]) -> Iterator[Any]:
+    """
+    Yields the items of the array `key` of a JSON object as they are received.
+
+    The other members of the object are stored into `fields` as they are parsed, members
+    sent after the array are only available once the iteration completes.
+
+    Args:
+    - chunks: The response body, e.g. `response.iter_content(65536)`.
+    - key: Name of the array member.
+    - fields: Dictionary receiving the other members.
+    """
+
+    reader = _Reader(chunks)
+    reader.expect('{')
+    if reader.peek() == '}':
+        return
+
+    while True:
+        name = reader.value()
+        reader.expect(':')
+
+        if name == key and reader.peek() == '[':
+            reader.expect('[')
+            if reader.peek() == ']':
+                reader.position += 1
+            else:
+                while True:
+                    yield reader.value()
+                    if reader.peek() == ']':
+                        reader.position += 1
+                        break
+                    reader.expect(',')
+        else:
+            fields[name] = reader.value()
+
+        if reader.peek() == '}':
+            return
+        reader.expect(',')
@@ -0,0 +1,267 @@
+"""
+HTTP transports the REST client sends its requests through.
+
+A transport turns a signed request into a response exposing the subset of
+`requests.Response` the models read (`ok`, `status_code`, `text`, `json()` and, for
+streamed requests, `iter_content()` and `close()`). Transport errors are raised as
+`requests.ConnectionError` or `requests.Timeout` so the client retry logic does not
+depend on the transport used.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import urlsplit
+
+
+class Transport:
+    """
+    Base class of the transports.
+    """
+
+    def send(self, method: str, url: str, headers: Optional[dict] = None, json_payload: Optional[dict] = None,
+             data: Optional[str] = None, timeout: Optional[float] = None, stream: bool = False):
+        """
+        Sends one request and returns its response.
+
+        Args:
+        - method: HTTP method.
+        - url: Absolute URL, query string included.
+        - headers: Request headers, authentication included.
+        - json_payload: Decoded `data`, for transports inspecting the body. Not sent.
+        - data: JSON body, sent byte for byte: the legacy authentication signs it.
+        - timeout: Timeout in seconds.
+        - stream: Leave the body unread, see `StreamedPage`.
+        """
+
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """
+        Releases the connections held by the transport.
+        """
+
+
+def _requests_kwargs(headers, data, timeout, stream) -> dict:
+    kwargs = {'headers': headers, 'timeout': timeout}
+    if stream:
+        kwargs['stream'] = True
+    if data is not None:
+        kwargs['data'] = data
+    return kwargs
+
+
+class RequestsTransport(Transport):
+    """
+    Sends every request with the module level `requests` functions, a new connection each time.
+
+    This is the default transport. `requests.<method>` is resolved on every call so it
+    can be patched, e.g. `mock.patch("coinbaseadvanced.client.requests.get")`.
+    """
+
+    def send(self, method: str, url: str, headers: Optional[dict] = None, json_payload: Optional[dict] = None,
+             data: Optional[str] = None, timeout: Optional[float] = None, stream: bool = False):
+        import requests
+
+        return getattr(requests, method.lower())(url, **_requests_kwargs(headers, data, timeout, stream))
+
+
+class PooledTransport(Transport):
+    """
+    Sends requests through a `requests.Session`, reusing kept-alive connections.
+
+    Saves the TCP and TLS handshakes of every request after the first ones to a host.
+
+    Args:
+    - pool_size: Connections kept open per host, at least the number of threads
+                 sending requests concurrently, e.g. the client `max_workers`.
+    - verify: TLS verification, see `requests`; a CA bundle path to trust a test server.
+    """
+
+    def __init__(self, pool_size: int = 8, verify=True) -> None:
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self._session = requests.Session()
+        # Passed with every request, a session level `verify` loses against `REQUESTS_CA_BUNDLE`.
+        self._verify = verify
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+
+    def send(self, method: str, url: str, headers: Optional[dict] = None, json_payload: Optional[dict] = None,
+             data: Optional[str] = None, timeout: Optional[float] = None, stream: bool = False):
+        return self._session.request(method, url, verify=self._verify,
+                                     **_requests_kwargs(headers, data, timeout, stream))
+
+    def close(self) -> None:
+        self._session.close()
+
+
+class RecordedResponse:
+    """
+    Response replayed from a recording.
+
+    Attributes:
+        status_code (int): HTTP status code.
+        headers (dict): Recorded response headers.
+        text (str): Body.
+    """
+
+    __slots__ = ('status_code', 'headers', 'text')
+
+    def __init__(self, status_code: int, text: str, headers: Optional[dict] = None) -> None:
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    @property
+    def ok(self) -> bool:
+        """
+        Whether the status code is below 400, like `requests.Response.ok`.
+        """
+
+        return self.status_code < 400
+
+    def json(self):
+        """
+        Decoded JSON body.
+        """
+
+        return json.loads(self.text)
+
+    def iter_content(self, chunk_size: Optional[int] = None) -> Iterator[bytes]:
+        """
+        Body chunks, like `requests.Response.iter_content`.
+        """
+
+        body = self.text.encode('utf-8')
+        chunk_size = chunk_size or len(body) or 1
+        return (body[start:start + chunk_size] for start in range(0, len(body), chunk_size))
+
+    def close(self) -> None:
+        """
+        Nothing to release, for compatibility with streamed responses.
+        """
+
+    def __repr__(self):
+        return f"RecordedResponse(status_code={self.status_code})"
+
+
+def recording_key(method: str, url: str) -> str:
+    """
+    Name of the recording file of a request: method, path and query, the host is ignored
+    so recordings replay against any base URL.
+    """
+
+    parts = urlsplit(url)
+    target = parts.path + ('?' + parts.query if parts.query else '')
+    return f"{method.upper()} {target}"
+
+
+def _recording_path(directory: str, key: str) -> str:
+    return os.path.join(directory, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.json')
+
+
+class RecordingTransport(Transport):
+    """
+    Sends requests through another transport and saves their responses for `ReplayTransport`.
+
+    Every request is recorded as `<directory>/<sha1 of recording_key>.json`, holding the
+    responses of that request in the order they were received. Authentication headers
+    are not recorded.
+
+    Usage:
+        client = CoinbaseAdvancedTradeAPIClient(..., transport=RecordingTransport("recordings"))
+
+    Args:
+    - directory: Directory receiving the recordings, created if missing.
+    - transport: Transport actually sending the requests, `RequestsTransport` by default.
+    """
+
+    def __init__(self, directory: str, transport: Optional[Transport] = None) -> None:
+        self.directory = directory
+        self._transport = transport or RequestsTransport()
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def send(self, method: str, url: str, headers: Optional[dict] = None, json_payload: Optional[dict] = None,
+             data: Optional[str] = None, timeout: Optional[float] = None, stream: bool = False):
+        # Recorded bodies are read whole, streaming applies to the replay.
+        response = self._transport.send(method, url, headers, json_payload, data, timeout)
+
+        key = recording_key(method, url)
+        path = _recording_path(self.directory, key)
+        entry = {'status_code': response.status_code, 'text': response.text,
+                 'headers': {'content-type': response.headers.get('content-type', '')}}
+
+        with self._lock:
+            recording = {'request': key, 'responses': []}
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as file:
+                    recording = json.load(file)
+            recording['responses'].append(entry)
+
+            temporary = path + '.tmp'
+            with open(temporary, 'w', encoding='utf-8') as file:
+                json.dump(recording, file, indent=1)
+            os.replace(temporary, path)
+
+        return RecordedResponse(entry['status_code'], entry['text'], entry['headers'])
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class ReplayTransport(Transport):
+    """
+    Serves responses recorded by `RecordingTransport`, without any network access.
+
+    Each request gets the recorded responses of the same method, path and query in
+    order; once they are exhausted the last one is served again. Recordings are loaded
+    once, so replays cost no disk access after the first request of each kind.
+
+    Usage:
+        client = CoinbaseAdvancedTradeAPIClient(..., transport=ReplayTransport("recordings"))
+
+    Args:
+    - directory: Directory holding the recordings.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self._recordings: Dict[str, List[RecordedResponse]] = {}
+        self._positions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _responses(self, key: str) -> List[RecordedResponse]:
+        responses = self._recordings.get(key)
+        if responses is None:
+            path = _recording_path(self.directory, key)
+            if not os.path.exists(path):
+                raise LookupError(f"No recorded response for {key}.")
+            with open(path, 'r', encoding='utf-8') as file:
+                recording = json.load(file)
+            responses = [RecordedResponse(entry['status_code'], entry['text'], entry.get('headers'))
+                         for entry in recording['responses']]
+            self._recordings[key] = responses
+        return responses
+
+    def send(self, method: str, url: str, headers: Optional[dict] = None, json_payload: Optional[dict] = None,
+             data: Optional[str] = None, timeout: Optional[float] = None, stream: bool = False):
+        key = recording_key(method, url)
+        with self._lock:
+            responses = self._responses(key)
+            position = self._positions.get(key, 0)
+            self._positions[key] = min(position + 1, len(responses) - 1)
+        return responses[position]
+
+    def rewind(self) -> None:
+        """
+        Starts serving every recording from its first response again.
+        """
+
+        with self._lock:
+            self._positions.clear()
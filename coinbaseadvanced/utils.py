@@ -1,8 +1,10 @@
+import calendar
 import time
 import hashlib
 import os
-import jwt
-from cryptography.hazmat.primitives import serialization
+
+# Whole-second prefix and epoch of the last timestamp parsed, see `parse_timestamp`.
+_last_second = ('', 0)
 
 
 def generate_jwt(api_key: str, signing_key: str) -> str:
@@ -14,6 +16,10 @@ def generate_jwt(api_key: str, signing_key: str) -> str:
     :return: A JWT token as a string.
     :raises ValueError: If there is an issue with loading the private key or encoding the JWT.
     """
+    # Imported here so that importing this module does not load the crypto backends.
+    from cryptography.hazmat.primitives import serialization
+    import jwt
+
     # Load the private key from the signing key string
     try:
         private_key_bytes = signing_key.encode('utf-8')
@@ -42,3 +48,39 @@ def generate_jwt(api_key: str, signing_key: str) -> str:
         raise ValueError(f"Failed to encode JWT: {e}")
 
     return token
+
+
+def parse_timestamp(value: str) -> float:
+    """
+    Converts an RFC 3339 timestamp, e.g. `2023-02-09T20:33:57.609931463Z` or
+    `2023-02-09T21:33:57.6+01:00`, into unix seconds.
+
+    Websocket messages carry many timestamps within the same second, the whole-second
+    part is only parsed when it changes so the common case is a float conversion.
+
+    :param value: The timestamp, with any amount of fractional digits.
+    :return: Seconds since the unix epoch.
+    :raises ValueError: If the timestamp has no `Z` or `+HH:MM` / `-HH:MM` offset.
+    """
+    global _last_second  # pylint: disable=global-statement
+
+    prefix = value[:19]
+    second = _last_second
+    if second[0] != prefix:
+        second = (prefix, calendar.timegm((int(value[0:4]), int(value[5:7]), int(value[8:10]),
+                                           int(value[11:13]), int(value[14:16]), int(value[17:19]))))
+        _last_second = second
+
+    suffix = value[19:]
+    if suffix[-1:] in ('Z', 'z'):
+        fraction, offset = suffix[:-1], 0
+    elif len(suffix) >= 6 and suffix[-6] in '+-' and suffix[-3] == ':':
+        fraction = suffix[:-6]
+        offset = int(suffix[-5:-3]) * 3600 + int(suffix[-2:]) * 60
+        if suffix[-6] == '-':
+            offset = -offset
+    else:
+        raise ValueError(f"Timestamp without a UTC offset: {value!r}")
+
+    epoch = second[1] - offset
+    return epoch + float(fraction) if fraction else float(epoch)
@@ -30,6 +30,10 @@ setup(
     author_email='kmiloc89@gmail.com',
     keywords=['api', 'coinbase', 'bitcoin', 'client', 'crypto'],
     install_requires=[req for req in requirements],
+    extras_require={
+        'numpy': ['numpy>=1.20'],
+        'http2': ['httpx[http2]>=0.23'],
+    },
     classifiers=[
         "Development Status :: 5 - Production/Stable",
         "Intended Audience :: Developers",
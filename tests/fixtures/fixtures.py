@@ -17,6 +17,10 @@ def _fixtured_mock_response(
     mock_resp.ok = ok
     mock_resp.text = text
     mock_resp.json.return_value = json.loads(text)
+    # body of `stream=True` requests
+    body = text.encode('utf-8')
+    mock_resp.iter_content.side_effect = lambda chunk_size=1: (
+        body[start:start + chunk_size] for start in range(0, len(body), chunk_size))
 
     return mock_resp
 
@@ -133,6 +137,17 @@ def fixture_cancel_orders_success_response() -> mock.Mock:
             text=content)
 
 
+def fixture_cancel_orders_success_response_for(order_ids: list) -> mock.Mock:
+    results = [{
+        "success": True,
+        "failure_reason": "UNKNOWN_CANCEL_FAILURE_REASON",
+        "order_id": order_id
+    } for order_id in order_ids]
+    return _fixtured_mock_response(
+        ok=True,
+        text=json.dumps({"results": results}))
+
+
 def fixture_list_orders_success_response() -> mock.Mock:
     with open('tests/fixtures/list_orders_success_response.json', 'r', encoding="utf-8") as file:
         content = file.read()
@@ -141,6 +156,22 @@ def fixture_list_orders_success_response() -> mock.Mock:
             text=content)
 
 
+def fixture_list_open_orders_success_response_for(orders: list) -> mock.Mock:
+    """
+    `list_orders` page of open `(order_id, product_id)` orders, built out of the first order of the success fixture.
+    """
+    with open('tests/fixtures/list_orders_success_response.json', 'r', encoding="utf-8") as file:
+        template = json.load(file)['orders'][0]
+    return _fixtured_mock_response(
+        ok=True,
+        text=json.dumps({
+            'orders': [dict(template, order_id=order_id, product_id=product_id, status='OPEN')
+                       for order_id, product_id in orders],
+            'sequence': '0',
+            'has_next': False,
+            'cursor': ''}))
+
+
 def fixture_list_orders_all_call_1_success_response() -> mock.Mock:
     with open('tests/fixtures/list_orders_all_call_1_success_response.json', 'r', encoding="utf-8") as file:
         content = file.read()
@@ -205,6 +236,18 @@ def fixture_list_products_success_response() -> mock.Mock:
             text=content)
 
 
+def fixture_list_products_range_response(product_ids: list, num_products: int) -> mock.Mock:
+    """
+    `list_products` page of `product_ids`, built out of the first product of the success fixture.
+    """
+    with open('tests/fixtures/list_products_success_response.json', 'r', encoding="utf-8") as file:
+        template = json.load(file)['products'][0]
+    products = [dict(template, product_id=product_id) for product_id in product_ids]
+    return _fixtured_mock_response(
+        ok=True,
+        text=json.dumps({'products': products, 'num_products': num_products}))
+
+
 def fixture_get_product_success_response() -> mock.Mock:
     with open('tests/fixtures/get_product_success_response.json', 'r', encoding="utf-8") as file:
         content = file.read()
@@ -331,3 +374,15 @@ def fixture_move_funds_success_response() -> mock.Mock:
         return _fixtured_mock_response(
             ok=True,
             text=content)
+
+
+def fixture_list_portfolios_success_response_for(portfolios: list) -> mock.Mock:
+    return _fixtured_mock_response(
+        ok=True,
+        text=json.dumps({'portfolios': portfolios}))
+
+
+def fixture_get_portfolio_breakdown_success_response_for(result: dict) -> mock.Mock:
+    return _fixtured_mock_response(
+        ok=True,
+        text=json.dumps(result))
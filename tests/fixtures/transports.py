@@ -0,0 +1,48 @@
+import os
+import threading
+from typing import Callable
+
+from coinbaseadvanced.transports import RecordedResponse, Transport
+
+
+def read_fixture(name: str) -> str:
+    """
+    Content of the fixture file `name`.
+    """
+
+    with open(os.path.join('tests', 'fixtures', name), 'r', encoding="utf-8") as file:
+        return file.read()
+
+
+def in_order(*names: str) -> Callable[[str, str], str]:
+    """
+    `FixtureTransport` responder serving the fixtures `names` in order, the last one once exhausted.
+    """
+
+    remaining = list(names)
+
+    def respond(method: str, url: str) -> str:
+        return remaining.pop(0) if len(remaining) > 1 else remaining[0]
+
+    return respond
+
+
+class FixtureTransport(Transport):
+    """
+    Stands in for the network, answering every request with a fixture file.
+
+    `respond(method, url)` returns the fixture name of a request; it may sleep to delay
+    the response or raise `requests.Timeout` and the like to fail it. Requests are
+    recorded in `requests` as `(method, url, headers)`.
+    """
+
+    def __init__(self, respond: Callable[[str, str], str]) -> None:
+        self.respond = respond
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def send(self, method, url, headers=None, json_payload=None, data=None, timeout=None, stream=False):
+        with self._lock:
+            self.requests.append((method, url, headers))
+        name = self.respond(method, url)
+        return RecordedResponse(200, read_fixture(name), {'content-type': 'application/json'})
@@ -0,0 +1,78 @@
+"""
+BarBuilder unit tests.
+"""
+
+import unittest
+
+from coinbaseadvanced.bars import BarBuilder
+from coinbaseadvanced.models.market_data import MarketTradesEvent
+from coinbaseadvanced.utils import parse_timestamp
+
+
+def _trades_event(trades: list, event_type: str = 'update') -> MarketTradesEvent:
+    return MarketTradesEvent(channel='market_trades', client_id='', timestamp='2023-02-09T20:19:35.39625135Z',
+                             sequence_num=0, events=[{'type': event_type, 'trades': [
+                                 {'trade_id': str(i), 'product_id': 'BTC-USD', 'price': price, 'size': size,
+                                  'side': 'BUY', 'time': time} for i, (time, price, size) in enumerate(trades)]}])
+
+
+class TestBarBuilder(unittest.TestCase):
+    """
+    Unit tests for BarBuilder.
+    """
+
+    def setUp(self):
+        self.bars = []
+        self.builder = BarBuilder(intervals=(1, 10), callback=self.bars.append)
+
+    def test_parse_timestamp(self):
+        self.assertAlmostEqual(parse_timestamp('2023-02-09T20:33:57.609931463Z'), 1675974837.609931463, places=6)
+        self.assertEqual(parse_timestamp('2023-02-09T20:33:58Z'), 1675974838.0)
+        self.assertEqual(parse_timestamp('1970-01-01T00:00:01.5Z'), 1.5)
+        self.assertEqual(parse_timestamp('2023-02-09T20:33:58+00:00'), 1675974838.0)
+        self.assertAlmostEqual(parse_timestamp('2023-02-09T22:33:57.25+02:00'), 1675974837.25, places=6)
+        self.assertEqual(parse_timestamp('2023-02-09T15:03:58-05:30'), 1675974838.0)
+        self.assertRaises(ValueError, parse_timestamp, '2023-02-09T20:33:58')
+
+    def test_market_trades_event_positional_trades(self):
+        event = MarketTradesEvent('market_trades', '', '2023-02-09T20:19:35.39625135Z', 0, [
+            {'trade_id': '1', 'product_id': 'BTC-USD', 'price': '100', 'size': '1', 'side': 'BUY',
+             'time': '2023-02-09T20:33:57.100Z'}])
+        self.assertEqual([trade.trade_id for trade in event.trades], ['1'])
+        self.assertFalse(event.is_snapshot)
+
+    def test_bars_close_on_next_interval(self):
+        # Newest first within the message.
+        self.builder.on_market_trades(_trades_event([
+            ('2023-02-09T20:33:57.900Z', '102', '1'),
+            ('2023-02-09T20:33:57.100Z', '100', '2'),
+            ('2023-02-09T20:33:57.500Z', '99', '1'),
+        ]))
+        self.assertEqual(self.bars, [])
+
+        self.builder.on_market_trades(_trades_event([('2023-02-09T20:33:58.000Z', '103', '1')]))
+
+        self.assertEqual(len(self.bars), 1)
+        bar = self.bars[0]
+        self.assertEqual((bar.interval, bar.start), (1, 1675974837))
+        self.assertEqual((bar.open, bar.high, bar.low, bar.close), (100, 102, 99, 102))
+        self.assertEqual((bar.volume, bar.trades), (4, 3))
+        self.assertEqual(bar.vwap, 100.25)
+
+        current = self.builder.current('BTC-USD', 10)
+        self.assertEqual((current.start, current.trades, current.close), (1675974830, 4, 103))
+
+    def test_flush_and_late_trades(self):
+        self.builder.add_trade('BTC-USD', 100, 1, 1000.5)
+
+        closed = self.builder.flush(now=1001)
+        self.assertEqual([(bar.interval, bar.start) for bar in closed], [(1, 1000)])
+
+        self.builder.add_trade('BTC-USD', 101, 1, 1000.7)
+        self.assertEqual(self.builder.late_trades, 1)
+        self.assertEqual(self.builder.current('BTC-USD', 10).trades, 2)
+
+    def test_snapshot_is_skipped(self):
+        self.builder.on_market_trades(_trades_event([('2023-02-09T20:33:57.900Z', '102', '1')], 'snapshot'))
+
+        self.assertIsNone(self.builder.current('BTC-USD', 1))
@@ -0,0 +1,69 @@
+"""
+BookMetricsTracker unit tests.
+"""
+
+import unittest
+
+from coinbaseadvanced.book_metrics import BookMetricsTracker
+from coinbaseadvanced.models.market_data import Level2Event
+
+
+def _level2_event(event_type: str, updates: list, sequence_num: int = 0) -> Level2Event:
+    return Level2Event(channel='l2_data', client_id='', timestamp='2023-02-09T20:32:50.714964855Z',
+                       sequence_num=sequence_num, events=[{'type': event_type, 'product_id': 'BTC-USD', 'updates': [
+                           {'side': side, 'event_time': '2023-02-09T20:32:50.714964855Z',
+                            'price_level': price, 'new_quantity': quantity} for side, price, quantity in updates]}])
+
+
+SNAPSHOT = [('bid', '99', '2'), ('bid', '100', '1'), ('bid', '98', '5'),
+            ('offer', '101', '3'), ('offer', '102', '1'), ('offer', '103', '4')]
+
+
+class TestBookMetricsTracker(unittest.TestCase):
+    """
+    Unit tests for BookMetricsTracker.
+    """
+
+    def setUp(self):
+        self.published = []
+        self.tracker = BookMetricsTracker(depth=2, callback=self.published.append)
+        self.tracker.on_level2(_level2_event('snapshot', SNAPSHOT))
+
+    def test_snapshot_metrics(self):
+        metrics = self.tracker.metrics('BTC-USD')
+
+        self.assertEqual((metrics.best_bid, metrics.best_bid_size), (100, 1))
+        self.assertEqual((metrics.best_ask, metrics.best_ask_size), (101, 3))
+        self.assertEqual(metrics.spread, 1)
+        self.assertEqual(metrics.mid, 100.5)
+        self.assertEqual(metrics.microprice, (100 * 3 + 101 * 1) / 4)
+        self.assertEqual((metrics.bid_depth, metrics.ask_depth), (3, 4))
+        self.assertEqual(metrics.imbalance, -1 / 7)
+        bid_vwap, ask_vwap = (100 + 99 * 2) / 3, (101 * 3 + 102) / 4
+        self.assertAlmostEqual(metrics.depth_weighted_price, (bid_vwap * 4 + ask_vwap * 3) / 7)
+        self.assertEqual(len(self.published), 1)
+
+    def test_updates_and_resync_are_consistent(self):
+        self.tracker.on_level2(_level2_event('update', [('bid', '100', '0'), ('offer', '100.5', '2'),
+                                                        ('bid', '97', '10')], 1))
+        updated = self.tracker.metrics('BTC-USD')
+
+        self.assertEqual((updated.best_bid, updated.best_ask), (99, 100.5))
+        self.assertEqual((updated.bid_depth, updated.ask_depth), (7, 5))
+
+        # Resync: a new snapshot of the same book gives the same metrics.
+        self.tracker.on_level2(_level2_event('snapshot', [('bid', '99', '2'), ('bid', '98', '5'), ('bid', '97', '10'),
+                                                          ('offer', '100.5', '2'), ('offer', '101', '3'),
+                                                          ('offer', '102', '1'), ('offer', '103', '4')], 2))
+        resynced = self.tracker.metrics('BTC-USD')
+
+        for name in ('best_bid', 'best_ask', 'spread', 'microprice', 'imbalance', 'depth_weighted_price'):
+            self.assertEqual(getattr(resynced, name), getattr(updated, name), name)
+
+    def test_empty_side(self):
+        self.tracker.on_level2(_level2_event('snapshot', [('bid', '99', '2')]))
+        metrics = self.tracker.metrics('BTC-USD')
+
+        self.assertIsNone(metrics.spread)
+        self.assertIsNone(metrics.depth_weighted_price)
+        self.assertEqual(metrics.imbalance, 1.0)
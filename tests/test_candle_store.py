@@ -0,0 +1,74 @@
+"""
+CandleStore unit tests.
+"""
+
+import os
+import tempfile
+import unittest
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+from coinbaseadvanced.models.market_data import CandlesEvent
+from coinbaseadvanced.models.products import CandlesPage, Granularity
+
+
+def _page(starts) -> CandlesPage:
+    return CandlesPage([{'start': str(start), 'low': '1', 'high': '3', 'open': '2', 'close': str(start),
+                         'volume': '10'} for start in starts])
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestCandleStore(unittest.TestCase):
+    """
+    Unit tests for CandleStore.
+    """
+
+    def setUp(self):
+        from coinbaseadvanced.candle_store import CandleStore
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = CandleStore(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_write_and_range(self):
+        self.assertEqual(self.store.write('BTC-USD', Granularity.ONE_MINUTE, _page([180, 0, 120, 60])), 4)
+
+        candles = self.store.range('BTC-USD', Granularity.ONE_MINUTE, 60, 180)
+        self.assertEqual(candles.start.tolist(), [60, 120])
+        self.assertEqual(candles.close.tolist(), [60.0, 120.0])
+        # Views on the mapped file, not copies.
+        self.assertIsInstance(candles.start.base, numpy.memmap)
+
+        self.assertEqual(len(self.store.range('BTC-USD', Granularity.ONE_MINUTE)), 4)
+        self.assertEqual(len(self.store.range('BTC-USD', Granularity.ONE_MINUTE, 1000)), 0)
+        self.assertEqual(len(self.store.range('ETH-USD', Granularity.ONE_MINUTE)), 0)
+
+    def test_appends_do_not_rewrite(self):
+        self.store.write('BTC-USD', Granularity.FIVE_MINUTE, _page([0, 300]))
+        path = self.store.path('BTC-USD', Granularity.FIVE_MINUTE)
+        inode = os.stat(path).st_ino
+
+        event = CandlesEvent(channel='candles', client_id='', timestamp='2023-06-09T20:19:35.39625135Z',
+                             sequence_num=0, events=[{'type': 'update', 'candles': [
+                                 {'start': '300', 'high': '9', 'low': '1', 'open': '2', 'close': '8',
+                                  'volume': '20', 'product_id': 'BTC-USD'},
+                                 {'start': '600', 'high': '9', 'low': '1', 'open': '2', 'close': '7',
+                                  'volume': '5', 'product_id': 'BTC-USD'}]}])
+        self.store.on_candles(event)
+
+        self.assertEqual(os.stat(path).st_ino, inode)
+        candles = self.store.range('BTC-USD', Granularity.FIVE_MINUTE)
+        self.assertEqual(candles.start.tolist(), [0, 300, 600])
+        self.assertEqual(candles.close.tolist(), [0.0, 8.0, 7.0])
+        self.assertEqual(self.store.last_start('BTC-USD', Granularity.FIVE_MINUTE), 600)
+
+    def test_backfill_merges(self):
+        self.store.write('BTC-USD', Granularity.ONE_HOUR, _page([7200, 10800]))
+
+        self.assertEqual(self.store.write('BTC-USD', Granularity.ONE_HOUR, _page([0, 3600, 7200])), 2)
+        self.assertEqual(self.store.range('BTC-USD', Granularity.ONE_HOUR).start.tolist(), [0, 3600, 7200, 10800])
@@ -0,0 +1,64 @@
+"""
+Candle resampling unit tests.
+"""
+
+import unittest
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+from coinbaseadvanced.models.products import CandlesPage, Granularity
+
+
+def _page(minutes: int, step: int = 60, first: int = 0) -> CandlesPage:
+    # Newest first, like the API returns them.
+    candles = [{'start': str(first + i * step), 'low': str(10 - i % 3), 'high': str(20 + i % 5),
+                'open': str(100 + i), 'close': str(200 + i), 'volume': '1.5'}
+               for i in reversed(range(minutes))]
+    return CandlesPage(candles)
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestResample(unittest.TestCase):
+    """
+    Unit tests for the candle resampler.
+    """
+
+    def test_resample_ohlcv_semantics(self):
+        from coinbaseadvanced.candles import resample
+
+        result = resample(_page(12), Granularity.FIVE_MINUTE, source=Granularity.ONE_MINUTE)
+
+        self.assertEqual(result.start.tolist(), [0, 300, 600])
+        self.assertEqual(result.open.tolist(), [100, 105, 110])
+        self.assertEqual(result.close.tolist(), [204, 209, 211])
+        self.assertEqual(result.high.tolist(), [24, 24, 21])
+        self.assertEqual(result.low.tolist(), [8, 8, 8])
+        self.assertEqual(result.volume.tolist(), [7.5, 7.5, 3.0])
+
+        page = result.to_page()
+        self.assertEqual([c.start for c in page], ['600', '300', '0'])
+        self.assertEqual(page.candles[0].close, '211.0')
+
+    def test_resample_alignment_and_gaps(self):
+        from coinbaseadvanced.candles import FOUR_HOUR, ONE_WEEK, WEEK_ORIGIN, resample
+
+        hourly = _page(10, step=3600, first=3 * 3600)
+        result = resample(hourly, FOUR_HOUR)
+        self.assertEqual(result.start.tolist(), [0, FOUR_HOUR, 2 * FOUR_HOUR, 3 * FOUR_HOUR])
+
+        daily = _page(14, step=86400)
+        weekly = resample(daily, ONE_WEEK, source=Granularity.ONE_DAY)
+        self.assertEqual(weekly.start.tolist(), [WEEK_ORIGIN - ONE_WEEK, WEEK_ORIGIN, WEEK_ORIGIN + ONE_WEEK])
+        self.assertEqual(weekly.volume.tolist(), [6.0, 10.5, 4.5])
+
+        sparse = CandlesPage([])
+        self.assertEqual(len(resample(sparse, Granularity.ONE_HOUR)), 0)
+
+    def test_resample_rejects_misaligned_source(self):
+        from coinbaseadvanced.candles import resample
+
+        with self.assertRaises(ValueError):
+            resample(_page(10), 90, source=Granularity.ONE_MINUTE)
@@ -0,0 +1,93 @@
+"""
+Circuit breakers unit tests.
+"""
+
+import time
+import unittest
+
+import requests
+
+from coinbaseadvanced.circuit_breaker import CircuitBreaker, CircuitState
+from coinbaseadvanced.client import CoinbaseAdvancedTradeAPIClient
+from coinbaseadvanced.instrumentation import CIRCUIT_EVENT, RequestEvent
+from coinbaseadvanced.models.error import CircuitOpenError, CoinbaseAdvancedTradeAPIError
+from tests.fixtures.transports import FixtureTransport
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """
+    Unit tests for CircuitBreaker.
+    """
+
+    def setUp(self):
+        # Requests to paths containing `failing` time out.
+        self.failing = '/orders/'
+
+    def _respond(self, method, url):
+        if self.failing and self.failing in url:
+            raise requests.Timeout("timed out")
+        return 'get_order_success_response.json' if '/orders/' in url else 'get_account_success_response.json'
+
+    def test_open_fail_fast_and_probe(self):
+        transport = FixtureTransport(self._respond)
+        client = CoinbaseAdvancedTradeAPIClient(
+            api_key='kjsldfk32234', secret_key='jlsjljsfd89y98y98shdfjksfd', transport=transport,
+            circuit_breaker=CircuitBreaker(window=4, min_calls=2, open_seconds=0.1))
+        events = []
+        client.hooks.add(CIRCUIT_EVENT, events.append)
+
+        for _ in range(2):
+            with self.assertRaises(requests.Timeout):
+                client.get_order('b7a3c4a4-58e9-4a0b-a58b-0d5d4f4a6b0b')
+
+        self.assertEqual(client.circuit_breaker.state('orders'), CircuitState.OPEN)
+        self.assertEqual([(e.family, e.previous, e.state) for e in events], [('orders', 'closed', 'open')])
+
+        # Fails fast without sending, other families are unaffected.
+        with self.assertRaises(CircuitOpenError) as context:
+            client.get_order('b7a3c4a4-58e9-4a0b-a58b-0d5d4f4a6b0b')
+        self.assertIsInstance(context.exception, CoinbaseAdvancedTradeAPIError)
+        self.assertEqual(context.exception.family, 'orders')
+        self.assertGreater(context.exception.retry_after, 0)
+        self.assertEqual(len(transport.requests), 2)
+
+        self.assertIsNotNone(client.get_account('b044449a-38a3-5b8f-a506-4a65c9853222'))
+
+        # A successful probe closes the circuit.
+        time.sleep(0.15)
+        self.assertEqual(client.circuit_breaker.state('orders'), CircuitState.HALF_OPEN)
+        self.failing = None
+        self.assertIsNotNone(client.get_order('b7a3c4a4-58e9-4a0b-a58b-0d5d4f4a6b0b'))
+
+        self.assertEqual(client.circuit_breaker.state('orders'), CircuitState.CLOSED)
+        self.assertEqual([(e.previous, e.state) for e in events],
+                         [('closed', 'open'), ('open', 'half_open'), ('half_open', 'closed')])
+
+    def test_failed_probe_reopens(self):
+        breaker = CircuitBreaker(window=2, min_calls=1, open_seconds=0.05)
+        breaker.observe(RequestEvent('get_order', 'GET', 'url', 503, 0.01, 0))
+        self.assertEqual(breaker.state('orders'), CircuitState.OPEN)
+
+        time.sleep(0.06)
+        breaker.allow('orders')
+        with self.assertRaises(CircuitOpenError):
+            # Only one probe in flight at once.
+            breaker.allow('orders')
+
+        breaker.observe(RequestEvent('get_order', 'GET', 'url', None, 0.01, 0, requests.Timeout()))
+        self.assertEqual(breaker.state('orders'), CircuitState.OPEN)
+
+    def test_slow_calls_open(self):
+        breaker = CircuitBreaker(slow_call_duration=0.5, slow_call_rate=0.5, window=4, min_calls=4)
+
+        for elapsed in (0.1, 0.1, 0.9):
+            breaker.observe(RequestEvent('get_best_bid_ask', 'GET', 'url', 200, elapsed, 0))
+        self.assertEqual(breaker.state('products'), CircuitState.CLOSED)
+
+        breaker.observe(RequestEvent('get_product_book', 'GET', 'url', 200, 0.9, 0))
+        self.assertEqual(breaker.state('products'), CircuitState.OPEN)
+        self.assertEqual(breaker.state('orders'), CircuitState.CLOSED)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,13 +2,24 @@
 CoinbaseAdvancedTradeAPIClient unit tests.
 """
 
+import json
+import os
+import subprocess
+import sys
+import tempfile
 import unittest
 from unittest import mock
 from datetime import datetime, timezone
 
+import requests
+
 from coinbaseadvanced.client import CoinbaseAdvancedTradeAPIClient, Side, StopDirection, Granularity
+from coinbaseadvanced.http2 import http2_available
+from coinbaseadvanced.instrumentation import REQUEST_EVENT
 from coinbaseadvanced.models.error import CoinbaseAdvancedTradeAPIError
+from coinbaseadvanced.models.orders import OrderSpec
 from coinbaseadvanced.models.portfolios import PortfolioType
+from coinbaseadvanced.order_state import TrackedOrder
 from tests.fixtures.fixtures import *
 
 
@@ -23,6 +34,18 @@ class TestCoinbaseAdvancedTradeAPIClient(unittest.TestCase):
 
         self.assertIsNotNone(client)
 
+    def test_client_import_is_lazy(self):
+        code = ("import sys\n"
+                "from coinbaseadvanced.client import CoinbaseAdvancedTradeAPIClient, Side\n"
+                "client = CoinbaseAdvancedTradeAPIClient.from_legacy_api_keys('key', 'secret')\n"
+                "client._build_request_headers('GET', '/api/v3/brokerage/accounts')\n"
+                "print(','.join(m for m in ('cryptography', 'jwt', 'websocket') if m in sys.modules))")
+
+        output = subprocess.run([sys.executable, '-c', code], check=True,
+                                capture_output=True, text=True).stdout
+
+        self.assertEqual(output.strip(), '')
+
     @mock.patch("coinbaseadvanced.client.requests.get")
     def test_get_account_success(self, mock_get):
 
@@ -148,6 +171,101 @@ class TestCoinbaseAdvancedTradeAPIClient(unittest.TestCase):
             self.assertIsNotNone(account.hold)
             self.assertIsNotNone(account.ready)
 
+    @mock.patch("coinbaseadvanced.client.time.sleep")
+    @mock.patch("coinbaseadvanced.client.requests.get")
+    def test_list_accounts_retry_success(self, mock_get, mock_sleep):
+
+        unavailable = fixture_default_failure_response()
+        unavailable.status_code = 503
+        mock_get.side_effect = [unavailable, fixture_list_accounts_success_response()]
+
+        client = CoinbaseAdvancedTradeAPIClient(
+            api_key='kjsldfk32234', secret_key='jlsjljsfd89y98y98shdfjksfd', max_retries=2)
+
+        events = []
+        client.hooks.add(REQUEST_EVENT, events.append)
+
+        page = client.list_accounts()
+
+        # Check input
+
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(mock_sleep.call_count, 1)
+
+        # Check output
+
+        self.assertIsNotNone(page)
+        self.assertEqual([event.attempt for event in events], [0, 1])
+        self.assertEqual(events[0].status_code, 503)
+        self.assertEqual(events[0].endpoint, 'list_accounts')
+        self.assertEqual(events[0].url, 'https://api.coinbase.com/api/v3/brokerage/accounts?limit=49')
+
+    @mock.patch("coinbaseadvanced.http2.http2_available", return_value=False)
+    @mock.patch("coinbaseadvanced.client.requests.get")
+    def test_list_accounts_http2_fallback(self, mock_get, mock_available):
+
+        mock_get.return_value = fixture_list_accounts_success_response()
+
+        client = CoinbaseAdvancedTradeAPIClient(
+            api_key='kjsldfk32234', secret_key='jlsjljsfd89y98y98shdfjksfd', http2=True)
+
+        page = client.list_accounts()
+
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertFalse(client.http2_enabled)
+        self.assertEqual(len(page.accounts), page.size)
+
+    @mock.patch("coinbaseadvanced.http2.http2_available", return_value=True)
+    @mock.patch("coinbaseadvanced.http2.HTTP2Transport")
+    @mock.patch("coinbaseadvanced.client.requests.get")
+    def test_list_accounts_http2(self, mock_get, mock_transport, mock_available):
+
+        mock_transport.return_value.send.return_value = fixture_list_accounts_success_response()
+
+        client = CoinbaseAdvancedTradeAPIClient(
+            api_key='kjsldfk32234', secret_key='jlsjljsfd89y98y98shdfjksfd', http2=True)
+
+        page = client.list_accounts()
+        client.list_accounts()
+
+        # Check input
+
+        self.assertEqual(mock_get.call_count, 0)
+        self.assertEqual(mock_transport.call_count, 1)
+        args, _ = mock_transport.return_value.send.call_args
+        self.assertEqual(args[:2], ('GET', 'https://api.coinbase.com/api/v3/brokerage/accounts?limit=49'))
+        self.assertIn('CB-ACCESS-SIGN', args[2])
+
+        # Check output
+
+        self.assertTrue(client.http2_enabled)
+        self.assertEqual(len(page.accounts), page.size)
+
+    @unittest.skipUnless(http2_available(), "httpx with HTTP/2 support is not installed")
+    def test_create_limit_order_http2_sends_signed_body(self):
+        import httpx
+
+        sent = []
+
+        def handler(request):
+            sent.append(request)
+            with open('tests/fixtures/create_limit_order_success_response.json', 'r', encoding="utf-8") as file:
+                return httpx.Response(200, text=file.read(), headers={'content-type': 'application/json'})
+
+        client = CoinbaseAdvancedTradeAPIClient(
+            api_key='lknalksdj89asdkl', secret_key='jlsjljsfd89y98y98shdfjksfd', http2=True)
+        client.transport._client = httpx.Client(transport=httpx.MockTransport(handler))
+
+        client.create_limit_order("lknalksdj89asdkl", "ALGO-USD", Side.BUY, .19, 5)
+
+        # The body on the wire is the one the signature covers.
+        request = sent[0]
+        body = request.content.decode('utf-8')
+        message = request.headers['CB-ACCESS-TIMESTAMP'] + 'POST' + '/api/v3/brokerage/orders' + body
+        self.assertEqual(request.headers['CB-ACCESS-SIGN'], client._create_signature(message))
+        self.assertEqual(request.headers['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(body)['client_order_id'], "lknalksdj89asdkl")
+
     @mock.patch("coinbaseadvanced.client.requests.get")
     def test_list_accounts_all_success(self, mock_get):
 
@@ -246,7 +364,7 @@ class TestCoinbaseAdvancedTradeAPIClient(unittest.TestCase):
             self.assertIn('CB-ACCESS-TIMESTAMP', headers)
             self.assertIn('CB-ACCESS-SIGN', headers)
 
-            json_data = kwargs['json']
+            json_data = json.loads(kwargs['data'])
             self.assertEqual(json_data['client_order_id'], "lknalksdj89asdkl")
             self.assertEqual(json_data['product_id'], "ALGO-USD")
             self.assertEqual(json_data['side'], "BUY")
@@ -310,7 +428,7 @@ class TestCoinbaseAdvancedTradeAPIClient(unittest.TestCase):
             self.assertIn('CB-ACCESS-TIMESTAMP', headers)
             self.assertIn('CB-ACCESS-SIGN', headers)
 
-            json_data = kwargs['json']
+            json_data = json.loads(kwargs['data'])
             self.assertEqual(json_data['client_order_id'], "mklansdu8wehr")
             self.assertEqual(json_data['product_id'], "ALGO-USD")
             self.assertEqual(json_data['side'], "BUY")
@@ -363,7 +481,7 @@ class TestCoinbaseAdvancedTradeAPIClient(unittest.TestCase):
             self.assertIn('CB-ACCESS-TIMESTAMP', headers)
             self.assertIn('CB-ACCESS-SIGN', headers)
 
-            json_data = kwargs['json']
+            json_data = json.loads(kwargs['data'])
             self.assertEqual(json_data['client_order_id'], "asdasd")
             self.assertEqual(json_data['product_id'], "ALGO-USD")
             self.assertEqual(json_data['side'], "BUY")
@@ -417,7 +535,7 @@ class TestCoinbaseAdvancedTradeAPIClient(unittest.TestCase):
             self.assertIn('CB-ACCESS-TIMESTAMP', headers)
             self.assertIn('CB-ACCESS-SIGN', headers)
 
-            json_data = kwargs['json']
+            json_data = json.loads(kwargs['data'])
             self.assertEqual(json_data['client_order_id'], "njkasdh7")
             self.assertEqual(json_data['product_id'], "ALGO-USD")
             self.assertEqual(json_data['side'], "SELL")
@@ -496,6 +614,50 @@ class TestCoinbaseAdvancedTradeAPIClient(unittest.TestCase):
 
         self.assertIsNotNone(order.order_error)
 
+    @mock.patch("coinbaseadvanced.client.requests.post")
+    def test_create_orders_bulk_success(self, mock_post):
+
+        def create_order(*args, **kwargs):
+            payload = json.loads(kwargs['data'])
+            if payload['client_order_id'] == "client_order_1":
+                return fixture_default_failure_response()
+            return fixture_create_limit_order_success_response()
+
+        mock_post.side_effect = create_order
+
+        client = CoinbaseAdvancedTradeAPIClient(
+            api_key='lknalksdj89asdkl', secret_key='jlsjljsfd89y98y98shdfjksfd')
+
+        specs = [OrderSpec.limit(f"client_order_{i}", "ALGO-USD", Side.BUY, .19, 5)
+                 for i in range(3)]
+        placement = client.create_orders_bulk(specs)
+
+        # Check input
+
+        self.assertEqual(mock_post.call_count, 3)
+        for call in mock_post.call_args_list:
+            args, kwargs = call
+            self.assertIn('https://api.coinbase.com/api/v3/brokerage/orders', args)
+
+            headers = kwargs['headers']
+            self.assertIn('CB-ACCESS-SIGN', headers)
+            self.assertEqual(headers['Content-Type'], 'application/json')
+
+            json_data = json.loads(kwargs['data'])
+            self.assertDictEqual(json_data['order_configuration'], {'limit_limit_gtc': {
+                'limit_price': '0.19', 'base_size': '5'}})
+
+        # Check output
+
+        placements = placement.placements
+        self.assertEqual(len(placements), 3)
+        self.assertIsNotNone(placements[0].order)
+        self.assertIsNone(placements[0].error)
+        self.assertIsNone(placements[1].order)
+        self.assertIsInstance(placements[1].error, CoinbaseAdvancedTradeAPIError)
+        self.assertIsNotNone(placements[2].order)
+        self.assertGreaterEqual(placement.elapsed, max(p.latency for p in placements))
+
     @mock.patch("coinbaseadvanced.client.requests.post")
     def test_edit_order_success(self, mock_post):
 
@@ -560,7 +722,7 @@ class TestCoinbaseAdvancedTradeAPIClient(unittest.TestCase):
             self.assertIn('CB-ACCESS-TIMESTAMP', headers)
             self.assertIn('CB-ACCESS-SIGN', headers)
 
-            json_data = kwargs['json']
+            json_data = json.loads(kwargs['data'])
             self.assertIn('order_id_1', json_data['order_ids'])
             self.assertIn('order_id_2', json_data['order_ids'])
 
@@ -570,6 +732,157 @@ class TestCoinbaseAdvancedTradeAPIClient(unittest.TestCase):
 
         self.assertEqual(len(cancellation_receipt.results), 2)
 
+    @mock.patch("coinbaseadvanced.client.requests.post")
+    def test_cancel_orders_bulk_success(self, mock_post):
+
+        def batch_cancel(*args, **kwargs):
+            order_ids = json.loads(kwargs['data'])['order_ids']
+            if 'order_id_150' in order_ids:
+                return fixture_default_failure_response()
+            return fixture_cancel_orders_success_response_for(order_ids)
+
+        mock_post.side_effect = batch_cancel
+
+        client = CoinbaseAdvancedTradeAPIClient(
+            api_key='lknalksdj89asdkl', secret_key='jlsjljsfd89y98y98shdfjksfd')
+
+        order_ids = [f"order_id_{i}" for i in range(250)]
+        cancellation_receipt = client.cancel_orders_bulk(order_ids)
+
+        # Check input
+
+        self.assertEqual(mock_post.call_count, 3)
+        for call in mock_post.call_args_list:
+            _, kwargs = call
+            self.assertLessEqual(len(json.loads(kwargs['data'])['order_ids']), 100)
+
+        # Check output
+
+        self.assertEqual([result['order_id'] for result in cancellation_receipt.results], order_ids)
+        self.assertTrue(all(result['success'] for result in cancellation_receipt.results[:100]))
+        self.assertFalse(any(result['success'] for result in cancellation_receipt.results[100:200]))
+        self.assertTrue(all(result['failure_reason'] == 'REQUEST_FAILED'
+                            for result in cancellation_receipt.results[100:200]))
+
+        timings = cancellation_receipt.chunk_timings
+        self.assertEqual([timing.index for timing in timings], [0, 1, 2])
+        self.assertEqual([timing.size for timing in timings], [100, 100, 50])
+        self.assertIsNone(timings[0].error)
+        self.assertIsNotNone(timings[1].error)
+        self.assertEqual(cancellation_receipt.results[100]['error'], timings[1].error)
+
+    @mock.patch("coinbaseadvanced.client.requests.post")
+    @mock.patch("coinbaseadvanced.client.requests.get")
+    def test_cancel_all_from_rest(self, mock_get, mock_post):
+
+        mock_get.side_effect = [
+            fixture_list_open_orders_success_response_for(
+                [(f"btc_{i}", "BTC-USD") for i in range(150)] + [("eth_0", "ETH-USD")]),
+            fixture_list_open_orders_success_response_for([("eth_0", "ETH-USD")]),
+        ]
+        mock_post.side_effect = lambda *args, **kwargs: fixture_cancel_orders_success_response_for(
+            json.loads(kwargs['data'])['order_ids'])
+
+        client = CoinbaseAdvancedTradeAPIClient(
+            api_key='lknalksdj89asdkl', secret_key='jlsjljsfd89y98y98shdfjksfd', retry_backoff=0)
+
+        report = client.cancel_all(product_ids=["BTC-USD"])
+
+        # Check input
+
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertIn('order_status=OPEN', mock_get.call_args_list[0][0][0])
+        cancelled = [order_id for call in mock_post.call_args_list for order_id in json.loads(call[1]['data'])['order_ids']]
+        self.assertEqual(sorted(cancelled), sorted(f"btc_{i}" for i in range(150)))
+        self.assertEqual(mock_post.call_count, 2)
+
+        # Check output
+
+        self.assertTrue(report.flat)
+        self.assertTrue(report.verified)
+        self.assertEqual(report.source, 'rest')
+        self.assertEqual(report.rounds, 1)
+        self.assertEqual(len(report.cancellation.results), 150)
+        self.assertEqual(len(report.cancellation.chunk_timings), 2)
+        self.assertIsNotNone(report.time_to_flat)
+        self.assertLessEqual(report.time_to_flat, report.elapsed)
+
+    @mock.patch("coinbaseadvanced.client.requests.post")
+    @mock.patch("coinbaseadvanced.client.requests.get")
+    def test_cancel_all_from_order_store(self, mock_get, mock_post):
+
+        # The first verification still lists one order, cancelled again in a second round.
+        mock_get.side_effect = [
+            fixture_list_open_orders_success_response_for([("order_2", "BTC-USD")]),
+            fixture_list_open_orders_success_response_for([]),
+        ]
+        mock_post.side_effect = lambda *args, **kwargs: fixture_cancel_orders_success_response_for(
+            json.loads(kwargs['data'])['order_ids'])
+
+        client = CoinbaseAdvancedTradeAPIClient(
+            api_key='lknalksdj89asdkl', secret_key='jlsjljsfd89y98y98shdfjksfd', retry_backoff=0)
+
+        order_store = mock.Mock()
+        order_store.open_orders.return_value = [
+            TrackedOrder(f"order_{i}", None, "BTC-USD", "BUY", "LIMIT", "OPEN") for i in range(3)]
+
+        report = client.cancel_all(order_store=order_store)
+
+        # One settle and one listing per round.
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(report.source, 'local')
+        self.assertEqual(report.rounds, 2)
+        self.assertTrue(report.flat)
+        self.assertTrue(report.verified)
+        self.assertEqual([json.loads(call[1]['data'])['order_ids'] for call in mock_post.call_args_list],
+                         [["order_0", "order_1", "order_2"], ["order_2"]])
+
+    @mock.patch("coinbaseadvanced.client.requests.post")
+    @mock.patch("coinbaseadvanced.client.requests.get")
+    def test_cancel_all_checks_rest_when_order_store_empty(self, mock_get, mock_post):
+
+        # The store missed an order, REST still lists it.
+        mock_get.side_effect = [
+            fixture_list_open_orders_success_response_for([("order_0", "BTC-USD")]),
+            fixture_list_open_orders_success_response_for([]),
+        ]
+        mock_post.side_effect = lambda *args, **kwargs: fixture_cancel_orders_success_response_for(
+            json.loads(kwargs['data'])['order_ids'])
+
+        client = CoinbaseAdvancedTradeAPIClient(
+            api_key='lknalksdj89asdkl', secret_key='jlsjljsfd89y98y98shdfjksfd', retry_backoff=0)
+
+        order_store = mock.Mock()
+        order_store.open_orders.return_value = []
+
+        report = client.cancel_all(order_store=order_store)
+
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual([json.loads(call[1]['data'])['order_ids'] for call in mock_post.call_args_list], [["order_0"]])
+        self.assertTrue(report.flat)
+        self.assertTrue(report.verified)
+        self.assertIsNotNone(report.time_to_flat)
+
+    @mock.patch("coinbaseadvanced.client.requests.post")
+    @mock.patch("coinbaseadvanced.client.requests.get")
+    def test_cancel_all_unverified(self, mock_get, mock_post):
+
+        mock_post.side_effect = lambda *args, **kwargs: fixture_cancel_orders_success_response_for(
+            json.loads(kwargs['data'])['order_ids'])
+
+        client = CoinbaseAdvancedTradeAPIClient(
+            api_key='lknalksdj89asdkl', secret_key='jlsjljsfd89y98y98shdfjksfd')
+
+        order_store = mock.Mock()
+        order_store.open_orders.return_value = [TrackedOrder("order_0", None, "BTC-USD", "BUY", "LIMIT", "OPEN")]
+
+        report = client.cancel_all(order_store=order_store, verify=False)
+
+        mock_get.assert_not_called()
+        self.assertTrue(report.flat)
+        self.assertFalse(report.verified)
+        self.assertIsNone(report.time_to_flat)
+
     @mock.patch("coinbaseadvanced.client.requests.get")
     def test_list_orders_success(self, mock_get):
 
@@ -618,6 +931,48 @@ class TestCoinbaseAdvancedTradeAPIClient(unittest.TestCase):
             self.assertIsNotNone(order.settled)
             self.assertIsNotNone(order.filled_size)
 
+    @mock.patch("coinbaseadvanced.client.requests.get")
+    def test_list_orders_stream_success(self, mock_get):
+
+        mock_resp = fixture_list_orders_success_response()
+        mock_get.return_value = mock_resp
+
+        client = CoinbaseAdvancedTradeAPIClient(
+            api_key='kjsldfk32234', secret_key='jlsjljsfd89y98y98shdfjksfd')
+
+        orders_page = client.list_orders(limit=10, stream=True)
+
+        # Check input
+
+        _, kwargs = mock_get.call_args
+        self.assertTrue(kwargs['stream'])
+        mock_resp.iter_content.assert_not_called()
+
+        # Check output
+
+        orders = list(orders_page)
+        expected = json.loads(mock_resp.text)
+
+        self.assertEqual([order.order_id for order in orders],
+                         [order['order_id'] for order in expected['orders']])
+        self.assertEqual(orders_page.has_next, True)
+        self.assertEqual(orders_page.cursor, expected['cursor'])
+        mock_resp.close.assert_called_once_with()
+
+        with self.assertRaises(RuntimeError):
+            list(orders_page)
+
+    @mock.patch("coinbaseadvanced.client.requests.get")
+    def test_list_orders_stream_failure(self, mock_get):
+
+        mock_get.return_value = fixture_default_failure_response()
+
+        client = CoinbaseAdvancedTradeAPIClient(
+            api_key='kjsldfk32234', secret_key='jlsjljsfd89y98y98shdfjksfd')
+
+        with self.assertRaises(CoinbaseAdvancedTradeAPIError):
+            client.list_orders(limit=10, stream=True)
+
     @mock.patch("coinbaseadvanced.client.requests.get")
     def test_list_orders_with_extra_unnamed_arg_success(self, mock_get):
 
@@ -867,6 +1222,55 @@ class TestCoinbaseAdvancedTradeAPIClient(unittest.TestCase):
             self.assertIsNotNone(product.watched)
             self.assertIsNotNone(product.price_percentage_change_24h)
 
+    def _products_catalog(self, size: int, report_total: bool):
+        catalog = [f'P{index:03}-USD' for index in range(size)]
+
+        def get(url, **kwargs):
+            query = dict(piece.split('=') for piece in url.split('?')[1].split('&'))
+            offset, limit = int(query.get('offset', 0)), int(query['limit'])
+            page = catalog[offset:offset + limit]
+            return fixture_list_products_range_response(page, size if report_total else len(page))
+
+        return catalog, get
+
+    @mock.patch("coinbaseadvanced.client.requests.get")
+    def test_list_products_all_success(self, mock_get):
+
+        catalog, mock_get.side_effect = self._products_catalog(23, report_total=True)
+
+        client = CoinbaseAdvancedTradeAPIClient(
+            api_key='kjsldfk32234', secret_key='jlsjljsfd89y98y98shdfjksfd')
+
+        products_page = client.list_products_all(page_size=5)
+
+        # Check input
+
+        urls = sorted(args[0] for args, _ in mock_get.call_args_list)
+        self.assertEqual(urls, sorted(
+            f'https://api.coinbase.com/api/v3/brokerage/products?limit=5&offset={offset}'
+            for offset in range(0, 25, 5)))
+
+        # Check output
+
+        self.assertEqual([product.product_id for product in products_page], catalog)
+        self.assertEqual(products_page.num_products, 23)
+
+    @mock.patch("coinbaseadvanced.client.requests.get")
+    def test_list_products_all_without_total(self, mock_get):
+
+        catalog, mock_get.side_effect = self._products_catalog(20, report_total=False)
+
+        client = CoinbaseAdvancedTradeAPIClient(
+            api_key='kjsldfk32234', secret_key='jlsjljsfd89y98y98shdfjksfd', max_workers=2)
+
+        pages = list(client.iter_products_pages(page_size=5))
+
+        # Ranges are requested two at a time until one is short, here the empty one at 20.
+        self.assertEqual(sorted(offset for offset, _ in pages), [0, 5, 10, 15, 20])
+        self.assertEqual(pages[0][0], 0)
+        self.assertEqual([product.product_id for _, page in sorted(pages, key=lambda item: item[0])
+                          for product in page], catalog)
+
     @mock.patch("coinbaseadvanced.client.requests.get")
     def test_get_product_success(self, mock_get):
 
@@ -989,6 +1393,63 @@ class TestCoinbaseAdvancedTradeAPIClient(unittest.TestCase):
             self.assertIsNotNone(candle.close)
             self.assertIsNotNone(candle.volume)
 
+    @mock.patch("coinbaseadvanced.client.requests.get")
+    def test_get_candles_for_products_resumes(self, mock_get):
+
+        from coinbaseadvanced.candle_download import candle_windows
+
+        start_date = datetime(2021, 1, 1, tzinfo=timezone.utc)
+        end_date = datetime(2023, 2, 20, tzinfo=timezone.utc)
+        windows = candle_windows(start_date, end_date, Granularity.ONE_DAY)
+        fixtures = [fixture_get_product_candles_all_call_1_success_response,
+                    fixture_get_product_candles_all_call_2_success_response,
+                    fixture_get_product_candles_all_call_3_success_response]
+        by_start = {str(int(begin.timestamp())): fixture for (begin, _), fixture in zip(windows, fixtures)}
+
+        requested = []
+        failing = set()
+
+        def get(url, **kwargs):
+            product_id = url.split('/products/')[1].split('/')[0]
+            start = url.split('start=')[1].split('&')[0]
+            requested.append((product_id, start))
+            if (product_id, start) in failing:
+                raise requests.ConnectionError("connection reset")
+            return by_start[start]()
+
+        mock_get.side_effect = get
+
+        client = CoinbaseAdvancedTradeAPIClient(
+            api_key='kjsldfk32234', secret_key='jlsjljsfd89y98y98shdfjksfd', max_workers=2)
+        product_ids = ['ALGO-USD', 'XLM-USD', 'ALGO-USD']
+
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint_path = os.path.join(directory, 'candles.sqlite')
+
+            # First run, the last window of XLM-USD fails.
+            failing.add(('XLM-USD', str(int(windows[-1][0].timestamp()))))
+            downloaded = {}
+            with self.assertRaises(requests.ConnectionError):
+                for product_id, page in client.get_candles_for_products(
+                        product_ids, start_date, end_date, Granularity.ONE_DAY, checkpoint_path=checkpoint_path):
+                    downloaded[product_id] = page
+
+            self.assertEqual(list(downloaded), ['ALGO-USD'])
+            self.assertEqual(len(downloaded['ALGO-USD'].candles), 781)
+            self.assertEqual(len(requested), 6)
+
+            # Second run, only the failed window is requested again.
+            failing.clear()
+            requested.clear()
+            downloaded = dict(client.get_candles_for_products(
+                product_ids, start_date, end_date, Granularity.ONE_DAY, checkpoint_path=checkpoint_path))
+
+            self.assertEqual(requested, [('XLM-USD', str(int(windows[-1][0].timestamp())))])
+            self.assertEqual(sorted(downloaded), ['ALGO-USD', 'XLM-USD'])
+            starts = [int(candle.start) for candle in downloaded['XLM-USD'].candles]
+            self.assertEqual(len(starts), 781)
+            self.assertEqual(starts, sorted(starts, reverse=True))
+
     @mock.patch("coinbaseadvanced.client.requests.get")
     def test_get_best_bid_asks(self, mock_get):
 
@@ -1062,6 +1523,46 @@ class TestCoinbaseAdvancedTradeAPIClient(unittest.TestCase):
         self.assertEqual(len(pricebook.asks), 5)
         self.assertEqual(len(pricebook.bids), 5)
 
+    @mock.patch("coinbaseadvanced.client.requests.get")
+    def test_get_product_books(self, mock_get):
+
+        def respond(url, **kwargs):
+            if 'product_id=DOGE-USD' in url:
+                return fixture_default_failure_response()
+            return fixture_product_book_success_response()
+
+        mock_get.side_effect = respond
+
+        client = CoinbaseAdvancedTradeAPIClient(
+            api_key='kjsldfk32234', secret_key='jlsjljsfd89y98y98shdfjksfd')
+
+        books = client.get_product_books(["BTC-USD", "ETH-USD", "DOGE-USD", "BTC-USD"], limit=5)
+
+        # Check input
+
+        urls = sorted(call[0][0] for call in mock_get.call_args_list)
+        self.assertEqual(urls, [
+            'https://api.coinbase.com/api/v3/brokerage/product_book?product_id=BTC-USD&limit=5',
+            'https://api.coinbase.com/api/v3/brokerage/product_book?product_id=DOGE-USD&limit=5',
+            'https://api.coinbase.com/api/v3/brokerage/product_book?product_id=ETH-USD&limit=5',
+        ])
+
+        # Check output
+
+        self.assertEqual(list(books), ["BTC-USD", "ETH-USD"])
+        self.assertEqual(list(books.errors), ["DOGE-USD"])
+        self.assertIsInstance(books.errors["DOGE-USD"], CoinbaseAdvancedTradeAPIError)
+
+        book = books["BTC-USD"]
+        self.assertEqual(book.bid_prices.typecode, 'd')
+        self.assertEqual(len(book.bid_prices), 5)
+        self.assertEqual(len(book.ask_sizes), 5)
+        self.assertEqual(book.best_bid, 43913.56)
+        self.assertEqual(book.best_ask, 43913.57)
+        self.assertAlmostEqual(book.mid, 43913.565)
+        self.assertGreaterEqual(books.fetch_skew, 0)
+        self.assertLess(book.age(), 60)
+
     @mock.patch("coinbaseadvanced.client.requests.get")
     def test_get_trades(self, mock_get):
 
@@ -1239,7 +1740,7 @@ class TestCoinbaseAdvancedTradeAPIClient(unittest.TestCase):
             self.assertIn('CB-ACCESS-TIMESTAMP', headers)
             self.assertIn('CB-ACCESS-SIGN', headers)
 
-            json_data = kwargs['json']
+            json_data = json.loads(kwargs['data'])
             self.assertEqual(json_data['name'], "portf-test3")
         # Check output
 
@@ -1278,7 +1779,7 @@ class TestCoinbaseAdvancedTradeAPIClient(unittest.TestCase):
             self.assertIn('CB-ACCESS-TIMESTAMP', headers)
             self.assertIn('CB-ACCESS-SIGN', headers)
 
-            json_data = kwargs['json']
+            json_data = json.loads(kwargs['data'])
             self.assertEqual(json_data['name'], "edited-portfolio-name")
         # Check output
 
@@ -1360,6 +1861,61 @@ class TestCoinbaseAdvancedTradeAPIClient(unittest.TestCase):
             portfolio_breakdown.portfolio_balances.total_balance.value, "69952.54")
         self.assertEqual(len(portfolio_breakdown.spot_positions), 78)
 
+    @mock.patch("coinbaseadvanced.client.requests.get")
+    def test_get_all_portfolio_breakdowns_success(self, mock_get):
+
+        breakdown = json.loads(fixture_get_portfolio_breakdown_success_response().text)
+        amount = {'userNativeCurrency': {'value': '2.5', 'currency': 'USD'},
+                  'rawCurrency': {'value': '2.5', 'currency': 'USDC'}}
+        perp_position = {
+            'product_id': 'BTC-PERP-INTX', 'product_uuid': 'b1', 'symbol': 'BTC-PERP-INTX', 'asset_image_url': '',
+            'vwap': amount, 'position_side': 'LONG', 'net_size': '0.5', 'buy_order_size': '0',
+            'sell_order_size': '0', 'im_contribution': '0.1', 'unrealized_pnl': amount, 'mark_price': amount,
+            'liquidation_price': amount, 'leverage': '2', 'im_notional': amount, 'mm_notional': amount,
+            'position_notional': amount, 'margin_type': 'CROSS', 'liquidation_buffer': '0',
+            'liquidation_percentage': '0'}
+        portfolios = [{'name': name, 'uuid': name, 'type': 'DEFAULT', 'deleted': name == 'deleted'}
+                      for name in ('main', 'intx', 'deleted')]
+
+        def get(url, **kwargs):
+            if url.endswith('/portfolios'):
+                return fixture_list_portfolios_success_response_for(portfolios)
+            uuid = url.rsplit('/', 1)[1]
+            result = json.loads(json.dumps(breakdown))
+            result['breakdown']['portfolio']['uuid'] = uuid
+            if uuid == 'intx':
+                result['breakdown']['perp_positions'] = [perp_position]
+            return fixture_get_portfolio_breakdown_success_response_for(result)
+
+        mock_get.side_effect = get
+
+        client = CoinbaseAdvancedTradeAPIClient(
+            api_key='kjsldfk32234', secret_key='jlsjljsfd89y98y98shdfjksfd')
+
+        breakdowns = client.get_all_portfolio_breakdowns()
+
+        # Check input
+
+        self.assertEqual(mock_get.call_count, 3)
+
+        # Check output
+
+        self.assertEqual(sorted(breakdowns), ['intx', 'main'])
+        self.assertEqual(breakdowns['intx'].portfolio.uuid, 'intx')
+
+        spot = breakdowns.spot_positions
+        self.assertEqual(len(spot), 2 * 78)
+        self.assertEqual(spot['portfolio_uuid'].count('main'), 78)
+        fiat = sum(float(position.total_balance_fiat) for position in breakdowns['main'].spot_positions)
+        self.assertAlmostEqual(spot.total('total_balance_fiat', by='portfolio_uuid')['main'], fiat)
+        self.assertAlmostEqual(spot.total('total_balance_fiat'), 2 * fiat)
+
+        perp = breakdowns.perp_positions
+        self.assertEqual(len(perp), 1)
+        self.assertEqual(perp['product_id'], ['BTC-PERP-INTX'])
+        self.assertEqual(perp['net_size'], [0.5])
+        self.assertEqual(perp['unrealized_pnl'], [2.5])
+
     @mock.patch("coinbaseadvanced.client.requests.post")
     def test_move_funds_success(self, mock_post):
 
@@ -1388,7 +1944,7 @@ class TestCoinbaseAdvancedTradeAPIClient(unittest.TestCase):
             self.assertIn('CB-ACCESS-TIMESTAMP', headers)
             self.assertIn('CB-ACCESS-SIGN', headers)
 
-            json_data = kwargs['json']
+            json_data = json.loads(kwargs['data'])
             self.assertEqual(json_data['source_portfolio_uuid'],
                              "klsjdlksd-nsjkdnfk-234234")
             self.assertEqual(json_data['target_portfolio_uuid'],
@@ -0,0 +1,74 @@
+"""
+FillsSynchronizer unit tests.
+"""
+
+import unittest
+from unittest import mock
+
+from coinbaseadvanced.fills_sync import FillsSynchronizer
+from coinbaseadvanced.models.orders import FillsPage
+
+
+def _fill(trade_id: str, trade_time: str) -> dict:
+    return {'entry_id': 'entry-' + trade_id, 'trade_id': trade_id, 'order_id': 'order-1',
+            'trade_time': trade_time, 'trade_type': 'FILL', 'price': '100', 'size': '1',
+            'commission': '0.1', 'product_id': 'BTC-USD', 'sequence_timestamp': trade_time,
+            'liquidity_indicator': 'MAKER', 'size_in_quote': False, 'user_id': 'user-1', 'side': 'BUY'}
+
+
+class TestFillsSynchronizer(unittest.TestCase):
+    """
+    Unit tests for FillsSynchronizer.
+    """
+
+    def setUp(self):
+        self.client = mock.Mock()
+        self.sync = FillsSynchronizer(self.client, ':memory:', product_id='BTC-USD')
+
+    def tearDown(self):
+        self.sync.close()
+
+    def test_incremental_sync(self):
+        self.client.list_fills.side_effect = [
+            FillsPage([_fill('3', '2023-01-03T00:00:00.500Z'), _fill('2', '2023-01-02T00:00:00.000Z')], 'c1'),
+            FillsPage([_fill('1', '2023-01-01T00:00:00.000Z')], ''),
+        ]
+
+        result = self.sync.sync()
+
+        self.assertEqual(result.new_fills, 3)
+        self.assertEqual(result.pages, 2)
+        self.assertFalse(result.resumed)
+        self.assertEqual(str(self.sync.last_trade_time()), '2023-01-03 00:00:00.500000')
+        self.assertIsNone(self.client.list_fills.call_args_list[0].kwargs['start_date'])
+        self.assertEqual(self.client.list_fills.call_args_list[1].kwargs['cursor'], 'c1')
+
+        # Second run starts at the checkpoint, the boundary fill is deduplicated.
+        self.client.list_fills.side_effect = [
+            FillsPage([_fill('4', '2023-01-04T00:00:00.000Z'), _fill('3', '2023-01-03T00:00:00.500Z')], ''),
+        ]
+
+        result = self.sync.sync()
+
+        self.assertEqual(result.new_fills, 1)
+        self.assertEqual(str(self.client.list_fills.call_args.kwargs['start_date']), '2023-01-03 00:00:00.500000')
+        self.assertEqual([fill['trade_id'] for fill in self.sync.fills()], ['1', '2', '3', '4'])
+
+    def test_interrupted_sync_resumes_from_cursor(self):
+        self.client.list_fills.side_effect = [
+            FillsPage([_fill('2', '2023-01-02T00:00:00.000Z')], 'c1'),
+            ConnectionError(),
+        ]
+
+        with self.assertRaises(ConnectionError):
+            self.sync.sync()
+        self.assertIsNone(self.sync.last_trade_time())
+
+        self.client.list_fills.side_effect = [FillsPage([_fill('1', '2023-01-01T00:00:00.000Z')], '')]
+
+        result = self.sync.sync()
+
+        self.assertTrue(result.resumed)
+        self.assertEqual(result.new_fills, 1)
+        self.assertEqual(self.client.list_fills.call_args.kwargs['cursor'], 'c1')
+        self.assertEqual(str(self.sync.last_trade_time()), '2023-01-02 00:00:00')
@@ -0,0 +1,129 @@
+"""
+Hedged requests unit tests.
+"""
+
+import itertools
+import threading
+import time
+import unittest
+
+from coinbaseadvanced.client import CoinbaseAdvancedTradeAPIClient
+from coinbaseadvanced.hedging import Hedging
+from coinbaseadvanced.transports import RecordedResponse
+from tests.fixtures.transports import FixtureTransport
+
+
+def _delayed(delays: list):
+    # Answers every request with an order after the delay of its turn.
+    turns = itertools.count()
+
+    def respond(method, url):
+        time.sleep(delays[min(next(turns), len(delays) - 1)])
+        return 'get_order_success_response.json'
+
+    return respond
+
+
+class _ClosingResponse(RecordedResponse):
+    # Records whether the client released the response.
+
+    __slots__ = ('closed',)
+
+    def __init__(self, status_code: int, text: str, headers: dict = None) -> None:
+        super().__init__(status_code, text, headers)
+        self.closed = threading.Event()
+
+    def close(self) -> None:
+        self.closed.set()
+
+
+class TestHedging(unittest.TestCase):
+    """
+    Unit tests for Hedging.
+    """
+
+    def _client(self, transport, hedging):
+        return CoinbaseAdvancedTradeAPIClient(
+            api_key='kjsldfk32234', secret_key='jlsjljsfd89y98y98shdfjksfd',
+            transport=transport, hedging=hedging)
+
+    def test_late_request_is_hedged(self):
+        transport = FixtureTransport(_delayed([0.001, 0.001, 0.001, 1.0, 0.001]))
+        client = self._client(transport, Hedging(min_samples=3, max_hedge_ratio=1))
+
+        for _ in range(3):
+            client.get_order('b7a3c4a4-58e9-4a0b-a58b-0d5d4f4a6b0b')
+
+        started = time.perf_counter()
+        order = client.get_order('b7a3c4a4-58e9-4a0b-a58b-0d5d4f4a6b0b')
+        elapsed = time.perf_counter() - started
+
+        self.assertIsNotNone(order)
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual(len(transport.requests), 5)
+
+        stats = client.hedge_stats()['get_order']
+        self.assertEqual(stats.requests, 4)
+        self.assertEqual(stats.hedges, 1)
+        self.assertEqual(stats.wins, 1)
+        self.assertEqual(stats.win_rate, 1.0)
+
+    def test_losing_response_is_closed(self):
+        responses = []
+
+        def send():
+            response = _ClosingResponse(200, 'late' if not responses else 'early')
+            responses.append(response)
+            time.sleep(0.3 if len(responses) == 1 else 0.001)
+            return response
+
+        hedging = Hedging(min_samples=1, max_hedge_ratio=1)
+        hedging.record('get_order', 0.01)
+
+        winner = hedging.send('get_order', send, lambda: True)
+
+        self.assertEqual(winner.text, 'early')
+        self.assertFalse(winner.closed.is_set())
+        self.assertTrue(responses[0].closed.wait(5))
+
+    def test_hedge_budget(self):
+        transport = FixtureTransport(_delayed([0.001, 0.001, 0.001, 0.1]))
+        client = self._client(transport, Hedging(min_samples=3, max_hedge_ratio=0))
+
+        for _ in range(4):
+            client.get_order('b7a3c4a4-58e9-4a0b-a58b-0d5d4f4a6b0b')
+
+        self.assertEqual(len(transport.requests), 4)
+        stats = client.hedge_stats(reset=True)['get_order']
+        self.assertEqual(stats.hedges, 0)
+        self.assertEqual(stats.denied, 1)
+        self.assertEqual(client.hedge_stats(), {})
+
+    def test_only_selected_endpoints_hedged(self):
+        hedging = Hedging(endpoints=['get_best_bid_ask'])
+
+        self.assertTrue(hedging.applies_to('get_best_bid_ask'))
+        self.assertFalse(hedging.applies_to('get_order'))
+
+        transport = FixtureTransport(_delayed([0]))
+        client = self._client(transport, hedging)
+        client.get_order('b7a3c4a4-58e9-4a0b-a58b-0d5d4f4a6b0b')
+
+        self.assertEqual(client.hedge_stats(), {})
+
+    def test_delay_percentile(self):
+        hedging = Hedging(percentile=90, min_samples=10)
+
+        for latency in range(9):
+            hedging.record('get_order', latency / 100)
+        self.assertIsNone(hedging.delay('get_order'))
+
+        hedging.record('get_order', 0.09)
+        self.assertEqual(hedging.delay('get_order'), 0.09)
+
+        with self.assertRaises(ValueError):
+            Hedging(percentile=100)
+
+
+if __name__ == '__main__':
+    unittest.main()
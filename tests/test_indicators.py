@@ -0,0 +1,108 @@
+"""
+Technical indicators unit tests.
+"""
+
+import random
+import unittest
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+from coinbaseadvanced.indicators import ATR, EMA, RSI, SMA, VWAP, CandleIndicators
+from coinbaseadvanced.models.market_data import CandlesEvent
+
+
+def _series(length: int):
+    rng = random.Random(7)
+    close, rows = 100.0, []
+    for i in range(length):
+        close += rng.uniform(-1, 1)
+        rows.append((i * 3600, close + rng.uniform(0, 1), close - rng.uniform(0, 1), close, rng.uniform(1, 5)))
+    return rows
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestVectorizedIndicators(unittest.TestCase):
+    """
+    Vectorized functions must match the incremental classes.
+    """
+
+    def test_matches_incremental(self):
+        from coinbaseadvanced import indicators
+
+        # Long enough to span several smoothing blocks.
+        rows = _series(6000)
+        start, high, low, close, volume = (numpy.array(column) for column in zip(*rows))
+
+        incremental = {'sma': SMA(20), 'ema': EMA(20), 'rsi': RSI(14), 'atr': ATR(14), 'vwap': VWAP(86400)}
+        expected = {name: [] for name in incremental}
+        for s, h, l, c, v in rows:
+            expected['sma'].append(incremental['sma'].update(c))
+            expected['ema'].append(incremental['ema'].update(c))
+            expected['rsi'].append(incremental['rsi'].update(c))
+            expected['atr'].append(incremental['atr'].update(h, l, c))
+            expected['vwap'].append(incremental['vwap'].update(h, l, c, v, s))
+
+        vectorized = {'sma': indicators.sma(close, 20), 'ema': indicators.ema(close, 20),
+                      'rsi': indicators.rsi(close, 14), 'atr': indicators.atr(high, low, close, 14),
+                      'vwap': indicators.vwap(high, low, close, volume, start, 86400)}
+
+        for name, values in vectorized.items():
+            reference = numpy.array([numpy.nan if v is None else v for v in expected[name]])
+            numpy.testing.assert_allclose(values, reference, rtol=1e-9, err_msg=name)
+
+    def test_warm_up_values(self):
+        from coinbaseadvanced import indicators
+
+        values = indicators.ema([1, 2, 3, 4], 3)
+        self.assertTrue(numpy.isnan(values[1]))
+        self.assertEqual(values[2:].tolist(), [2.0, 3.0])
+        self.assertEqual(indicators.rsi([1, 2, 3, 4], 2)[2:].tolist(), [100.0, 100.0])
+
+
+class TestCandleIndicators(unittest.TestCase):
+    """
+    Unit tests for CandleIndicators.
+    """
+
+    def _event(self, start: int, close: float) -> CandlesEvent:
+        return CandlesEvent(channel='candles', client_id='', timestamp='2023-06-09T20:19:35.39625135Z',
+                            sequence_num=0, events=[{'type': 'update', 'candles': [
+                                {'start': str(start), 'high': str(close + 1), 'low': str(close - 1),
+                                 'open': str(close), 'close': str(close), 'volume': '2',
+                                 'product_id': 'BTC-USD'}]}])
+
+    def test_candle_updates(self):
+        values = []
+        indicators = CandleIndicators(callback=values.append, sma_period=2, ema_period=2)
+        indicators.warm_up('BTC-USD', [type('Candle', (), {'start': '0', 'high': '11', 'low': '9',
+                                                           'close': '10', 'volume': '2'})()])
+
+        indicators.on_candles(self._event(300, 12))
+        indicators.on_candles(self._event(300, 14))
+        self.assertEqual([(v.start, v.closed, v.sma) for v in values],
+                         [(0, True, None), (300, False, 11.0), (300, False, 12.0)])
+
+        indicators.on_candles(self._event(600, 16))
+        self.assertEqual([(v.start, v.closed, v.sma) for v in values[3:]], [(300, True, 12.0), (600, False, 15.0)])
+        self.assertEqual(indicators.latest('BTC-USD').ema, 12 + 2 / 3 * (16 - 12))
+
+        # Stale update of a closed candle.
+        indicators.on_candles(self._event(300, 20))
+        self.assertEqual(len(values), 5)
+
+    def test_update_replaces_last_warmed_candle(self):
+        values = []
+        indicators = CandleIndicators(callback=values.append, sma_period=2, ema_period=2)
+        indicators.warm_up('BTC-USD', [type('Candle', (), {'start': str(start), 'high': str(close + 1),
+                                                           'low': str(close - 1), 'close': str(close),
+                                                           'volume': '2'})() for start, close in [(300, 12), (0, 10)]])
+        self.assertEqual((indicators.latest('BTC-USD').start, indicators.latest('BTC-USD').closed), (300, False))
+
+        # The candle in progress when warming up, updated by the websocket.
+        indicators.on_candles(self._event(300, 14))
+        indicators.on_candles(self._event(600, 16))
+        self.assertEqual([(v.start, v.closed, v.sma) for v in values],
+                         [(300, False, 12.0), (300, True, 12.0), (600, False, 15.0)])
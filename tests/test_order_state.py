@@ -0,0 +1,152 @@
+"""
+OrderStateStore unit tests.
+"""
+
+import threading
+import unittest
+from unittest import mock
+
+from coinbaseadvanced.models.market_data import UserEvent
+from coinbaseadvanced.models.orders import Order, OrdersPage
+from coinbaseadvanced.order_state import OrderStateStore
+
+
+def _rest_order(order_id: str, client_order_id: str, status: str) -> Order:
+    return Order(order_id=order_id, product_id='BTC-USD', side='BUY', client_order_id=client_order_id,
+                 order_configuration={'limit_limit_gtc': {
+                     'base_size': '1', 'limit_price': '100', 'post_only': False}},
+                 status=status, order_type='LIMIT', time_in_force='GOOD_UNTIL_CANCELLED')
+
+
+def _user_event(sequence_num: int, orders: list, event_type: str = 'update') -> UserEvent:
+    return UserEvent(channel='user', client_id='', timestamp='2023-02-09T20:33:57.609931463Z',
+                     sequence_num=sequence_num, events=[{'type': event_type, 'orders': orders}])
+
+
+def _user_order(order_id: str, client_order_id: str, status: str) -> dict:
+    return {'order_id': order_id, 'client_order_id': client_order_id, 'product_id': 'BTC-USD',
+            'order_side': 'BUY', 'order_type': 'Limit', 'status': status, 'limit_price': '100',
+            'cumulative_quantity': '0', 'leaves_quantity': '1', 'avg_price': '0'}
+
+
+class TestOrderStateStore(unittest.TestCase):
+    """
+    Unit tests for OrderStateStore.
+    """
+
+    def setUp(self):
+        self.client = mock.Mock()
+        page = OrdersPage([], has_next=False, cursor='', sequence=0)
+        page.orders = [_rest_order('order-1', 'client-1', 'OPEN'),
+                       _rest_order('order-2', 'client-2', 'OPEN')]
+        self.client.list_orders_all.return_value = page
+
+        self.store = OrderStateStore(self.client)
+        self.store.bootstrap()
+
+    def test_bootstrap_and_lookups(self):
+        self.assertEqual(len(self.store.open_orders()), 2)
+        self.assertEqual(self.store.get('order-1').limit_price, '100')
+        self.assertEqual(self.store.get_by_client_order_id('client-2').order_id, 'order-2')
+        self.assertIsNone(self.store.get('unknown'))
+
+    def test_user_events_update_state_and_notify(self):
+        changes = []
+        self.store.add_listener(lambda order, previous: changes.append((order.status, previous)))
+
+        self.store.on_user_event(_user_event(1, [_user_order('order-1', 'client-1', 'FILLED'),
+                                                 _user_order('order-3', 'client-3', 'OPEN')]))
+
+        self.assertEqual(self.store.get('order-1').status, 'FILLED')
+        self.assertFalse(self.store.get('order-1').is_open)
+        self.assertEqual(sorted(o.order_id for o in self.store.open_orders()), ['order-2', 'order-3'])
+        self.assertEqual(self.store.get_by_client_order_id('client-3').order_id, 'order-3')
+
+        self.assertEqual(changes[0][0], 'FILLED')
+        self.assertEqual(changes[0][1].status, 'OPEN')
+        self.assertIsNone(changes[1][1])
+
+        self.assertEqual(self.store.rest_calls, 1)
+        self.client.get_order.assert_not_called()
+
+    def test_gap_is_reconciled_through_rest(self):
+        self.client.get_order.return_value = _rest_order('order-2', 'client-2', 'CANCELLED')
+
+        self.store.on_user_event(_user_event(5, [_user_order('order-1', 'client-1', 'OPEN'),
+                                                 _user_order('order-2', 'client-2', 'OPEN')], 'snapshot'))
+        self.client.get_order.assert_not_called()
+
+        # Reconnection: sequence numbers start over with a new snapshot without order-2.
+        self.store.on_user_event(_user_event(1, [_user_order('order-1', 'client-1', 'OPEN')], 'snapshot'))
+
+        self.client.get_order.assert_called_once_with('order-2')
+        self.assertEqual(self.store.get('order-2').status, 'CANCELLED')
+        self.assertEqual([o.order_id for o in self.store.open_orders()], ['order-1'])
+
+    def test_first_snapshot_is_reconciled(self):
+        lock_free = []
+
+        def try_lock():
+            acquired = self.store._lock.acquire(blocking=False)
+            if acquired:
+                self.store._lock.release()
+            lock_free.append(acquired)
+
+        def get_order(order_id):
+            # REST calls are made without holding the store lock.
+            thread = threading.Thread(target=try_lock)
+            thread.start()
+            thread.join()
+            return _rest_order(order_id, 'client-2', 'FILLED')
+
+        self.client.get_order.side_effect = get_order
+
+        # order-2 filled between bootstrap and the subscription.
+        self.store.on_user_event(_user_event(1, [_user_order('order-1', 'client-1', 'OPEN')], 'snapshot'))
+
+        self.client.get_order.assert_called_once_with('order-2')
+        self.assertEqual(lock_free, [True])
+        self.assertEqual(self.store.get('order-2').status, 'FILLED')
+        self.assertEqual([o.order_id for o in self.store.open_orders()], ['order-1'])
+
+    def test_failed_fetch_is_retried_on_next_snapshot(self):
+        page = OrdersPage([], has_next=False, cursor='', sequence=0)
+        page.orders = [_rest_order('order-3', 'client-3', 'OPEN')]
+        self.client.list_orders_all.return_value = page
+        self.store.bootstrap()
+
+        def get_order(order_id):
+            if order_id == 'order-2':
+                raise ConnectionError("timeout")
+            return _rest_order(order_id, 'client-3', 'CANCELLED')
+
+        self.client.get_order.side_effect = get_order
+
+        snapshot = _user_event(1, [_user_order('order-1', 'client-1', 'OPEN')], 'snapshot')
+        self.assertRaises(ConnectionError, self.store.on_user_event, snapshot)
+
+        # order-3 was fetched despite the failure of order-2.
+        self.assertEqual(self.store.get('order-3').status, 'CANCELLED')
+        self.assertEqual(sorted(o.order_id for o in self.store.open_orders()), ['order-1', 'order-2'])
+
+        self.client.get_order.side_effect = None
+        self.client.get_order.return_value = _rest_order('order-2', 'client-2', 'FILLED')
+        self.store.on_user_event(_user_event(2, [_user_order('order-1', 'client-1', 'OPEN')], 'snapshot'))
+
+        self.assertEqual(self.store.get('order-2').status, 'FILLED')
+        self.assertEqual([o.order_id for o in self.store.open_orders()], ['order-1'])
+
+    def test_recent_orders_are_bounded(self):
+        store = OrderStateStore(self.client, recent_capacity=2)
+        store.on_user_event(_user_event(1, [_user_order(f'order-{i}', f'client-{i}', 'FILLED')
+                                            for i in range(5)]))
+
+        self.assertIsNone(store.get('order-0'))
+        self.assertIsNone(store.get_by_client_order_id('client-0'))
+        self.assertIsNotNone(store.get('order-4'))
+
+    def test_product_filter(self):
+        store = OrderStateStore(self.client, product_ids=['ETH-USD'])
+        store.bootstrap()
+
+        self.assertEqual(store.open_orders(), [])
@@ -0,0 +1,99 @@
+"""
+Priority rate limiter unit tests.
+"""
+
+import threading
+import time
+import unittest
+from unittest import mock
+
+from coinbaseadvanced.client import CoinbaseAdvancedTradeAPIClient
+from coinbaseadvanced.endpoints import ENDPOINTS
+from coinbaseadvanced.rate_limiter import Priority, PriorityRateLimiter
+from tests.fixtures.fixtures import *
+
+
+def _wait_for_waiters(limiter: PriorityRateLimiter, count: int) -> None:
+    deadline = time.monotonic() + 5
+    while len(limiter._waiters) < count and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+class TestPriorityRateLimiter(unittest.TestCase):
+    """
+    Unit tests for PriorityRateLimiter and the endpoint priorities.
+    """
+
+    def test_highest_priority_waiter_served_first(self):
+        limiter = PriorityRateLimiter(rate=5, burst=1)
+        limiter.acquire(priority=Priority.HISTORY)
+
+        served = []
+
+        def acquire(name, priority):
+            limiter.acquire(priority=priority)
+            served.append(name)
+
+        threads = [threading.Thread(target=acquire, args=(f'history-{i}', Priority.HISTORY)) for i in range(3)]
+        for count, thread in enumerate(threads, 1):
+            thread.start()
+            _wait_for_waiters(limiter, count)
+
+        cancel = threading.Thread(target=acquire, args=('cancel', Priority.CANCEL))
+        cancel.start()
+
+        for thread in threads + [cancel]:
+            thread.join(5)
+
+        self.assertEqual(served, ['cancel', 'history-0', 'history-1', 'history-2'])
+
+    def test_try_acquire_yields_to_waiters(self):
+        limiter = PriorityRateLimiter(rate=5, burst=1)
+        limiter.acquire()
+
+        waiter = threading.Thread(target=limiter.acquire, kwargs={'priority': Priority.ORDER})
+        waiter.start()
+        _wait_for_waiters(limiter, 1)
+
+        # Only a more urgent caller may take a token ahead of the queue.
+        self.assertFalse(limiter.try_acquire(priority=Priority.HISTORY))
+        waiter.join(5)
+        time.sleep(0.2)
+        self.assertTrue(limiter.try_acquire(priority=Priority.HISTORY))
+
+    def test_wait_stats(self):
+        limiter = PriorityRateLimiter(rate=20, burst=1)
+        limiter.acquire(priority=Priority.CANCEL)
+        limiter.acquire(priority=Priority.HISTORY)
+
+        stats = limiter.wait_stats(reset=True)
+        self.assertEqual(stats[Priority.CANCEL].count, 1)
+        self.assertEqual(stats[Priority.HISTORY].count, 1)
+        self.assertEqual(stats[Priority.ORDER].count, 0)
+        self.assertGreater(stats[Priority.HISTORY].max, 0)
+        self.assertEqual(stats[Priority.HISTORY].mean, stats[Priority.HISTORY].total)
+
+        self.assertEqual(limiter.wait_stats()[Priority.HISTORY].count, 0)
+
+    def test_endpoint_priorities(self):
+        self.assertEqual(ENDPOINTS['cancel_orders'].priority, Priority.CANCEL)
+        self.assertEqual(ENDPOINTS['create_order'].priority, Priority.ORDER)
+        self.assertEqual(ENDPOINTS['get_account'].priority, Priority.ACCOUNT)
+        self.assertEqual(ENDPOINTS['list_fills'].priority, Priority.HISTORY)
+
+    @mock.patch("coinbaseadvanced.client.requests.get")
+    def test_client_wait_stats(self, mock_get):
+        mock_get.return_value = fixture_list_fills_success_response()
+
+        client = CoinbaseAdvancedTradeAPIClient(
+            api_key='kjsldfk32234', secret_key='jlsjljsfd89y98y98shdfjksfd')
+
+        client.list_fills()
+
+        stats = client.rate_limit_wait_stats()
+        self.assertEqual(stats[Priority.HISTORY].count, 1)
+        self.assertEqual(stats[Priority.CANCEL].count, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
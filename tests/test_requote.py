@@ -0,0 +1,155 @@
+"""
+Requote engine unit tests.
+"""
+
+import threading
+import unittest
+from unittest import mock
+
+from coinbaseadvanced.models.error import CoinbaseAdvancedTradeAPIError, OrderRejectedError
+from coinbaseadvanced.models.orders import Order, OrderBatchCancellation, OrderEdit, Side
+from coinbaseadvanced.requote import CANCEL, CREATE, EDIT, REPLACE, SKIP, Quote, RequoteEngine
+
+
+def _order(order_id: str, gtc: bool = True, order_error: dict = None) -> Order:
+    configuration = {'limit_limit_gtc': {'base_size': '1', 'limit_price': '1', 'post_only': False}} if gtc \
+        else {'limit_limit_gtd': {'base_size': '1', 'limit_price': '1', 'end_time': '2030-01-01T00:00:00Z',
+                                  'post_only': False}}
+    return Order(order_id, 'BTC-USD', 'BUY', 'client_order_id', configuration, order_error=order_error)
+
+
+class _FakeClient:
+    # Stands in for the REST client, numbering the orders it creates.
+
+    def __init__(self) -> None:
+        self.created = 0
+        self.edit_order = mock.Mock(return_value=OrderEdit(success=True))
+        self.cancel_orders = mock.Mock(side_effect=lambda order_ids: OrderBatchCancellation(
+            results=[{'success': True, 'failure_reason': '', 'order_id': order_id} for order_id in order_ids]))
+        self.create_limit_order = mock.Mock(side_effect=self._create)
+
+    def _create(self, client_order_id, product_id, side, limit_price, base_size, cancel_time=None, post_only=None):
+        self.created += 1
+        return _order(f"order_{self.created}")
+
+
+class TestRequoteEngine(unittest.TestCase):
+    """
+    Unit tests for RequoteEngine.
+    """
+
+    def setUp(self):
+        self.client = _FakeClient()
+        self.engine = RequoteEngine(self.client)
+
+    def tearDown(self):
+        self.engine.close()
+
+    def test_create_edit_skip(self):
+        results = self.engine.requote_many({
+            'bid': Quote('BTC-USD', Side.BUY, 100, 1),
+            'ask': Quote('BTC-USD', Side.SELL, 101, 1),
+        })
+        self.assertEqual([result.action for result in results], [CREATE, CREATE])
+        self.assertEqual(self.client.create_limit_order.call_count, 2)
+
+        results = self.engine.requote_many({
+            'bid': Quote('BTC-USD', Side.BUY, 99, 1),
+            'ask': Quote('BTC-USD', Side.SELL, 101, 1),
+        })
+        self.assertEqual([result.action for result in results], [EDIT, SKIP])
+        self.client.edit_order.assert_called_once_with(results[0].order_id, 99, 1)
+        self.assertEqual(self.engine.order_id('bid'), results[0].order_id)
+
+        stats = self.engine.stats()
+        self.assertEqual((stats.creates, stats.edits, stats.skipped), (2, 1, 1))
+
+    def test_not_editable_orders_replaced(self):
+        self.engine.adopt('bid', _order('gtd_order', gtc=False), Quote('BTC-USD', Side.BUY, 100, 1))
+
+        result = self.engine.requote('bid', Quote('BTC-USD', Side.BUY, 99, 1)).result()
+
+        self.assertEqual(result.action, REPLACE)
+        self.client.edit_order.assert_not_called()
+        self.client.cancel_orders.assert_called_once_with(['gtd_order'])
+        self.assertEqual(result.order_id, 'order_1')
+
+    def test_rejected_edit_falls_back_to_replace(self):
+        self.engine.adopt('bid', _order('gtc_order'), Quote('BTC-USD', Side.BUY, 100, 1))
+        self.client.edit_order.return_value = OrderEdit(success=False, edit_failure_reason='ORDER_NOT_FOUND')
+
+        result = self.engine.requote('bid', Quote('BTC-USD', Side.BUY, 99, 1)).result()
+
+        self.assertEqual(result.action, REPLACE)
+        self.assertEqual(self.engine.stats().edit_fallbacks, 1)
+        self.client.cancel_orders.assert_called_once_with(['gtc_order'])
+
+    def test_failed_cancel_keeps_working_order(self):
+        self.engine.adopt('bid', _order('gtd_order', gtc=False), Quote('BTC-USD', Side.BUY, 100, 1))
+        self.client.cancel_orders.side_effect = lambda order_ids: OrderBatchCancellation(results=[
+            {'success': False, 'failure_reason': 'UNKNOWN_CANCEL_FAILURE_REASON', 'order_id': order_ids[0]}])
+
+        result = self.engine.requote('bid', Quote('BTC-USD', Side.BUY, 99, 1)).result()
+
+        self.assertEqual(result.action, REPLACE)
+        self.assertIsInstance(result.error, CoinbaseAdvancedTradeAPIError)
+        self.assertEqual(result.order_id, 'gtd_order')
+        self.assertEqual(self.engine.order_id('bid'), 'gtd_order')
+        self.client.create_limit_order.assert_not_called()
+        self.assertEqual(self.engine.stats().failures, 1)
+
+    def test_cancel_of_filled_order_moves_on(self):
+        self.engine.adopt('bid', _order('gtd_order', gtc=False), Quote('BTC-USD', Side.BUY, 100, 1))
+        self.client.cancel_orders.side_effect = lambda order_ids: OrderBatchCancellation(results=[
+            {'success': False, 'failure_reason': 'ORDER_IS_FULLY_FILLED', 'order_id': order_ids[0]}])
+
+        result = self.engine.requote('bid', Quote('BTC-USD', Side.BUY, 99, 1)).result()
+
+        self.assertIsNone(result.error)
+        self.assertEqual(result.order_id, 'order_1')
+
+    def test_updates_in_flight_coalesced(self):
+        self.engine.adopt('bid', _order('gtc_order'), Quote('BTC-USD', Side.BUY, 100, 1))
+        started, release = threading.Event(), threading.Event()
+
+        def slow_edit(order_id, limit_price, base_size):
+            started.set()
+            release.wait(5)
+            return OrderEdit(success=True)
+
+        self.client.edit_order.side_effect = slow_edit
+
+        first = self.engine.requote('bid', Quote('BTC-USD', Side.BUY, 99, 1))
+        started.wait(5)
+        self.assertEqual(self.engine.in_flight(), ['bid'])
+        second = self.engine.requote('bid', Quote('BTC-USD', Side.BUY, 98, 1))
+        third = self.engine.requote('bid', Quote('BTC-USD', Side.BUY, 97, 1))
+        release.set()
+
+        self.assertEqual(first.result(5).action, EDIT)
+        self.assertIs(second, third)
+        self.assertEqual(third.result(5).action, EDIT)
+        self.assertEqual([call[0][1] for call in self.client.edit_order.call_args_list], [99, 97])
+        self.assertEqual(self.engine.stats().coalesced, 1)
+
+    def test_rejected_order_and_cancel(self):
+        self.client.create_limit_order.side_effect = lambda *args: _order(
+            None, order_error={'error': 'INSUFFICIENT_FUND', 'message': 'Insufficient balance in source account'})
+
+        result = self.engine.requote('bid', Quote('BTC-USD', Side.BUY, 100, 1)).result()
+
+        self.assertIsInstance(result.error, OrderRejectedError)
+        self.assertIsNone(self.engine.order_id('bid'))
+        self.assertEqual(self.engine.stats().failures, 1)
+
+        self.client.create_limit_order.side_effect = self.client._create
+        self.engine.requote('bid', Quote('BTC-USD', Side.BUY, 100, 1)).result()
+        result = self.engine.cancel('bid').result()
+
+        self.assertEqual(result.action, CANCEL)
+        self.assertIsNone(result.order_id)
+        self.client.cancel_orders.assert_called_once_with(['order_1'])
+
+
+if __name__ == '__main__':
+    unittest.main()
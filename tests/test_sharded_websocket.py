@@ -0,0 +1,98 @@
+"""
+Shared memory ring and sharded websocket ingestion unit tests.
+"""
+
+import json
+import multiprocessing
+import unittest
+
+from coinbaseadvanced.models.market_data import TickerEvent
+from coinbaseadvanced.shared_ring import SharedRing
+from coinbaseadvanced.sharded_websocket import SIDE_BID, SIDE_OFFER, L2Batch, decode_record, normalize_message
+
+
+def _produce(ring_name: str, count: int) -> None:
+    ring = SharedRing(ring_name, create=False)
+    for i in range(count):
+        payload = str(i).encode() * (i % 7 + 1)
+        while not ring.put(payload):
+            pass
+    ring.close()
+
+
+class TestSharedRing(unittest.TestCase):
+    """
+    Unit tests for SharedRing.
+    """
+
+    def test_put_get_wraps_around(self):
+        ring = SharedRing(capacity=64)
+        try:
+            self.assertTrue(ring.put(b'a' * 20))
+            self.assertTrue(ring.put(b'b' * 20))
+            self.assertFalse(ring.put(b'c' * 20))
+            self.assertEqual(ring.get(), b'a' * 20)
+
+            # Does not fit in the tail, written at the start.
+            self.assertTrue(ring.put(b'c' * 20))
+            self.assertEqual(ring.get_many(), [b'b' * 20, b'c' * 20])
+            self.assertIsNone(ring.get())
+            self.assertEqual(ring.used, 0)
+
+            with self.assertRaises(ValueError):
+                ring.put(b'd' * 64)
+        finally:
+            ring.close()
+
+    def test_across_processes(self):
+        ring = SharedRing(capacity=256)
+        try:
+            process = multiprocessing.get_context('fork').Process(target=_produce, args=(ring.name, 500))
+            process.start()
+
+            received = []
+            while len(received) < 500:
+                received.extend(ring.get_many())
+            process.join(10)
+
+            self.assertEqual(received, [str(i).encode() * (i % 7 + 1) for i in range(500)])
+        finally:
+            ring.close()
+
+
+class TestNormalization(unittest.TestCase):
+    """
+    Unit tests for the messages published by the shards.
+    """
+
+    def test_l2_data(self):
+        message = json.dumps({
+            'channel': 'l2_data', 'client_id': '', 'timestamp': '2023-02-09T20:32:50.714964855Z',
+            'sequence_num': 3, 'events': [{'type': 'snapshot', 'product_id': 'BTC-USD', 'updates': [
+                {'side': 'bid', 'event_time': '1970-01-01T00:00:01Z', 'price_level': '21921.73',
+                 'new_quantity': '0.06317902'},
+                {'side': 'offer', 'event_time': '1970-01-01T00:00:02.5Z', 'price_level': '21921.74',
+                 'new_quantity': '0'}]}]})
+
+        records, server_time = normalize_message(message, 1675974771.0)
+        self.assertAlmostEqual(server_time, 1675974770.714964855, places=5)
+        self.assertEqual(len(records), 1)
+
+        batch, received_at = decode_record(records[0])
+        self.assertIsInstance(batch, L2Batch)
+        self.assertEqual(received_at, 1675974771.0)
+        self.assertEqual((batch.product_id, batch.is_snapshot, batch.sequence_num), ('BTC-USD', True, 3))
+        self.assertEqual(list(batch.updates()), [(SIDE_BID, 21921.73, 0.06317902, 1.0),
+                                                 (SIDE_OFFER, 21921.74, 0.0, 2.5)])
+
+    def test_other_channels_and_heartbeats(self):
+        ticker = json.dumps({'channel': 'ticker', 'client_id': '', 'timestamp': '2023-02-09T20:30:37.167359596Z',
+                             'sequence_num': 0, 'events': [{'type': 'snapshot', 'tickers': [
+                                 {'type': 'ticker', 'product_id': 'BTC-USD', 'price': '21932.98'}]}]})
+        records, _ = normalize_message(ticker, 0.0)
+        event, _ = decode_record(records[0])
+        self.assertIsInstance(event, TickerEvent)
+
+        heartbeat = json.dumps({'channel': 'heartbeats', 'timestamp': '2023-06-23T20:31:26.122969572Z',
+                                'events': [{'current_time': '2023-06-23 20:31:56', 'heartbeat_counter': 3}]})
+        self.assertEqual(normalize_message(heartbeat, 0.0)[0], [])
@@ -0,0 +1,91 @@
+"""
+Shared memory top of book table unit tests.
+"""
+
+import multiprocessing
+import os
+import unittest
+import uuid
+
+from coinbaseadvanced.models.market_data import Level2Event, MarketTradesEvent, TickerEvent
+from coinbaseadvanced.shared_book import TopOfBookReader, TopOfBookWriter
+
+
+def _write_forever(writer: TopOfBookWriter, count: int) -> None:
+    for i in range(count):
+        writer.update('BTC-USD', best_bid=float(i), bid_size=float(i), best_ask=float(i), ask_size=float(i),
+                      sequence_num=i)
+    os._exit(0)
+
+
+class TestTopOfBook(unittest.TestCase):
+    """
+    Unit tests for TopOfBookWriter and TopOfBookReader.
+    """
+
+    def setUp(self):
+        self.writer = TopOfBookWriter(f'cbtb-{uuid.uuid4().hex[:8]}', ['BTC-USD'], capacity=4)
+        self.reader = TopOfBookReader(self.writer.name)
+
+    def tearDown(self):
+        self.reader.close()
+        self.writer.close()
+
+    def test_events_are_written(self):
+        self.writer.on_ticker(TickerEvent(channel='ticker', client_id='', timestamp='2023-02-09T20:30:37.167359596Z',
+                                          sequence_num=5, events=[{'type': 'update', 'tickers': [
+                                              {'type': 'ticker', 'product_id': 'BTC-USD', 'price': '101',
+                                               'best_bid': '100', 'best_bid_quantity': '2',
+                                               'best_ask': '102', 'best_ask_quantity': '3'}]}]))
+        row = self.reader.get('BTC-USD')
+        self.assertEqual((row.best_bid, row.bid_size, row.best_ask, row.ask_size), (100, 2, 102, 3))
+        self.assertEqual((row.last_price, row.sequence_num, row.mid), (101, 5, 101))
+
+        self.writer.on_market_trades(MarketTradesEvent(
+            channel='market_trades', client_id='', timestamp='2023-02-09T20:19:35.39625135Z', sequence_num=6,
+            events=[{'type': 'update', 'trades': [
+                {'trade_id': '2', 'product_id': 'ETH-USD', 'price': '1500', 'size': '0.5', 'side': 'BUY',
+                 'time': '2019-08-14T20:42:27.265Z'},
+                {'trade_id': '1', 'product_id': 'ETH-USD', 'price': '1499', 'size': '1', 'side': 'BUY',
+                 'time': '2019-08-14T20:42:26.265Z'}]}]))
+        row = self.reader.get('ETH-USD')
+        self.assertEqual((row.last_price, row.last_size, row.last_trade_time), (1500, 0.5, 1565815347.265))
+        self.assertNotEqual(row.best_bid, row.best_bid)  # nan, unknown
+
+        self.writer.on_level2(Level2Event(channel='l2_data', client_id='', timestamp='2023-02-09T20:32:50.71Z',
+                                          sequence_num=7, events=[{'type': 'snapshot', 'product_id': 'BTC-USD',
+                                                                   'updates': [
+                                              {'side': 'bid', 'event_time': '', 'price_level': '99',
+                                               'new_quantity': '1'},
+                                              {'side': 'offer', 'event_time': '', 'price_level': '103',
+                                               'new_quantity': '4'}]}]))
+        row = self.reader.get('BTC-USD')
+        self.assertEqual((row.best_bid, row.best_ask, row.last_price, row.sequence_num), (99, 103, 101, 7))
+        self.assertEqual(sorted(self.reader.get_all()), ['BTC-USD', 'ETH-USD'])
+        self.assertIsNone(self.reader.get('SOL-USD'))
+
+    def test_latest_trade_with_mixed_precision_timestamps(self):
+        self.writer.on_market_trades(MarketTradesEvent(
+            channel='market_trades', client_id='', timestamp='2023-02-09T20:19:35.39625135Z', sequence_num=3,
+            events=[{'type': 'update', 'trades': [
+                {'trade_id': '1', 'product_id': 'BTC-USD', 'price': '100', 'size': '1', 'side': 'BUY',
+                 'time': '2023-02-09T20:33:57.5Z'},
+                {'trade_id': '2', 'product_id': 'BTC-USD', 'price': '101', 'size': '2', 'side': 'BUY',
+                 'time': '2023-02-09T20:33:57.51Z'}]}]))
+        row = self.reader.get('BTC-USD')
+        self.assertEqual((row.last_price, row.last_size), (101, 2))
+        self.assertAlmostEqual(row.last_trade_time, 1675974837.51, places=6)
+
+    def test_reads_are_consistent_during_writes(self):
+        self.writer.update('BTC-USD', best_bid=0.0, bid_size=0.0, best_ask=0.0, ask_size=0.0, sequence_num=0)
+        process = multiprocessing.get_context('fork').Process(target=_write_forever, args=(self.writer, 200000))
+        process.start()
+
+        reads = 0
+        while process.is_alive() or reads == 0:
+            row = self.reader.get('BTC-USD')
+            self.assertTrue(row.best_bid == row.bid_size == row.best_ask == row.ask_size == row.sequence_num)
+            reads += 1
+        process.join()
+
+        self.assertEqual(self.reader.get('BTC-USD').sequence_num, 199999)
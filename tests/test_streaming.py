@@ -0,0 +1,68 @@
+"""
+Incremental JSON array parsing unit tests.
+"""
+
+import json
+import unittest
+
+from coinbaseadvanced.streaming import iter_json_array
+
+
+def _chunks(body: bytes, size: int):
+    return (body[start:start + size] for start in range(0, len(body), size))
+
+
+class TestIterJsonArray(unittest.TestCase):
+    """
+    Unit tests for iter_json_array.
+    """
+
+    def test_items_and_fields_across_chunk_boundaries(self):
+        document = {
+            'sequence': 1234567,
+            'orders': [{'order_id': str(index), 'price': '1.5', 'note': 'café €', 'nested': {'a': [1, 2]}}
+                       for index in range(20)],
+            'has_next': True,
+            'cursor': 'abc',
+        }
+        body = json.dumps(document, indent=1).encode('utf-8')
+
+        for size in (1, 2, 3, 7, 64, len(body)):
+            fields = {}
+            items = list(iter_json_array(_chunks(body, size), 'orders', fields))
+
+            self.assertEqual(items, document['orders'], size)
+            self.assertEqual(fields, {'sequence': 1234567, 'has_next': True, 'cursor': 'abc'}, size)
+
+    def test_items_are_yielded_before_the_body_is_read(self):
+        read = []
+
+        def chunks():
+            for chunk in (b'{"cursor": "", "fills": [{"a": 1}, ', b'{"a": 2}', b']}'):
+                read.append(chunk)
+                yield chunk
+
+        items = iter_json_array(chunks(), 'fills', {})
+
+        self.assertEqual(next(items), {'a': 1})
+        self.assertEqual(len(read), 1)
+        self.assertEqual(list(items), [{'a': 2}])
+
+    def test_empty_and_missing_arrays(self):
+        fields = {}
+        self.assertEqual(list(iter_json_array([b'{"accounts": [], "size": 0}'], 'accounts', fields)), [])
+        self.assertEqual(fields, {'size': 0})
+
+        fields = {}
+        self.assertEqual(list(iter_json_array([b'{"accounts": null}'], 'accounts', fields)), [])
+        self.assertEqual(fields, {'accounts': None})
+
+        self.assertEqual(list(iter_json_array([b' {} '], 'accounts', {})), [])
+
+    def test_truncated_body(self):
+        with self.assertRaises(ValueError):
+            list(iter_json_array([b'{"orders": [{"a": 1}, {"a"'], 'orders', {}))
+
+
+if __name__ == '__main__':
+    unittest.main()
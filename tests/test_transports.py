@@ -0,0 +1,96 @@
+"""
+Transports, record and replay unit tests.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from coinbaseadvanced.client import CoinbaseAdvancedTradeAPIClient
+from coinbaseadvanced.transports import PooledTransport, RecordedResponse, RecordingTransport, ReplayTransport, \
+    Transport, recording_key
+from tests.fixtures.transports import FixtureTransport, in_order, read_fixture
+
+
+class TestTransports(unittest.TestCase):
+    """
+    Unit tests for the transports.
+    """
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.directory = self._directory.name
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def _client(self, transport: Transport) -> CoinbaseAdvancedTradeAPIClient:
+        return CoinbaseAdvancedTradeAPIClient(
+            api_key='kjsldfk32234', secret_key='jlsjljsfd89y98y98shdfjksfd', transport=transport)
+
+    def test_record_then_replay(self):
+        network = FixtureTransport(in_order('list_accounts_all_call_1_success_response.json',
+                                            'list_accounts_all_call_2_success_response.json',
+                                            'list_orders_success_response.json'))
+        recorder = self._client(RecordingTransport(self.directory, network))
+        recorded_accounts = recorder.list_accounts_all()
+        recorded_orders = recorder.list_orders(limit=10)
+
+        self.assertEqual(len(network.requests), 3)
+        self.assertIn('CB-ACCESS-SIGN', network.requests[0][2])
+        self.assertEqual(len(os.listdir(self.directory)), 3)
+
+        replay = ReplayTransport(self.directory)
+        client = CoinbaseAdvancedTradeAPIClient(
+            api_key='other', secret_key='other', base_url='https://example.com', transport=replay)
+
+        for _ in range(3):
+            accounts = client.list_accounts_all()
+            self.assertEqual([account.uuid for account in accounts],
+                             [account.uuid for account in recorded_accounts])
+
+            orders = client.list_orders(limit=10, stream=True)
+            self.assertEqual([order.order_id for order in orders],
+                             [order.order_id for order in recorded_orders])
+            self.assertEqual(orders.cursor, recorded_orders.cursor)
+
+        with self.assertRaises(LookupError):
+            client.get_account('unknown')
+
+    def test_replay_serves_responses_in_recorded_order(self):
+        network = FixtureTransport(in_order('list_orders_all_call_1_success_response.json',
+                                            'list_orders_all_call_2_success_response.json'))
+        recorder = RecordingTransport(self.directory, network)
+        url = 'https://api.coinbase.com/api/v3/brokerage/orders/historical/batch?limit=1'
+        first = recorder.send('GET', url).text
+        second = recorder.send('GET', url).text
+
+        replay = ReplayTransport(self.directory)
+        self.assertEqual([replay.send('GET', url).text for _ in range(3)], [first, second, second])
+
+        replay.rewind()
+        self.assertEqual(replay.send('GET', url).text, first)
+
+    def test_recording_key_ignores_host(self):
+        self.assertEqual(recording_key('get', 'https://api.coinbase.com/api/v3/brokerage/accounts?limit=49'),
+                         'GET /api/v3/brokerage/accounts?limit=49')
+        self.assertEqual(recording_key('GET', 'https://example.com/api/v3/brokerage/accounts?limit=49'),
+                         recording_key('GET', 'https://api.coinbase.com/api/v3/brokerage/accounts?limit=49'))
+
+    @mock.patch("requests.Session.request")
+    def test_pooled_transport(self, mock_request):
+        mock_request.return_value = RecordedResponse(200, read_fixture('list_accounts_success_response.json'))
+
+        client = self._client(PooledTransport(pool_size=4))
+        page = client.list_accounts()
+
+        self.assertEqual(len(page.accounts), page.size)
+        args, kwargs = mock_request.call_args
+        self.assertEqual(args, ('GET', 'https://api.coinbase.com/api/v3/brokerage/accounts?limit=49'))
+        self.assertEqual(kwargs['timeout'], client.timeout)
+        self.assertIn('CB-ACCESS-SIGN', kwargs['headers'])
+
+
+if __name__ == '__main__':
+    unittest.main()